@@ -0,0 +1,54 @@
+"""
+Benchmark snapshot file compression codecs.
+
+Saves and loads one realistic synthetic snapshot with SnapshotStore, once
+per codec, stored as a full keyframe, and reports the bytes on disk, save
+latency and load latency of each. zstd is skipped unless the zstandard
+package is installed.
+
+Usage:
+    python benchmarks/bench_codecs.py [--jobs 3000]
+"""
+
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from common import best_of, synthetic_jobs
+
+from sjs_jobwatch.core.models import Snapshot
+from sjs_jobwatch.storage import compression
+from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=3000)
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.jobs)
+    snapshot = Snapshot(
+        timestamp=datetime(2024, 1, 1),
+        jobs=jobs,
+        total_count=len(jobs),
+        source_url="https://example.test/",
+    )
+
+    print(f"1 snapshot x {args.jobs} jobs")
+    print(f"{'codec':<6} {'on disk':>10} {'save':>9} {'load':>9}")
+    for codec in compression.CODEC_SUFFIXES:
+        if codec == "zstd" and compression.zstandard is None:
+            print(f"{codec:<6} skipped (zstandard not installed)")
+            continue
+        with tempfile.TemporaryDirectory() as temp:
+            store = SnapshotStore(Path(temp), keyframe_interval=1, compression=codec)
+            save = best_of(lambda: store.save(snapshot))
+            size = store.list_snapshots()[0].stat().st_size
+            load = best_of(lambda: store.load(snapshot.timestamp))
+        print(f"{codec:<6} {size / 1024:>8.0f}KB {save * 1000:>7.0f}ms {load * 1000:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark serial and parallel snapshot diffs.
+
+Builds a synthetic snapshot per size plus a later copy with 1% of jobs
+removed, 1% added and 1% modified, then times diff_snapshots serially and
+sharded across worker processes. Fingerprints are cleared before every run,
+so each diff is cold. Two 1M-job snapshots need several GB of memory.
+
+Usage:
+    python benchmarks/bench_diff.py [--sizes 10000,100000,1000000] [--workers 2,4]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from common import synthetic_raw_jobs
+
+from sjs_jobwatch.core.diff import diff_snapshots
+from sjs_jobwatch.core.models import Job, Snapshot
+from sjs_jobwatch.ingestion.jobbuilder import JobBuilder
+
+# Jobs are built in chunks to keep the raw dicts from doubling peak memory
+CHUNK = 50_000
+
+
+def _build_jobs(count: int, first_id: int, seed: int) -> list[Job]:
+    """Build ``count`` jobs with IDs from ``first_id``, sharing one description."""
+    builder = JobBuilder(sample_rate=0)
+    jobs: list[Job] = []
+    description = synthetic_raw_jobs(1)[0]["description"]
+    for start in range(0, count, CHUNK):
+        raw_jobs = synthetic_raw_jobs(min(CHUNK, count - start), seed=seed + start)
+        for i, raw in enumerate(raw_jobs):
+            raw["jobId"] = first_id + start + i
+            raw["description"] = description
+        jobs.extend(builder.build(raw_jobs))
+    return jobs
+
+
+def _snapshot(jobs: list[Job]) -> Snapshot:
+    """Wrap jobs in a snapshot without digesting them."""
+    return Snapshot.model_construct(
+        timestamp=datetime.now(),
+        jobs=jobs,
+        total_count=len(jobs),
+        source_url="https://example.test/",
+        content_digest="benchmark",
+    )
+
+
+def _time_diff(previous: Snapshot, current: Snapshot, workers: int) -> float:
+    """Time one cold diff."""
+    for job in (*previous.jobs, *current.jobs):
+        job.__dict__.pop("fingerprint", None)
+    start = time.perf_counter()
+    diff_snapshots(previous, current, workers=workers)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--workers", default="2,4")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    worker_counts = [int(workers) for workers in args.workers.split(",")]
+
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'jobs':>10} {'serial':>10}" + "".join(f" {f'{w} workers':>10}" for w in worker_counts))
+    for size in sizes:
+        jobs = _build_jobs(size, first_id=100_000, seed=0)
+        churn = max(size // 100, 1)
+        later = [
+            job.model_copy(update={"title": f"{job.title} (updated)"}) if i % 100 == 0 else job
+            for i, job in enumerate(jobs[churn:])
+        ]
+        later += _build_jobs(churn, first_id=100_000 + size, seed=1)
+        previous, current = _snapshot(jobs), _snapshot(later)
+
+        timings = [_time_diff(previous, current, workers=1)]
+        timings += [_time_diff(previous, current, workers=w) for w in worker_counts]
+        print(f"{size:>10,}" + "".join(f" {t * 1000:>8.0f}ms" for t in timings))
+
+        del jobs, later, previous, current
+
+
+if __name__ == "__main__":
+    main()
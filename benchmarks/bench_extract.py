@@ -0,0 +1,56 @@
+"""
+Benchmark __NEXT_DATA__ extraction strategies.
+
+Reports per-page time to locate the payload with each strategy in
+sjs_jobwatch.ingestion.nextdata.EXTRACTORS, plus the json.loads that follows.
+
+Usage:
+    python benchmarks/bench_extract.py [PAGE.html | DIR ...]
+
+Without arguments a synthetic 500-job page is used.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from common import best_of, synthetic_page
+
+from sjs_jobwatch.ingestion.nextdata import EXTRACTORS
+
+
+def _collect_pages(paths: list[str]) -> list[tuple[str, bytes]]:
+    """Read recorded pages from files or directories of files."""
+    pages = []
+    for raw_path in paths:
+        path = Path(raw_path)
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            content = file.read_bytes()
+            if b"__NEXT_DATA__" in content:
+                pages.append((file.name, content))
+    return pages
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pages", nargs="*", help="Recorded HTML pages or directories")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = _collect_pages(args.pages) or [("synthetic-500", synthetic_page(500))]
+
+    header = f"{'page':<30} {'size':>10}" + "".join(f" {name:>10}" for name in EXTRACTORS)
+    print(header + f" {'json':>10}")
+    for name, content in pages:
+        row = f"{name[:30]:<30} {len(content) / 1024:>8.0f}KB"
+        for extractor in EXTRACTORS.values():
+            row += f" {best_of(lambda: extractor(content), args.repeat) * 1000:>8.2f}ms"
+        payload = EXTRACTORS["fast"](content)
+        row += f" {best_of(lambda: json.loads(payload), args.repeat) * 1000:>8.2f}ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark Job construction throughput.
+
+Compares building Job objects from raw result dicts with full validation of
+every row (strict), the default sampled validation, and no validation at all
+(trusted). Also times the Snapshot wrapper around the built list.
+
+Usage:
+    python benchmarks/bench_job_build.py [--jobs N] [--repeat R]
+"""
+
+import argparse
+from datetime import datetime
+
+from common import best_of, synthetic_raw_jobs
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.models import Snapshot, compute_content_digest
+from sjs_jobwatch.ingestion.jobbuilder import JobBuilder
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = synthetic_raw_jobs(args.jobs)
+    modes = {
+        "strict": 1.0,
+        f"sampled ({config.JOB_VALIDATION_SAMPLE_RATE:g})": config.JOB_VALIDATION_SAMPLE_RATE,
+        "trusted": 0.0,
+    }
+
+    print(f"{args.jobs} jobs, best of {args.repeat}")
+    print(f"{'mode':<16} {'time':>10} {'jobs/sec':>12}")
+    for name, rate in modes.items():
+        seconds = best_of(lambda: list(JobBuilder(rate, seed=0).build(raw)), args.repeat)
+        print(f"{name:<16} {seconds * 1000:>8.1f}ms {args.jobs / seconds:>12,.0f}")
+
+    jobs = list(JobBuilder(0.0).build(raw))
+    now = datetime.now()
+
+    def strict_snapshot() -> Snapshot:
+        return Snapshot(timestamp=now, jobs=jobs, total_count=len(jobs), source_url="")
+
+    def trusted_snapshot() -> Snapshot:
+        return Snapshot.model_construct(
+            timestamp=now,
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="",
+            content_digest=compute_content_digest(jobs),
+        )
+
+    print()
+    print(f"{'snapshot':<16} {'time':>10}")
+    for name, func in (("strict", strict_snapshot), ("trusted", trusted_snapshot)):
+        print(f"{name:<16} {best_of(func, args.repeat) * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark memory retained by a loaded snapshot history.
+
+Saves a series of synthetic daily snapshots, then loads them all back with
+SnapshotStore and reports the memory they hold: as loaded by default
+(categorical fields interned, unchanged jobs shared between snapshots), in
+columnar form, and with interning and sharing disabled, as every job used
+to be loaded. Also times a region/pay filter across the whole history.
+
+Usage:
+    python benchmarks/bench_load_memory.py [--days 90] [--jobs 2000]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from common import best_of, synthetic_jobs
+
+from sjs_jobwatch.core.interning import CATEGORICAL_FIELDS, InternTable
+from sjs_jobwatch.core.models import Snapshot
+from sjs_jobwatch.storage import snapshots as snapshot_storage
+from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+
+def _measure(store: SnapshotStore, days: int, columnar: bool = False) -> tuple[float, float, str]:
+    """Load every snapshot; return retained MB, filter time and object stats."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if columnar:
+        history = store.load_latest_columnar(n=days)
+    else:
+        history = store.load_latest(n=days)
+    load_time = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    def scan() -> list:
+        if columnar:
+            return [s.select(region="Wellington", min_pay=90_000) for s in history]
+        return [
+            [j for j in s.jobs if j.region == "Wellington" and (j.pay_max or 0) >= 90_000]
+            for s in history
+        ]
+
+    if columnar:
+        stats = f"{sum(len(s) for s in history):,} rows"
+    else:
+        objects = {
+            id(getattr(job, field))
+            for snapshot in history
+            for job in snapshot.jobs
+            for field in CATEGORICAL_FIELDS
+        }
+        jobs = {id(job) for snapshot in history for job in snapshot.jobs}
+        stats = f"{len(jobs):,} Job objects, {len(objects):,} categorical strings"
+    print(f"  loaded in {load_time:.1f}s")
+    return retained / 1024 / 1024, best_of(scan, 3), stats
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--jobs", type=int, default=2000)
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.jobs)
+    start = datetime(2024, 1, 1)
+
+    with tempfile.TemporaryDirectory() as temp:
+        store = SnapshotStore(Path(temp))
+        for day in range(args.days):
+            store.save(
+                Snapshot(
+                    timestamp=start + timedelta(days=day),
+                    jobs=jobs,
+                    total_count=len(jobs),
+                    source_url="https://example.test/",
+                )
+            )
+
+        print(f"{args.days} snapshots x {args.jobs} jobs")
+        results = {"shared": _measure(store, args.days)}
+        results["columnar"] = _measure(store, args.days, columnar=True)
+
+        original_intern = InternTable.intern
+        original_build = snapshot_storage._snapshot_from_data
+        InternTable.intern = lambda self, value: value
+        snapshot_storage._snapshot_from_data = lambda data, shared_jobs: Snapshot(**data)
+        try:
+            results["plain"] = _measure(store, args.days)
+        finally:
+            InternTable.intern = original_intern
+            snapshot_storage._snapshot_from_data = original_build
+
+        print(f"{'mode':<10} {'retained':>10} {'filter':>10}  objects")
+        for name, (retained, scan, stats) in results.items():
+            print(f"{name:<10} {retained:>8.1f}MB {scan * 1000:>8.1f}ms  {stats}")
+
+
+if __name__ == "__main__":
+    main()
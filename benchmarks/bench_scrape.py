@@ -0,0 +1,83 @@
+"""
+Benchmark end-to-end multi-page scrapes against the local fixture server.
+
+Serves a fixture directory (recorded with ``sjs-jobwatch fixtures record
+--all-pages``) or a synthetic multi-page search, then times full scrapes at
+several worker counts, plus a warm conditional scrape through the response
+cache.
+
+Usage:
+    python benchmarks/bench_scrape.py [--dir FIXTURES] [--latency 0.05] [--error-rate 0.0]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from common import synthetic_raw_jobs
+
+from sjs_jobwatch.ingestion.fixtures import FixtureServer, FixtureStore
+from sjs_jobwatch.ingestion.http_cache import ResponseCache
+from sjs_jobwatch.ingestion.scraper import SJSScraper
+
+SEARCH_PATH = "/jobs/search/"
+
+
+def _write_synthetic(store: FixtureStore, pages: int, per_page: int) -> None:
+    """Record a synthetic paginated search into a fixture store."""
+    for page in range(1, pages + 1):
+        raw = synthetic_raw_jobs(per_page, seed=page)
+        for i, job in enumerate(raw):
+            job["jobId"] = page * per_page + i
+        payload = json.dumps(
+            {"props": {"pageProps": {"searchResults": {"totalPages": pages, "results": raw}}}}
+        )
+        body = f'<html><script id="__NEXT_DATA__">{payload}</script></html>'.encode("utf-8")
+        path = SEARCH_PATH if page == 1 else f"{SEARCH_PATH}?page={page}"
+        store.save(f"http://fixtures{path}", 200, {"ETag": f'"page-{page}"'}, body)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", type=Path, help="Recorded fixture directory")
+    parser.add_argument("--pages", type=int, default=20, help="Synthetic pages")
+    parser.add_argument("--per-page", type=int, default=100, help="Synthetic jobs per page")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp:
+        if args.dir:
+            store = FixtureStore(args.dir)
+        else:
+            store = FixtureStore(Path(temp) / "fixtures")
+            _write_synthetic(store, args.pages, args.per_page)
+
+        with FixtureServer(store, latency=args.latency, error_rate=args.error_rate) as server:
+            url = server.url_for(SEARCH_PATH)
+            print(f"{len(store)} fixtures, {args.latency * 1000:.0f}ms latency")
+            print(f"{'mode':<20} {'time':>10} {'jobs':>8}")
+
+            for workers in (1, 4, 8):
+                scraper = SJSScraper(delay=0, max_workers=workers)
+                start = time.perf_counter()
+                snapshot = scraper.scrape(url=url, all_pages=True)
+                elapsed = time.perf_counter() - start
+                label = f"{workers} workers"
+                print(f"{label:<20} {elapsed * 1000:>8.0f}ms {len(snapshot.jobs):>8}")
+
+            scraper = SJSScraper(delay=0, cache=ResponseCache(Path(temp) / "cache"))
+            scraper.scrape(url=url, all_pages=True)
+            scraper.cache.commit()
+            start = time.perf_counter()
+            unchanged = scraper.scrape_if_changed(url=url, all_pages=True)
+            elapsed = time.perf_counter() - start
+            jobs = "skipped" if unchanged is None else len(unchanged.jobs)
+            print(f"{'warm conditional':<20} {elapsed * 1000:>8.0f}ms {jobs:>8}")
+
+
+if __name__ == "__main__":
+    main()
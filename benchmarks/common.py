@@ -0,0 +1,94 @@
+"""
+Shared helpers for the SJS JobWatch benchmarks.
+
+Benchmarks run offline against synthetic data shaped like the SJS search
+payload, or against recorded pages when paths are given on the command line.
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+# Allow running benchmarks from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+REGIONS = ["Auckland", "Wellington", "Canterbury", "Otago", "Waikato", "Bay of Plenty"]
+CATEGORIES = ["ICT", "Health", "Policy", "Finance & Accounting", "Education", "Legal"]
+EMPLOYERS = [f"Ministry of Example {i}" for i in range(40)]
+JOB_TYPES = ["Full-time", "Part-time", "Fixed term", "Contract"]
+
+
+def synthetic_raw_jobs(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Generate raw job dicts in the shape of the SJS search payload."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        pay_min = rng.randrange(50_000, 120_000, 1_000)
+        jobs.append(
+            {
+                "jobId": 100_000 + i,
+                "title": f"Senior Analyst {i}",
+                "businessName": rng.choice(EMPLOYERS),
+                "category": rng.choice(CATEGORIES),
+                "classification": rng.choice(CATEGORIES),
+                "subClassification": "General",
+                "jobType": rng.choice(JOB_TYPES),
+                "regionName": rng.choice(REGIONS),
+                "areaName": f"Area {rng.randrange(20)}",
+                "summary": "An exciting opportunity to join a growing team. " * 2,
+                "description": "<p>Lead analysis work across the organisation.</p> " * 20,
+                "payMin": pay_min,
+                "payMax": pay_min + rng.randrange(0, 30_000, 1_000),
+                "postedDate": "2024-05-01T09:00:00Z",
+                "closingDate": "2024-06-01T17:00:00Z",
+            }
+        )
+    return jobs
+
+
+def synthetic_page(count: int, seed: int = 0) -> bytes:
+    """Generate an SJS-style search page embedding ``count`` jobs."""
+    payload = json.dumps(
+        {
+            "props": {
+                "pageProps": {
+                    "searchResults": {
+                        "results": synthetic_raw_jobs(count, seed),
+                        "totalResults": count,
+                    }
+                }
+            },
+            "page": "/jobs/search",
+        }
+    )
+    filler = "".join(
+        f'<div class="job-card"><a href="/jobs/{i}">Job {i}</a><span>Wellington</span></div>'
+        for i in range(count)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Search</title>"
+        '<link rel="stylesheet" href="/_next/static/css/app.css"></head>'
+        f'<body><div id="__next">{filler}</div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+        '<script src="/_next/static/chunks/main.js"></script></body></html>'
+    ).encode("utf-8")
+
+
+def synthetic_jobs(count: int, seed: int = 0) -> list[Any]:
+    """Generate validated Job models."""
+    from sjs_jobwatch.ingestion.jobbuilder import JobBuilder
+
+    return list(JobBuilder(sample_rate=1.0).build(synthetic_raw_jobs(count, seed)))
+
+
+def best_of(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Return the fastest of ``repeat`` timed calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -6,7 +6,8 @@ Provides commands for scraping, viewing diffs, managing subscriptions, and runni
 
 import logging
 import sys
-from datetime import datetime
+from collections.abc import Sequence
+from itertools import islice
 from pathlib import Path
 
 import click
@@ -16,10 +17,14 @@ from rich.table import Table
 from sjs_jobwatch.alerts.email import EmailSender
 from sjs_jobwatch.alerts.subscriptions import AlertSubscription, SubscriptionStore
 from sjs_jobwatch.core import config
-from sjs_jobwatch.core.diff import diff_snapshots, summarize_diff
-from sjs_jobwatch.core.models import Frequency, JobCategory, Region, Severity
-from sjs_jobwatch.ingestion.scraper import scrape_sjs_jobs
-from sjs_jobwatch.storage.snapshots import SnapshotStore
+from sjs_jobwatch.core.diff import ChangeSet, summarize_diff
+from sjs_jobwatch.core.models import Frequency, JobCategory, Region, Severity, Snapshot
+from sjs_jobwatch.ingestion.details import DetailFetcher
+from sjs_jobwatch.ingestion.fixtures import FixtureServer, FixtureStore, RecordingSession
+from sjs_jobwatch.ingestion.http_cache import ResponseCache
+from sjs_jobwatch.ingestion.resultpath import ResultPathResolver
+from sjs_jobwatch.ingestion.scraper import SJSScraper, scrape_sjs_jobs
+from sjs_jobwatch.storage.snapshots import SnapshotStore, get_snapshot_store
 
 console = Console()
 
@@ -81,8 +86,9 @@ def cli(ctx: click.Context, verbose: bool) -> None:
     help="Filter by category",
 )
 @click.option("--keyword", default="", help="Search keyword")
+@click.option("--all-pages", is_flag=True, help="Fetch every results page, not just the first")
 @click.pass_context
-def scrape(ctx: click.Context, region: str, category: str, keyword: str) -> None:
+def scrape(ctx: click.Context, region: str, category: str, keyword: str, all_pages: bool) -> None:
     """Scrape current jobs from the SJS website and save a snapshot."""
     console.print("[bold blue]Scraping SJS jobs...[/bold blue]")
     console.print(f"  Region: {region}")
@@ -92,10 +98,12 @@ def scrape(ctx: click.Context, region: str, category: str, keyword: str) -> None
 
     try:
         # Scrape jobs
-        snapshot = scrape_sjs_jobs(region=region, category=category, keyword=keyword)
+        snapshot = scrape_sjs_jobs(
+            region=region, category=category, keyword=keyword, all_pages=all_pages
+        )
 
         # Save snapshot
-        store = SnapshotStore()
+        store = get_snapshot_store()
         filepath = store.save(snapshot)
 
         console.print(f"[green]✓[/green] Scraped {len(snapshot.jobs)} jobs")
@@ -122,24 +130,26 @@ def scrape(ctx: click.Context, region: str, category: str, keyword: str) -> None
 @click.pass_context
 def diff(ctx: click.Context, since: int, format: str) -> None:
     """Show differences between the latest snapshot and a previous one."""
-    store = SnapshotStore()
-    snapshots = store.load_latest(n=since + 1)
+    store = get_snapshot_store()
+    headers = store.load_headers(n=since + 1)
 
-    if len(snapshots) < 2:
+    if len(headers) < 2:
         console.print("[yellow]Not enough snapshots to compare.[/yellow]")
-        console.print(f"Found {len(snapshots)} snapshot(s), need at least 2.")
+        console.print(f"Found {len(headers)} snapshot(s), need at least 2.")
         return
 
     # Diff the snapshots
-    previous = snapshots[since]
-    current = snapshots[0]
+    previous = headers[-1]
+    current = headers[0]
 
     console.print("[bold]Comparing snapshots:[/bold]")
     console.print(f"  Previous: {previous.timestamp}")
     console.print(f"  Current:  {current.timestamp}")
     console.print()
 
-    diff_result = diff_snapshots(previous, current)
+    # Composed from the logged diff of each interval where possible, so
+    # neither this nor repeat runs need to load the snapshots
+    diff_result = store.net_diff(headers)
 
     if format == "text":
         console.print(summarize_diff(diff_result))
@@ -147,26 +157,32 @@ def diff(ctx: click.Context, since: int, format: str) -> None:
         _display_diff_table(diff_result)
 
 
-def _display_diff_table(diff_result) -> None:
-    """Display diff result as a rich table."""
+def _display_diff_table(diff_result: ChangeSet, limit: int = 20) -> None:
+    """Display diff result as a rich table, listing at most ``limit`` jobs per section."""
+    added_count = diff_result.count("added")
+    removed_count = diff_result.count("removed")
+    modified_count = diff_result.count("modified")
+    reposted_count = diff_result.count("reposted")
+
     # Summary
     table = Table(title="Summary", show_header=False)
-    table.add_row("New Jobs", f"[green]{len(diff_result.added)}[/green]")
-    table.add_row("Removed Jobs", f"[red]{len(diff_result.removed)}[/red]")
-    table.add_row("Modified Jobs", f"[yellow]{len(diff_result.modified)}[/yellow]")
+    table.add_row("New Jobs", f"[green]{added_count}[/green]")
+    table.add_row("Removed Jobs", f"[red]{removed_count}[/red]")
+    table.add_row("Modified Jobs", f"[yellow]{modified_count}[/yellow]")
+    table.add_row("Reposted Jobs", f"[cyan]{reposted_count}[/cyan]")
     table.add_row("Total Changes", f"[bold]{diff_result.total_changes}[/bold]")
     console.print(table)
     console.print()
 
     # New jobs
-    if diff_result.added:
+    if added_count:
         table = Table(title="✨ New Jobs", show_lines=True)
         table.add_column("Title", style="green")
         table.add_column("Employer")
         table.add_column("Region")
         table.add_column("Category")
 
-        for change in diff_result.added[:20]:  # Limit to 20 for readability
+        for change in islice(diff_result.iter_changes("added"), limit):
             job = change.after
             table.add_row(
                 job.title,
@@ -176,34 +192,34 @@ def _display_diff_table(diff_result) -> None:
             )
 
         console.print(table)
-        if len(diff_result.added) > 20:
-            console.print(f"[dim]... and {len(diff_result.added) - 20} more[/dim]")
+        if added_count > limit:
+            console.print(f"[dim]... and {added_count - limit} more[/dim]")
         console.print()
 
     # Removed jobs
-    if diff_result.removed:
+    if removed_count:
         table = Table(title="❌ Removed Jobs", show_lines=True)
         table.add_column("Title", style="red")
         table.add_column("Employer")
         table.add_column("Region")
 
-        for change in diff_result.removed[:20]:
+        for change in islice(diff_result.iter_changes("removed"), limit):
             job = change.before
             table.add_row(job.title, job.employer, job.region or "-")
 
         console.print(table)
-        if len(diff_result.removed) > 20:
-            console.print(f"[dim]... and {len(diff_result.removed) - 20} more[/dim]")
+        if removed_count > limit:
+            console.print(f"[dim]... and {removed_count - limit} more[/dim]")
         console.print()
 
     # Modified jobs
-    if diff_result.modified:
+    if modified_count:
         table = Table(title="✏️  Modified Jobs", show_lines=True)
         table.add_column("Title", style="yellow")
         table.add_column("Employer")
         table.add_column("Changes")
 
-        for change in diff_result.modified[:20]:
+        for change in islice(diff_result.iter_changes("modified"), limit):
             job = change.after
             changes_summary = ", ".join(fc.field for fc in change.changes[:3])
             if len(change.changes) > 3:
@@ -212,8 +228,24 @@ def _display_diff_table(diff_result) -> None:
             table.add_row(job.title, job.employer, changes_summary)
 
         console.print(table)
-        if len(diff_result.modified) > 20:
-            console.print(f"[dim]... and {len(diff_result.modified) - 20} more[/dim]")
+        if modified_count > limit:
+            console.print(f"[dim]... and {modified_count - limit} more[/dim]")
+        console.print()
+
+    # Reposted jobs
+    if reposted_count:
+        table = Table(title="🔁 Reposted Jobs", show_lines=True)
+        table.add_column("Title", style="cyan")
+        table.add_column("Employer")
+        table.add_column("Job ID")
+
+        for change in islice(diff_result.iter_changes("reposted"), limit):
+            job = change.after
+            table.add_row(job.title, job.employer, f"{change.repost_of} → {job.id}")
+
+        console.print(table)
+        if reposted_count > limit:
+            console.print(f"[dim]... and {reposted_count - limit} more[/dim]")
 
 
 # ============================================================================
@@ -223,39 +255,33 @@ def _display_diff_table(diff_result) -> None:
 
 @cli.command()
 @click.option("--limit", "-n", type=int, default=10, help="Number of snapshots to show")
-def list(limit: int) -> None:
+@click.option("--rebuild", is_flag=True, help="Rebuild the snapshot index from the files first")
+def list(limit: int, rebuild: bool) -> None:
     """List available snapshots."""
-    store = SnapshotStore()
-    files = store.list_snapshots()
+    store = get_snapshot_store()
+    if rebuild:
+        store.rebuild_index()
 
-    if not files:
+    # Reads snapshot metadata only, without loading any jobs
+    total = store.count()
+    if not total:
         console.print("[yellow]No snapshots found.[/yellow]")
         return
 
-    table = Table(title=f"Recent Snapshots (showing {min(limit, len(files))} of {len(files)})")
+    table = Table(title=f"Recent Snapshots (showing {min(limit, total)} of {total})")
     table.add_column("#", justify="right")
     table.add_column("Timestamp")
     table.add_column("Jobs", justify="right")
     table.add_column("Duration", justify="right")
 
-    for i, filepath in enumerate(files[:limit], 1):
-        try:
-            import json
-
-            with open(filepath) as f:
-                data = json.load(f)
-
-            timestamp = datetime.fromisoformat(data["timestamp"])
-            duration = data.get("scrape_duration_seconds", 0)
-
-            table.add_row(
-                str(i),
-                timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                str(data["total_count"]),
-                f"{duration:.1f}s" if duration else "-",
-            )
-        except Exception:
-            continue
+    for i, header in enumerate(islice(store.iter_headers(), limit), 1):
+        duration = header.scrape_duration_seconds
+        table.add_row(
+            str(i),
+            header.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            str(header.total_count),
+            f"{duration:.1f}s" if duration else "-",
+        )
 
     console.print(table)
 
@@ -271,7 +297,7 @@ def list(limit: int) -> None:
 @click.option("--snapshot", type=int, default=0, help="Which snapshot to export (0=latest)")
 def export(format: str, output: str, snapshot: int) -> None:
     """Export a snapshot to CSV or JSON format."""
-    store = SnapshotStore()
+    store = get_snapshot_store()
     snapshots = store.load_latest(n=snapshot + 1)
 
     if not snapshots or len(snapshots) <= snapshot:
@@ -406,14 +432,14 @@ def alerts_list() -> None:
 @click.option("--dry-run", is_flag=True, help="Don't actually send email")
 def alerts_test(email: str, dry_run: bool) -> None:
     """Test sending an alert email (uses last two snapshots)."""
-    store = SnapshotStore()
-    snapshots = store.load_latest(n=2)
+    store = get_snapshot_store()
+    headers = store.load_headers(n=2)
 
-    if len(snapshots) < 2:
+    if len(headers) < 2:
         console.print("[red]Need at least 2 snapshots to test alerts[/red]")
         sys.exit(1)
 
-    diff_result = diff_snapshots(snapshots[1], snapshots[0])
+    diff_result = store.diff(headers[1], headers[0])
 
     console.print(f"Testing alert email to {email}...")
     console.print(f"Changes: {diff_result.total_changes}")
@@ -431,6 +457,110 @@ def alerts_test(email: str, dry_run: bool) -> None:
         sys.exit(1)
 
 
+# ============================================================================
+# Fixture Commands (offline benchmarking)
+# ============================================================================
+
+
+@cli.group()
+def fixtures() -> None:
+    """Record SJS responses and replay them from a local server."""
+    pass
+
+
+@fixtures.command("record")
+@click.option(
+    "--dir",
+    "directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=config.FIXTURE_DIR,
+    help="Fixture directory",
+)
+@click.option("--region", type=click.Choice([r.value for r in Region]), default="All")
+@click.option("--category", type=click.Choice([c.value for c in JobCategory]), default="All")
+@click.option("--keyword", default="", help="Search keyword")
+@click.option("--all-pages", is_flag=True, help="Record every results page")
+@click.option("--details", type=int, default=0, help="Also record this many job detail pages")
+def fixtures_record(
+    directory: Path,
+    region: str,
+    category: str,
+    keyword: str,
+    all_pages: bool,
+    details: int,
+) -> None:
+    """Scrape the live site, recording every response to a fixture directory."""
+    store = FixtureStore(directory)
+    scraper = SJSScraper()
+    scraper.session = RecordingSession(scraper.session, store)
+
+    try:
+        snapshot = scraper.scrape(
+            region=region, category=category, keyword=keyword, all_pages=all_pages
+        )
+        for job in snapshot.jobs[:details]:
+            scraper.fetch(config.get_job_url(job.id), use_cache=False)
+    except Exception as e:
+        console.print(f"[red]✗ Error:[/red] {e}")
+        sys.exit(1)
+
+    console.print(f"[green]✓[/green] Recorded {len(store)} responses to {directory}")
+
+
+@fixtures.command("serve")
+@click.option(
+    "--dir",
+    "directory",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=config.FIXTURE_DIR,
+    help="Fixture directory",
+)
+@click.option("--host", default="127.0.0.1", help="Interface to bind")
+@click.option("--port", type=int, default=8000, help="Port to bind")
+@click.option("--latency", type=float, default=0.0, help="Seconds of delay per request")
+@click.option("--error-rate", type=float, default=0.0, help="Fraction of requests to fail")
+@click.option(
+    "--error-status",
+    type=int,
+    multiple=True,
+    default=(429, 503),
+    help="Status code for injected errors (repeatable)",
+)
+def fixtures_serve(
+    directory: Path,
+    host: str,
+    port: int,
+    latency: float,
+    error_rate: float,
+    error_status: tuple[int, ...],
+) -> None:
+    """Replay recorded responses from a local HTTP server."""
+    store = FixtureStore(directory)
+    try:
+        server = FixtureServer(
+            store,
+            host=host,
+            port=port,
+            latency=latency,
+            error_rate=error_rate,
+            error_statuses=error_status,
+        )
+    except (OSError, ValueError) as e:
+        console.print(f"[red]✗ Error:[/red] {e}")
+        sys.exit(1)
+
+    console.print(f"Serving {len(store)} fixtures at {server.base_url}")
+    console.print(
+        f"Point the scraper at it with: SJS_BASE_URL={server.url_for('/jobs/search/')}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
 # ============================================================================
 # Run Command (Background Service)
 # ============================================================================
@@ -465,44 +595,91 @@ def run(dry_run: bool, once: bool) -> None:
 
     console.print(f"Loaded {len(subscriptions)} subscription(s)")
 
-    while True:
-        try:
-            # Scrape current jobs
-            console.print("\n[bold]Scraping jobs...[/bold]")
-            snapshot = scrape_sjs_jobs()
-
-            snap_store = SnapshotStore()
-            snap_store.save(snapshot)
+    # Reuse one scraper so conditional requests make quiet polls nearly free
+    cache = ResponseCache()
+    scraper = SJSScraper(
+        cache=cache,
+        result_paths=ResultPathResolver(config.RESULT_PATH_CACHE_FILE),
+    )
+    details = (
+        DetailFetcher(scraper)
+        if any(sub.include_descriptions for sub in subscriptions)
+        else None
+    )
 
-            # Check if we have a previous snapshot to compare
-            snapshots = snap_store.load_latest(n=2)
+    # One store for the whole run (the SQLite backend holds a connection open)
+    snap_store = get_snapshot_store()
+    try:
+        while True:
+            try:
+                # Scrape current jobs (skipped entirely if the board hasn't changed)
+                console.print("\n[bold]Scraping jobs...[/bold]")
+                if snap_store.count() > 0:
+                    snapshot = scraper.scrape_if_changed(all_pages=True)
+                else:
+                    snapshot = scraper.scrape(all_pages=True)
 
-            if len(snapshots) >= 2:
-                diff_result = diff_snapshots(snapshots[1], snapshots[0])
+                if snapshot is None:
+                    console.print("[dim]No changes detected (job board not modified)[/dim]")
+                else:
+                    if details is not None:
+                        # Only new or changed jobs need their detail page fetched
+                        previous = snap_store.load_latest(n=1)
+                        snapshot = details.enrich(snapshot, previous[0] if previous else None)
+                    _save_and_alert(snap_store, snapshot, subscriptions, dry_run)
+
+                # Only now may the next poll treat these pages as seen
+                cache.commit()
+
+            except Exception as e:
+                cache.discard()
+                console.print(f"[red]Error:[/red] {e}")
+
+            if once:
+                break
+
+            # Wait before next run (this is simplified - real version would use scheduler)
+            console.print("\n[dim]Waiting 1 hour until next check...[/dim]")
+            sleep(3600)
+    finally:
+        snap_store.close()
+
+
+def _save_and_alert(
+    snap_store: SnapshotStore,
+    snapshot: Snapshot,
+    subscriptions: Sequence[AlertSubscription],
+    dry_run: bool,
+) -> None:
+    """Save a fresh snapshot, diff it against the previous one and send alerts."""
+    # Identical content - just note that we looked, no new file or diff needed
+    if snapshot.content_digest == snap_store.latest_digest():
+        snap_store.record_heartbeat(snapshot)
+        console.print("[dim]No changes detected[/dim]")
+        return
 
-                if diff_result.has_changes:
-                    console.print(f"[green]{diff_result.total_changes} changes detected[/green]")
+    snap_store.save(snapshot)
 
-                    # Send alerts to subscribers
-                    sender = EmailSender(dry_run=dry_run)
+    # Check if we have a previous snapshot to compare
+    headers = snap_store.load_headers(n=2)
 
-                    for sub in subscriptions:
-                        console.print(f"  Sending alert to {sub.email}...")
-                        sender.send_alert(sub.email, diff_result)
-                else:
-                    console.print("[dim]No changes detected[/dim]")
-            else:
-                console.print("[dim]First snapshot - nothing to compare yet[/dim]")
+    if len(headers) >= 2:
+        # Computed once and cached; each email only decodes the changes it shows
+        diff_result = snap_store.diff(headers[1], headers[0], log=True)
 
-        except Exception as e:
-            console.print(f"[red]Error:[/red] {e}")
+        if diff_result.has_changes:
+            console.print(f"[green]{diff_result.total_changes} changes detected[/green]")
 
-        if once:
-            break
+            # Send alerts to subscribers
+            sender = EmailSender(dry_run=dry_run)
 
-        # Wait before next run (this is simplified - real version would use scheduler)
-        console.print("\n[dim]Waiting 1 hour until next check...[/dim]")
-        sleep(3600)
+            for sub in subscriptions:
+                console.print(f"  Sending alert to {sub.email}...")
+                sender.send_alert(sub.email, diff_result)
+        else:
+            console.print("[dim]No changes detected[/dim]")
+    else:
+        console.print("[dim]First snapshot - nothing to compare yet[/dim]")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,544 @@
+"""
+Columnar in-memory representation of snapshots.
+
+A Snapshot holds one pydantic Job per listing, which is convenient but costs
+a lot of memory per job and is slow to scan. ColumnarSnapshot stores each
+Job field as a column instead: pay as float arrays, dates as integer
+microsecond arrays, categorical strings dictionary-encoded as integer codes,
+and free text as plain lists. Filters, counts and diffs run over the columns
+directly, so many months of history fit in memory and scan quickly.
+"""
+
+import math
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from sjs_jobwatch.core.diff import _repost_change, _repost_pairs, compare_jobs
+from sjs_jobwatch.core.fields import tracked_field_specs
+from sjs_jobwatch.core.interning import CATEGORICAL_FIELDS, InternTable
+from sjs_jobwatch.core.models import (
+    DiffResult,
+    Job,
+    JobChange,
+    Snapshot,
+    SnapshotHeader,
+    compute_content_digest,
+    parse_datetime,
+)
+
+PAY_FIELDS = ("pay_min", "pay_max")
+DATE_FIELDS = ("posted_date", "start_date", "end_date")
+# Everything else (id, title, summary, description, url) is kept as plain text
+TEXT_FIELDS = tuple(
+    field
+    for field in Job.model_fields
+    if field not in CATEGORICAL_FIELDS and field not in PAY_FIELDS and field not in DATE_FIELDS
+)
+
+# Sentinels for missing values in typed arrays (pay is never NaN: Job requires >= 0)
+_MISSING_PAY = math.nan
+_MISSING_DATE = -(2**63)
+_NAIVE_OFFSET = -(2**31)
+
+# Serializes dates exactly as Job.model_dump(mode="json") does
+_DATETIME = TypeAdapter(datetime)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+class DictionaryColumn:
+    """
+    String column stored as integer codes into a per-column dictionary.
+
+    Code 0 is None. Comparing a column against a value only needs the value's
+    code, so filters never touch the strings themselves.
+    """
+
+    def __init__(self, table: InternTable | None = None, codes: Iterable[int] = ()) -> None:
+        """
+        Initialize the column.
+
+        Args:
+            table: Dictionary to encode into (a new one by default)
+            codes: Initial codes (must come from ``table``)
+        """
+        self.table = table if table is not None else InternTable()
+        self.codes = array("I", codes)
+
+    def append(self, value: str | None) -> None:
+        """Add a value to the end of the column."""
+        self.codes.append(self.table.encode(value))
+
+    def code_of(self, value: str | None) -> int | None:
+        """Code of a value, or None if it never occurs in the column."""
+        return self.table.lookup(value)
+
+    def take(self, indices: Sequence[int]) -> "DictionaryColumn":
+        """New column with the given rows (sharing this column's dictionary)."""
+        codes = self.codes
+        return DictionaryColumn(self.table, (codes[i] for i in indices))
+
+    def __getitem__(self, index: int) -> str | None:
+        return self.table.decode(self.codes[index])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[str | None]:
+        decode = self.table.decode
+        return (decode(code) for code in self.codes)
+
+
+def _encode_date(value: datetime | None) -> tuple[int, int]:
+    """Split a datetime into (microseconds since epoch, UTC offset seconds)."""
+    if value is None:
+        return _MISSING_DATE, 0
+    offset = value.utcoffset()
+    if offset is None:
+        return (value - _NAIVE_EPOCH) // timedelta(microseconds=1), _NAIVE_OFFSET
+    micros = (value - _EPOCH) // timedelta(microseconds=1)
+    return micros, int(offset.total_seconds())
+
+
+def _decode_date(micros: int, offset: int) -> datetime | None:
+    """Rebuild a datetime from its encoded parts."""
+    if micros == _MISSING_DATE:
+        return None
+    if offset == _NAIVE_OFFSET:
+        return _NAIVE_EPOCH + timedelta(microseconds=micros)
+    tz = timezone(timedelta(seconds=offset))
+    return (_EPOCH + timedelta(microseconds=micros)).astimezone(tz)
+
+
+class ColumnarSnapshot:
+    """
+    A snapshot stored column by column.
+
+    Converts losslessly to and from Snapshot. Rows keep the snapshot's job
+    order. Instances are meant to be treated as read-only.
+
+    Example:
+        columns = ColumnarSnapshot.from_snapshot(snapshot)
+        wellington_ict = columns.filter(region="Wellington", category="ICT")
+        by_employer = columns.count_by("employer")
+    """
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        source_url: str,
+        scrape_duration_seconds: float | None = None,
+        content_digest: str | None = None,
+    ) -> None:
+        """
+        Initialize an empty columnar snapshot (use from_snapshot/from_records).
+
+        Args:
+            timestamp: When the snapshot was taken
+            source_url: URL that was scraped
+            scrape_duration_seconds: How long the scrape took
+            content_digest: Digest of the jobs (see Snapshot.content_digest)
+        """
+        self.timestamp = timestamp
+        self.source_url = source_url
+        self.scrape_duration_seconds = scrape_duration_seconds
+        self.content_digest = content_digest
+
+        self.text: dict[str, list[str | None]] = {field: [] for field in TEXT_FIELDS}
+        self.categorical: dict[str, DictionaryColumn] = {
+            field: DictionaryColumn() for field in CATEGORICAL_FIELDS
+        }
+        self.pay: dict[str, array] = {field: array("d") for field in PAY_FIELDS}
+        self.dates: dict[str, array] = {field: array("q") for field in DATE_FIELDS}
+        self.date_offsets: dict[str, array] = {field: array("i") for field in DATE_FIELDS}
+        self._row_index: dict[str, int] | None = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> "ColumnarSnapshot":
+        """
+        Convert a Snapshot to columns.
+
+        Args:
+            snapshot: Snapshot to convert
+
+        Returns:
+            Columnar snapshot with the same jobs, in the same order
+        """
+        columns = cls(
+            timestamp=snapshot.timestamp,
+            source_url=snapshot.source_url,
+            scrape_duration_seconds=snapshot.scrape_duration_seconds,
+            content_digest=snapshot.content_digest,
+        )
+        for job in snapshot.jobs:
+            columns._append(job.__dict__)
+        return columns
+
+    @classmethod
+    def from_records(
+        cls,
+        data: dict[str, Any],
+        strings: InternTable | None = None,
+    ) -> "ColumnarSnapshot":
+        """
+        Build columns straight from a stored snapshot's JSON, without Job objects.
+
+        Args:
+            data: Decoded snapshot file (as written by SnapshotStore.save)
+            strings: Table for sharing identical text across snapshots
+
+        Returns:
+            Columnar snapshot
+        """
+        timestamp = data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = parse_datetime(timestamp)
+        columns = cls(
+            timestamp=timestamp,
+            source_url=data["source_url"],
+            scrape_duration_seconds=data.get("scrape_duration_seconds"),
+            content_digest=data.get("content_digest"),
+        )
+        share = strings.intern if strings is not None else None
+        for record in data.get("jobs", []):
+            row = dict(record)
+            for field in DATE_FIELDS:
+                value = row.get(field)
+                row[field] = parse_datetime(value) if isinstance(value, str) else value
+            if share is not None:
+                for field in TEXT_FIELDS:
+                    row[field] = share(row.get(field))
+            columns._append(row)
+        return columns
+
+    def _append(self, row: dict[str, Any]) -> None:
+        """Add one job's field values as a new row."""
+        for field, column in self.text.items():
+            column.append(row.get(field))
+        for field, column in self.categorical.items():
+            column.append(row.get(field))
+        for field, column in self.pay.items():
+            value = row.get(field)
+            column.append(_MISSING_PAY if value is None else value)
+        for field in DATE_FIELDS:
+            micros, offset = _encode_date(row.get(field))
+            self.dates[field].append(micros)
+            self.date_offsets[field].append(offset)
+
+    def __len__(self) -> int:
+        """Number of jobs."""
+        return len(self.text["id"])
+
+    @property
+    def ids(self) -> list[str]:
+        """Job IDs in row order."""
+        return self.text["id"]
+
+    def value(self, field: str, row: int) -> Any:
+        """
+        Get one field of one job.
+
+        Args:
+            field: Job field name
+            row: Row number
+
+        Returns:
+            Field value, as it would be on the Job
+        """
+        if field in self.text:
+            return self.text[field][row]
+        if field in self.categorical:
+            return self.categorical[field][row]
+        if field in self.pay:
+            pay = self.pay[field][row]
+            return None if math.isnan(pay) else pay
+        if field in self.dates:
+            return _decode_date(self.dates[field][row], self.date_offsets[field][row])
+        raise ValueError(f"Unknown job field: {field}")
+
+    def column(self, field: str) -> list[Any]:
+        """
+        Get a whole field as a list of Job-style values.
+
+        Args:
+            field: Job field name
+
+        Returns:
+            Values in row order
+        """
+        return [self.value(field, row) for row in range(len(self))]
+
+    def row(self, row: int) -> dict[str, Any]:
+        """Field values of one job, keyed by field name."""
+        return {field: self.value(field, row) for field in Job.model_fields}
+
+    def job(self, row: int) -> Job:
+        """Materialize one job."""
+        return Job(**self.row(row))
+
+    def iter_jobs(self) -> Iterator[Job]:
+        """Materialize jobs one at a time, in row order."""
+        for row in range(len(self)):
+            yield self.job(row)
+
+    def to_snapshot(self) -> Snapshot:
+        """
+        Convert back to a Snapshot.
+
+        Returns:
+            Snapshot equal to the one this was built from
+        """
+        jobs = list(self.iter_jobs())
+        return Snapshot(
+            timestamp=self.timestamp,
+            jobs=jobs,
+            total_count=len(jobs),
+            scrape_duration_seconds=self.scrape_duration_seconds,
+            source_url=self.source_url,
+            content_digest=self.content_digest,
+        )
+
+    def header(self) -> SnapshotHeader:
+        """
+        Get the snapshot's metadata without its jobs.
+
+        Only a subset from take() has no content digest yet; it is computed
+        (and kept) on first use, which materializes the jobs once.
+
+        Returns:
+            Header equal to that of to_snapshot()
+        """
+        if self.content_digest is None:
+            self.content_digest = compute_content_digest(self.iter_jobs())
+        return SnapshotHeader(
+            timestamp=self.timestamp,
+            total_count=len(self),
+            scrape_duration_seconds=self.scrape_duration_seconds,
+            source_url=self.source_url,
+            content_digest=self.content_digest,
+        )
+
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        """
+        Yield export rows in the same shape as ``Job.model_dump(mode="json")``.
+
+        Yields:
+            One JSON-compatible dict per job
+        """
+        for row in range(len(self)):
+            record = self.row(row)
+            for field in DATE_FIELDS:
+                if record[field] is not None:
+                    record[field] = _DATETIME.dump_python(record[field], mode="json")
+            yield record
+
+    def select(
+        self,
+        region: str | None = None,
+        category: str | None = None,
+        min_pay: float | None = None,
+        max_pay: float | None = None,
+    ) -> list[int]:
+        """
+        Find the rows matching all of the given filters.
+
+        Region and category are compared by dictionary code. ``"All"`` (or
+        None) disables that filter, as for Job.matches_region.
+
+        Args:
+            region: Region value to keep
+            category: Category value to keep
+            min_pay: Keep jobs whose pay reaches at least this (pay_max, else pay_min)
+            max_pay: Keep jobs whose pay starts at or below this (pay_min, else pay_max)
+
+        Returns:
+            Matching row numbers, in order
+        """
+        rows: Iterable[int] = range(len(self))
+
+        for field, value in (("region", region), ("category", category)):
+            if value is None or value == "All":
+                continue
+            code = self.categorical[field].code_of(value)
+            if code is None:
+                return []
+            codes = self.categorical[field].codes
+            rows = [row for row in rows if codes[row] == code]
+
+        if min_pay is not None or max_pay is not None:
+            low, high = self.pay["pay_min"], self.pay["pay_max"]
+            matched = []
+            for row in rows:
+                top = high[row] if not math.isnan(high[row]) else low[row]
+                bottom = low[row] if not math.isnan(low[row]) else high[row]
+                # NaN (no pay at all) never satisfies a pay filter
+                if min_pay is not None and not top >= min_pay:
+                    continue
+                if max_pay is not None and not bottom <= max_pay:
+                    continue
+                matched.append(row)
+            rows = matched
+
+        return list(rows)
+
+    def take(self, rows: Sequence[int]) -> "ColumnarSnapshot":
+        """
+        New columnar snapshot holding only the given rows.
+
+        Args:
+            rows: Row numbers to keep, in the order wanted
+
+        Returns:
+            Columnar snapshot (its content_digest is recomputed lazily by
+            to_snapshot or header)
+        """
+        subset = ColumnarSnapshot(
+            timestamp=self.timestamp,
+            source_url=self.source_url,
+            scrape_duration_seconds=self.scrape_duration_seconds,
+        )
+        for field, column in self.text.items():
+            subset.text[field] = [column[row] for row in rows]
+        for field, column in self.categorical.items():
+            subset.categorical[field] = column.take(rows)
+        for field, column in self.pay.items():
+            subset.pay[field] = array("d", (column[row] for row in rows))
+        for field in DATE_FIELDS:
+            dates, offsets = self.dates[field], self.date_offsets[field]
+            subset.dates[field] = array("q", (dates[row] for row in rows))
+            subset.date_offsets[field] = array("i", (offsets[row] for row in rows))
+        return subset
+
+    def filter(self, **filters: Any) -> "ColumnarSnapshot":
+        """
+        Subset matching the given filters (see select() for the options).
+
+        Returns:
+            Columnar snapshot of the matching jobs
+        """
+        return self.take(self.select(**filters))
+
+    def count_by(self, field: str) -> dict[str | None, int]:
+        """
+        Count jobs per value of a categorical field (e.g. for trend queries).
+
+        Args:
+            field: One of CATEGORICAL_FIELDS
+
+        Returns:
+            Job count per value, most common first
+        """
+        if field not in self.categorical:
+            raise ValueError(
+                f"Cannot count by {field}. Valid options: {', '.join(CATEGORICAL_FIELDS)}"
+            )
+        column = self.categorical[field]
+        counts = Counter(column.codes)
+        return {column.table.decode(code): count for code, count in counts.most_common()}
+
+    def row_of(self, job_id: str) -> int | None:
+        """Row number of a job ID, or None if it isn't in the snapshot."""
+        if self._row_index is None:
+            self._row_index = {job_id: row for row, job_id in enumerate(self.ids)}
+        return self._row_index.get(job_id)
+
+    def same_row(self, row: int, other: "ColumnarSnapshot", other_row: int) -> bool:
+        """
+        Check whether a row holds exactly the same tracked values as a row of another snapshot.
+
+        Args:
+            row: Row in this snapshot
+            other: Snapshot to compare against
+            other_row: Row in ``other``
+
+        Returns:
+            True if every tracked field is identical
+        """
+        for spec in tracked_field_specs():
+            field = spec.name
+            if field in self.text:
+                if self.text[field][row] != other.text[field][other_row]:
+                    return False
+            elif field in self.categorical:
+                mine, theirs = self.categorical[field], other.categorical[field]
+                # Codes from one dictionary are equal exactly when the strings are
+                if mine.table is theirs.table:
+                    if mine.codes[row] != theirs.codes[other_row]:
+                        return False
+                elif mine[row] != theirs[other_row]:
+                    return False
+            elif field in self.dates:
+                if (
+                    self.dates[field][row] != other.dates[field][other_row]
+                    or self.date_offsets[field][row] != other.date_offsets[field][other_row]
+                ):
+                    return False
+            elif field in self.pay:
+                mine, theirs = self.pay[field][row], other.pay[field][other_row]
+                if mine != theirs and not (math.isnan(mine) and math.isnan(theirs)):
+                    return False
+        return True
+
+
+def diff_columnar(previous: ColumnarSnapshot, current: ColumnarSnapshot) -> DiffResult:
+    """
+    Diff two columnar snapshots.
+
+    Rows whose tracked values are identical are skipped without building any
+    Job objects; only added, removed and possibly-modified jobs are
+    materialized, and the result refers to the snapshots by their headers.
+    Added and removed jobs are paired into reposts as diff_snapshots() does,
+    so the result matches it on the equivalent snapshots.
+
+    Args:
+        previous: Earlier snapshot
+        current: Later snapshot
+
+    Returns:
+        Complete diff result
+    """
+    added: list[JobChange] = []
+    removed: list[JobChange] = []
+    modified: list[JobChange] = []
+
+    for row, job_id in enumerate(current.ids):
+        previous_row = previous.row_of(job_id)
+        if previous_row is None:
+            added.append(JobChange(job_id=job_id, before=None, after=current.job(row)))
+        elif not current.same_row(row, previous, previous_row):
+            before, after = previous.job(previous_row), current.job(row)
+            changes = compare_jobs(before, after)
+            if changes:
+                modified.append(
+                    JobChange(job_id=job_id, before=before, after=after, changes=changes)
+                )
+
+    for row, job_id in enumerate(previous.ids):
+        if current.row_of(job_id) is None:
+            removed.append(JobChange(job_id=job_id, before=previous.job(row), after=None))
+
+    reposted: list[JobChange] = []
+    if added and removed:
+        pairs = _repost_pairs(
+            [change.before for change in removed], [change.after for change in added]
+        )
+        if pairs:
+            paired = {job.id for pair in pairs for job in pair}
+            added = [change for change in added if change.job_id not in paired]
+            removed = [change for change in removed if change.job_id not in paired]
+            reposted = [_repost_change(old_job, new_job) for old_job, new_job in pairs]
+
+    return DiffResult(
+        previous_snapshot=previous.header(),
+        current_snapshot=current.header(),
+        added=added,
+        removed=removed,
+        modified=modified,
+        reposted=reposted,
+    )
@@ -6,6 +6,7 @@ Handles environment variables, defaults, and path management.
 
 import os
 from pathlib import Path
+from urllib.parse import urljoin
 
 # ============================================================================
 # Project Paths
@@ -16,15 +17,24 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 SNAPSHOT_DIR = DATA_DIR / "snapshots"
 EXPORT_DIR = DATA_DIR / "exports"
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+DESCRIPTION_CACHE_FILE = DATA_DIR / "descriptions.json"
+FIXTURE_DIR = DATA_DIR / "fixtures"
+RESULT_PATH_CACHE_FILE = DATA_DIR / "result_paths.json"
 SUBSCRIPTIONS_FILE = PROJECT_ROOT / "subscriptions.json"
+# Per-deployment overrides of the fields the diff tracks (see core/fields.py)
+FIELD_SPECS_FILE = Path(os.getenv("FIELD_SPECS_FILE", PROJECT_ROOT / "fields.json"))
 LOG_FILE = DATA_DIR / "jobwatch.log"
 
 # ============================================================================
 # SJS Job Board Configuration
 # ============================================================================
 
-# Base URL for the SJS job search page
-SJS_BASE_URL = "https://www.sjs.govt.nz/jobs/search/"
+# Base URL for the SJS job search page (override to scrape a local fixture server)
+SJS_BASE_URL = os.getenv("SJS_BASE_URL", "https://www.sjs.govt.nz/jobs/search/")
+
+# Prefix of job detail page URLs (same host as searches)
+SJS_JOB_URL_PREFIX = urljoin(SJS_BASE_URL, "/jobs/")
 
 # Default search parameters
 DEFAULT_SEARCH_PARAMS = {
@@ -43,6 +53,33 @@ REQUEST_TIMEOUT = 30
 # Delay between requests (seconds) - be respectful to the server
 REQUEST_DELAY = 2.0
 
+# Sustained requests per second allowed to one host (token bucket refill rate)
+REQUEST_RATE = 1 / REQUEST_DELAY
+
+# Requests allowed back-to-back before the rate limit kicks in
+REQUEST_BURST = 3
+
+# Maximum number of results pages fetched concurrently in a multi-page scrape
+SCRAPE_MAX_WORKERS = 4
+
+# Upper bound on results pages per scrape (guards against a bogus page count)
+SCRAPE_MAX_PAGES = 200
+
+# Decode search results incrementally (lower peak memory on very large pages)
+SCRAPE_STREAMING = os.getenv("SCRAPE_STREAMING", "false").lower() in ("true", "1", "yes")
+
+# Fraction of parsed jobs run through full model validation to catch schema drift
+# (the rest are built directly from normalized values; 1.0 validates everything and
+# skips jobs that fail validation)
+JOB_VALIDATION_SAMPLE_RATE = float(os.getenv("JOB_VALIDATION_SAMPLE_RATE", "0.05"))
+
+# Most distinct categorical values (employers, regions, ...) shared process-wide;
+# further values are kept unshared so memory stays bounded
+INTERN_TABLE_MAX_SIZE = int(os.getenv("INTERN_TABLE_MAX_SIZE", "50000"))
+
+# How to locate __NEXT_DATA__ in a page: "fast" (byte search) or "soup" (BeautifulSoup)
+NEXT_DATA_EXTRACTOR = os.getenv("NEXT_DATA_EXTRACTOR", "fast")
+
 # ============================================================================
 # Email Configuration
 # ============================================================================
@@ -82,6 +119,41 @@ SNAPSHOT_RETENTION_DAYS = 90
 # Maximum number of snapshots to keep (0 = unlimited)
 MAX_SNAPSHOTS = 1000
 
+# Where snapshots are kept: "files" (JSON files) or "sqlite" (one database)
+SNAPSHOT_BACKEND = os.getenv("SNAPSHOT_BACKEND", "files")
+
+# Compression of new snapshot files: "none", "gzip" or "zstd" (needs the
+# zstandard package). Files written with any codec stay readable.
+SNAPSHOT_COMPRESSION = os.getenv("SNAPSHOT_COMPRESSION", "none")
+
+# Every Nth snapshot is stored in full (a keyframe); the ones in between are
+# stored as deltas against the snapshot before them (1 = always store in full)
+SNAPSHOT_KEYFRAME_INTERVAL = int(os.getenv("SNAPSHOT_KEYFRAME_INTERVAL", "24"))
+
+# ============================================================================
+# Diff Configuration
+# ============================================================================
+
+# Snapshots with at least this many jobs are diffed in a process pool (on
+# multi-core machines only). Below this, shipping shards to worker processes
+# costs more than the diff itself.
+DIFF_PARALLEL_THRESHOLD = int(os.getenv("DIFF_PARALLEL_THRESHOLD", "500000"))
+
+# Worker processes for parallel diffs (0 = one per CPU)
+DIFF_WORKERS = int(os.getenv("DIFF_WORKERS", "0"))
+
+# Cached diffs are evicted, least recently used first, beyond this total size
+DIFF_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Cached diffs unused for this many days are evicted (0 = no age limit)
+DIFF_CACHE_MAX_AGE_DAYS = 30
+
+# Pair removed jobs with near-identical added ones and report them as reposts
+DETECT_REPOSTS = os.getenv("DETECT_REPOSTS", "true").lower() in ("true", "1", "yes")
+
+# Minimum similarity (0-1) of title, employer, area and summary for a repost
+REPOST_SIMILARITY = float(os.getenv("REPOST_SIMILARITY", "0.8"))
+
 # ============================================================================
 # Logging Configuration
 # ============================================================================
@@ -128,6 +200,21 @@ def validate_email_config() -> tuple[bool, str]:
     return True, ""
 
 
+def get_job_url(job_id: str) -> str:
+    """
+    Build the URL of a job's detail page.
+    
+    Follows SJS_BASE_URL's host, so detail fetches go wherever searches go.
+    
+    Args:
+        job_id: SJS job ID
+        
+    Returns:
+        Detail page URL
+    """
+    return f"{SJS_JOB_URL_PREFIX}{job_id}"
+
+
 def get_sjs_url(region: str = "All", category: str = "All", keyword: str = "") -> str:
     """
     Build a complete SJS search URL with parameters.
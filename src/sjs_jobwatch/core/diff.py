@@ -1,37 +1,85 @@
 """
 Diff engine for comparing job snapshots.
 
-Provides deterministic, explainable diffing between two snapshots.
+Provides deterministic, explainable diffing between two snapshots. Removed
+jobs that reappear under a new ID are reported as reposts (see reposts.py)
+rather than as a removal plus an addition. Very large snapshots are split
+into shards by job ID and diffed in a process pool; the result is identical
+to the serial diff, ordering included.
 """
 
+import heapq
+import itertools
 import logging
-from typing import Any
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Protocol
 
-from sjs_jobwatch.core.models import DiffResult, FieldChange, Job, JobChange, Snapshot
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.fields import FieldSpec, tracked_field_specs
+from sjs_jobwatch.core.models import (
+    CHANGE_TYPES,
+    DiffResult,
+    FieldChange,
+    Job,
+    JobChange,
+    Snapshot,
+    SnapshotHeader,
+    tracked_fields,
+)
+from sjs_jobwatch.core.reposts import find_reposts
 
 logger = logging.getLogger(__name__)
 
-# Fields to track for changes
-TRACKED_FIELDS = [
-    "title",
-    "employer",
-    "category",
-    "classification",
-    "sub_classification",
-    "job_type",
-    "region",
-    "area",
-    "summary",
-    "description",
-    "pay_min",
-    "pay_max",
-    "posted_date",
-    "start_date",
-    "end_date",
-]
-
-
-def diff_snapshots(previous: Snapshot, current: Snapshot) -> DiffResult:
+
+def __getattr__(name: str) -> Any:
+    """Re-export models.TRACKED_FIELDS, resolved when first used."""
+    if name == "TRACKED_FIELDS":
+        return tracked_fields()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ChangeSet(Protocol):
+    """
+    Read-only view of a diff.
+    
+    Implemented by DiffResult, DiffStream and EncodedDiff, so displays and
+    emails work the same whether the changes are fully built, produced
+    lazily or decoded from the diff cache.
+    """
+
+    @property
+    def previous_snapshot(self) -> Snapshot | SnapshotHeader:
+        """Earlier snapshot (or its header)."""
+
+    @property
+    def current_snapshot(self) -> Snapshot | SnapshotHeader:
+        """Later snapshot (or its header)."""
+
+    @property
+    def total_changes(self) -> int:
+        """Total number of changes across all categories."""
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if there are any changes."""
+
+    def count(self, change_type: str) -> int:
+        """Count the changes of one type."""
+
+    def iter_changes(self, change_type: str | None = None) -> Iterator[JobChange]:
+        """Iterate over changes, in CHANGE_TYPES order."""
+
+
+# A shard row: (position in the snapshot, job ID, tracked field values)
+ShardRow = tuple[int, str, tuple[Any, ...]]
+
+
+def diff_snapshots(
+    previous: Snapshot, current: Snapshot, workers: int | None = None
+) -> DiffResult:
     """
     Calculate differences between two snapshots.
     
@@ -39,67 +87,108 @@ def diff_snapshots(previous: Snapshot, current: Snapshot) -> DiffResult:
     - Added jobs (in current but not in previous)
     - Removed jobs (in previous but not in current)
     - Modified jobs (in both, but with changed fields)
+    - Reposted jobs (removed, but re-listed under a new ID)
     
     Args:
         previous: Earlier snapshot
         current: Later snapshot
+        workers: Worker processes to diff with. None diffs in parallel only
+            when a snapshot has at least DIFF_PARALLEL_THRESHOLD jobs; 1
+            always diffs in this process.
         
     Returns:
         Complete diff result
     """
+    if workers is None:
+        size = max(len(previous.jobs), len(current.jobs))
+        workers = 1 if size < config.DIFF_PARALLEL_THRESHOLD else _default_workers()
+    if workers > 1:
+        return diff_snapshots_parallel(previous, current, workers)
+
     logger.debug(
         f"Diffing snapshots: {previous.total_count} jobs → {current.total_count} jobs"
     )
 
-    # Build lookup dictionaries for fast access
-    previous_jobs = {job.id: job for job in previous.jobs}
-    current_jobs = {job.id: job for job in current.jobs}
-
-    added: list[JobChange] = []
-    removed: list[JobChange] = []
-    modified: list[JobChange] = []
-
-    # Find added and modified jobs
-    for job_id, current_job in current_jobs.items():
-        if job_id not in previous_jobs:
-            # New job
-            added.append(
-                JobChange(
-                    job_id=job_id,
-                    before=None,
-                    after=current_job,
-                    changes=[],
-                )
-            )
-        else:
-            # Potentially modified job
-            previous_job = previous_jobs[job_id]
-            changes = compare_jobs(previous_job, current_job)
+    result = DiffStream(previous, current).to_result()
 
-            if changes:
-                modified.append(
-                    JobChange(
-                        job_id=job_id,
-                        before=previous_job,
-                        after=current_job,
-                        changes=changes,
-                    )
-                )
+    logger.info(
+        f"Diff complete: {len(result.added)} added, {len(result.removed)} removed, "
+        f"{len(result.modified)} modified, {len(result.reposted)} reposted"
+    )
 
-    # Find removed jobs
-    for job_id, previous_job in previous_jobs.items():
-        if job_id not in current_jobs:
-            removed.append(
-                JobChange(
-                    job_id=job_id,
-                    before=previous_job,
-                    after=None,
-                    changes=[],
-                )
-            )
+    return result
+
+
+def diff_snapshots_parallel(
+    previous: Snapshot, current: Snapshot, workers: int | None = None
+) -> DiffResult:
+    """
+    Calculate differences between two snapshots using a process pool.
+    
+    Both snapshots are split into one shard per worker by a hash of the job
+    ID, so a job always lands in the same shard on both sides. Workers only
+    receive IDs, positions, tracked field values and the field specs, and
+    send back positions and field changes; the JobChange objects are built
+    here, merged back into snapshot order so the result matches
+    diff_snapshots() exactly.
+    
+    Args:
+        previous: Earlier snapshot
+        current: Later snapshot
+        workers: Number of worker processes (defaults to DIFF_WORKERS)
+        
+    Returns:
+        Complete diff result
+    """
+    workers = workers or _default_workers()
+    logger.debug(
+        f"Diffing snapshots in {workers} shards: "
+        f"{previous.total_count} jobs → {current.total_count} jobs"
+    )
+
+    previous_shards = _shard_rows(previous.jobs, workers)
+    current_shards = _shard_rows(current.jobs, workers)
+    # Sent explicitly so workers don't each load the deployment's field specs
+    specs = itertools.repeat(tracked_field_specs(), workers)
+    # Spawn rather than fork: forked workers would end up copying the whole
+    # parent heap, snapshots included, as the garbage collector touches it
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        results = list(pool.map(_diff_shard, previous_shards, current_shards, specs))
+
+    added = [
+        JobChange(job_id=current.jobs[index].id, before=None, after=current.jobs[index], changes=[])
+        for _, index in heapq.merge(*(result[0] for result in results))
+    ]
+    removed = [
+        JobChange(
+            job_id=previous.jobs[index].id, before=previous.jobs[index], after=None, changes=[]
+        )
+        for _, index in heapq.merge(*(result[1] for result in results))
+    ]
+    modified = [
+        JobChange(
+            job_id=current.jobs[index].id,
+            before=previous.jobs[previous_index],
+            after=current.jobs[index],
+            changes=_field_changes(changes),
+        )
+        for _, previous_index, index, changes in heapq.merge(*(result[2] for result in results))
+    ]
+
+    # Reposts pair jobs across shards, so they are matched after the merge
+    pairs = _repost_pairs(
+        [change.before for change in removed], [change.after for change in added]
+    )
+    if pairs:
+        paired = {job.id for pair in pairs for job in pair}
+        added = [change for change in added if change.job_id not in paired]
+        removed = [change for change in removed if change.job_id not in paired]
+    reposted = [_repost_change(old_job, new_job) for old_job, new_job in pairs]
 
     logger.info(
-        f"Diff complete: {len(added)} added, {len(removed)} removed, {len(modified)} modified"
+        f"Diff complete: {len(added)} added, {len(removed)} removed, {len(modified)} modified, "
+        f"{len(reposted)} reposted"
     )
 
     return DiffResult(
@@ -108,87 +197,365 @@ def diff_snapshots(previous: Snapshot, current: Snapshot) -> DiffResult:
         added=added,
         removed=removed,
         modified=modified,
+        reposted=reposted,
     )
 
 
-def compare_jobs(old_job: Job, new_job: Job) -> list[FieldChange]:
+class DiffStream:
     """
-    Compare two versions of the same job and identify field changes.
+    Lazily evaluated diff between two snapshots.
+    
+    Offers the read side of DiffResult (count(), iter_changes(), has_changes)
+    without building every JobChange up front. Changes are produced as they
+    are iterated, so showing the first few of a huge change set costs only
+    those few, and counting builds no change objects at all. Only the two
+    ID indexes are held in memory, plus the repost pairs once anything
+    needs them.
+    """
+
+    def __init__(self, previous: Snapshot, current: Snapshot) -> None:
+        """
+        Initialize the stream.
+        
+        Args:
+            previous: Earlier snapshot
+            current: Later snapshot
+        """
+        self.previous_snapshot = previous
+        self.current_snapshot = current
+        self._previous_jobs = {job.id: job for job in previous.jobs}
+        self._current_jobs = {job.id: job for job in current.jobs}
+        self._counts: dict[str, int] | None = None
+        self._reposts: list[tuple[Job, Job]] | None = None
+        self._reposted_ids: set[str] = set()
+
+    def iter_changes(self, change_type: str | None = None) -> Iterator[JobChange]:
+        """
+        Iterate over changes, in CHANGE_TYPES order.
+        
+        Each type comes out in the same order as in diff_snapshots().
+        
+        Args:
+            change_type: Only yield changes of this type (None for all)
+            
+        Returns:
+            Iterator of job changes
+            
+        Raises:
+            ValueError: If the change type is unknown
+        """
+        kinds = CHANGE_TYPES if change_type is None else (change_type,)
+        for kind in kinds:
+            if kind not in CHANGE_TYPES:
+                raise ValueError(f"Unknown change type: {kind}")
+        return itertools.chain.from_iterable(
+            getattr(self, f"_iter_{kind}")() for kind in kinds
+        )
+
+    def count(self, change_type: str) -> int:
+        """
+        Count the changes of one type without building them.
+        
+        All counts are worked out together on first use.
+        
+        Args:
+            change_type: "added", "removed", "modified" or "reposted"
+            
+        Returns:
+            Number of changes of that type
+        """
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f"Unknown change type: {change_type}")
+        if self._counts is None:
+            self._counts = self._count_all()
+        return self._counts[change_type]
+
+    @property
+    def total_changes(self) -> int:
+        """Total number of changes across all categories."""
+        return sum(self.count(kind) for kind in CHANGE_TYPES)
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if there are any changes."""
+        return self.total_changes > 0
+
+    def to_result(self) -> DiffResult:
+        """Build every change into a complete DiffResult."""
+        return DiffResult(
+            previous_snapshot=self.previous_snapshot,
+            current_snapshot=self.current_snapshot,
+            added=list(self._iter_added()),
+            removed=list(self._iter_removed()),
+            modified=list(self._iter_modified()),
+            reposted=list(self._iter_reposted()),
+        )
+
+    def _iter_added(self) -> Iterator[JobChange]:
+        """Yield jobs only in the current snapshot, reposts excepted."""
+        self._repost_pairs()
+        for job_id, current_job in self._current_jobs.items():
+            if job_id not in self._previous_jobs and job_id not in self._reposted_ids:
+                yield JobChange(job_id=job_id, before=None, after=current_job, changes=[])
+
+    def _iter_removed(self) -> Iterator[JobChange]:
+        """Yield jobs only in the previous snapshot, reposted ones excepted."""
+        self._repost_pairs()
+        for job_id, previous_job in self._previous_jobs.items():
+            if job_id not in self._current_jobs and job_id not in self._reposted_ids:
+                yield JobChange(job_id=job_id, before=previous_job, after=None, changes=[])
+
+    def _iter_reposted(self) -> Iterator[JobChange]:
+        """Yield removed jobs re-listed under a new ID, in current snapshot order."""
+        for old_job, new_job in self._repost_pairs():
+            yield _repost_change(old_job, new_job)
+
+    def _repost_pairs(self) -> list[tuple[Job, Job]]:
+        """Find the (removed job, repost) pairs on first use."""
+        if self._reposts is None:
+            removed = [
+                job for job_id, job in self._previous_jobs.items()
+                if job_id not in self._current_jobs
+            ]
+            added = [
+                job for job_id, job in self._current_jobs.items()
+                if job_id not in self._previous_jobs
+            ]
+            self._reposts = _repost_pairs(removed, added)
+            self._reposted_ids = {job.id for pair in self._reposts for job in pair}
+        return self._reposts
+
+    def _iter_modified(self) -> Iterator[JobChange]:
+        """Yield jobs in both snapshots whose tracked fields changed."""
+        for job_id, current_job, previous_job in self._iter_common():
+            changes = compare_jobs(previous_job, current_job)
+            if changes:
+                yield JobChange(
+                    job_id=job_id, before=previous_job, after=current_job, changes=changes
+                )
+
+    def _iter_common(self) -> Iterator[tuple[str, Job, Job]]:
+        """Yield (ID, current, previous) for jobs in both snapshots whose tracked values differ."""
+        previous_jobs = self._previous_jobs
+        for job_id, current_job in self._current_jobs.items():
+            previous_job = previous_jobs.get(job_id)
+            if previous_job is None or previous_job is current_job:
+                continue
+            # Different fingerprints mean something changed; equal ones are
+            # confirmed, as two different sets of values can share a hash
+            if (
+                previous_job.fingerprint != current_job.fingerprint
+                or previous_job.tracked_values() != current_job.tracked_values()
+            ):
+                yield job_id, current_job, previous_job
+
+    def _count_all(self) -> dict[str, int]:
+        """Count every type of change without building change objects."""
+        common = sum(1 for job_id in self._current_jobs if job_id in self._previous_jobs)
+        specs = tracked_field_specs()
+        modified = sum(
+            1
+            for _, current_job, previous_job in self._iter_common()
+            if _changed_fields(previous_job.tracked_values(), current_job.tracked_values(), specs)
+        )
+        reposted = len(self._repost_pairs())
+        return {
+            "added": len(self._current_jobs) - common - reposted,
+            "removed": len(self._previous_jobs) - common - reposted,
+            "modified": modified,
+            "reposted": reposted,
+        }
+
+
+def iter_diff(
+    previous: Snapshot, current: Snapshot, change_type: str | None = None
+) -> Iterator[JobChange]:
+    """
+    Lazily yield the changes between two snapshots.
     
     Args:
-        old_job: Previous version
-        new_job: Current version
+        previous: Earlier snapshot
+        current: Later snapshot
+        change_type: Only yield changes of this type (None for all)
         
     Returns:
-        List of field changes
+        Iterator of job changes, in CHANGE_TYPES order
     """
-    changes: list[FieldChange] = []
+    return DiffStream(previous, current).iter_changes(change_type)
 
-    for field in TRACKED_FIELDS:
-        old_value = getattr(old_job, field, None)
-        new_value = getattr(new_job, field, None)
 
-        # Compare values (handle different types)
-        if not _values_equal(old_value, new_value):
-            changes.append(
-                FieldChange(
-                    field=field,
-                    old_value=_serialize_value(old_value),
-                    new_value=_serialize_value(new_value),
-                )
-            )
+def count_diff(previous: Snapshot, current: Snapshot) -> dict[str, int]:
+    """
+    Count the changes between two snapshots without building them.
+    
+    Args:
+        previous: Earlier snapshot
+        current: Later snapshot
+        
+    Returns:
+        Mapping of each change type in CHANGE_TYPES to its count
+    """
+    stream = DiffStream(previous, current)
+    return {kind: stream.count(kind) for kind in CHANGE_TYPES}
+
+
+def _repost_pairs(removed: list[Job], added: list[Job]) -> list[tuple[Job, Job]]:
+    """Pair removed jobs with their reposts, if repost detection is enabled."""
+    if not config.DETECT_REPOSTS:
+        return []
+    return find_reposts(removed, added)
+
+
+def _repost_change(old_job: Job, new_job: Job) -> JobChange:
+    """Describe a removed job re-listed under a new ID."""
+    return JobChange(
+        job_id=new_job.id,
+        before=old_job,
+        after=new_job,
+        changes=compare_jobs(old_job, new_job),
+        repost_of=old_job.id,
+    )
+
+
+def _default_workers() -> int:
+    """Number of worker processes for parallel diffs."""
+    return config.DIFF_WORKERS or os.cpu_count() or 1
+
 
-    return changes
+def _shard_rows(jobs: list[Job], shards: int) -> list[list[ShardRow]]:
+    """Split jobs into shards by job ID, keeping their positions."""
+    rows: list[list[ShardRow]] = [[] for _ in range(shards)]
+    ids = [job.id for job in jobs]
+    values = map(Job.tracked_values, jobs)
+    for row in zip(range(len(ids)), ids, values):
+        rows[hash(row[1]) % shards].append(row)
+    return rows
 
 
-def _values_equal(value1: Any, value2: Any) -> bool:
+def _index_rows(rows: list[ShardRow]) -> dict[str, list[Any]]:
     """
-    Check if two values are equal, handling special cases.
+    Index shard rows by job ID.
     
-    Treats None, empty string, and whitespace-only strings as equivalent.
+    Mirrors building a dict from the snapshot: a repeated ID keeps the
+    position of its first occurrence but the values of its last.
+    
+    Returns:
+        Mapping of job ID to [ordering position, job position, values]
+    """
+    indexed: dict[str, list[Any]] = {}
+    for index, job_id, values in rows:
+        entry = indexed.get(job_id)
+        if entry is None:
+            indexed[job_id] = [index, index, values]
+        else:
+            entry[1], entry[2] = index, values
+    return indexed
+
+
+def _diff_shard(
+    previous_rows: list[ShardRow],
+    current_rows: list[ShardRow],
+    specs: tuple[FieldSpec, ...],
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]], list[tuple[Any, ...]]]:
+    """
+    Diff one shard in a worker process.
+    
+    The field specs come from the parent process, in the order of the
+    tracked values in the rows.
+    
+    Returns:
+        (added, removed, modified) in snapshot order. Added and removed are
+        (ordering position, job position) pairs; modified entries are
+        (ordering position, previous job position, current job position,
+        field changes).
     """
-    # Normalize empty/whitespace strings to None
-    if isinstance(value1, str):
-        value1 = value1.strip() or None
-    if isinstance(value2, str):
-        value2 = value2.strip() or None
+    previous = _index_rows(previous_rows)
+    current = _index_rows(current_rows)
+
+    added: list[tuple[int, int]] = []
+    modified: list[tuple[Any, ...]] = []
+    for job_id, (order, index, values) in current.items():
+        entry = previous.get(job_id)
+        if entry is None:
+            added.append((order, index))
+        elif entry[2] != values:
+            changes = _changed_fields(entry[2], values, specs)
+            if changes:
+                modified.append((order, entry[1], index, changes))
 
-    return value1 == value2
+    removed = [
+        (order, index) for job_id, (order, index, _) in previous.items() if job_id not in current
+    ]
+    return added, removed, modified
 
 
-def _serialize_value(value: Any) -> str | None:
+def compare_jobs(old_job: Job, new_job: Job) -> list[FieldChange]:
     """
-    Serialize a value for display in FieldChange.
+    Compare two versions of the same job and identify field changes.
     
-    Converts various types to strings in a human-readable way.
+    Args:
+        old_job: Previous version
+        new_job: Current version
+        
+    Returns:
+        List of field changes
     """
-    if value is None:
-        return None
+    return _field_changes(
+        _changed_fields(old_job.tracked_values(), new_job.tracked_values(), tracked_field_specs())
+    )
 
-    if isinstance(value, (str, int, float)):
-        return str(value)
 
-    if hasattr(value, "isoformat"):  # datetime
-        return value.isoformat()
+def _changed_fields(
+    old_values: tuple[Any, ...], new_values: tuple[Any, ...], specs: tuple[FieldSpec, ...]
+) -> list[tuple[str, str | None, str | None, str | None]]:
+    """
+    Compare tracked field values of two versions of a job.
+    
+    Each field is checked with its spec's comparator (see fields.py), so
+    changes the deployment ignores never get serialized.
+    
+    Args:
+        old_values: Previous version's tracked values (see Job.tracked_values())
+        new_values: Current version's tracked values
+        specs: Specs of the tracked fields, in the same order
+        
+    Returns:
+        (field, old value, new value, edit summary) for each changed field,
+        serialized for display
+    """
+    return [
+        (spec.name, *spec.describe(old_value, new_value))
+        for spec, old_value, new_value in zip(specs, old_values, new_values)
+        if old_value is not new_value and spec.changed(old_value, new_value)
+    ]
+
 
-    return str(value)
+def _field_changes(
+    changes: list[tuple[str, str | None, str | None, str | None]],
+) -> list[FieldChange]:
+    """Build FieldChange objects from _changed_fields() output."""
+    return [
+        FieldChange(field=field, old_value=old_value, new_value=new_value, summary=summary)
+        for field, old_value, new_value, summary in changes
+    ]
 
 
-def summarize_diff(diff: DiffResult) -> str:
+def summarize_diff(diff: ChangeSet) -> str:
     """
     Create a human-readable summary of a diff.
     
     Args:
-        diff: Diff result to summarize
+        diff: Diff to summarize
         
     Returns:
         Summary string
     """
     lines = [
         f"Job changes from {diff.previous_snapshot.timestamp} to {diff.current_snapshot.timestamp}:",
-        f"  {len(diff.added)} new jobs",
-        f"  {len(diff.removed)} removed jobs",
-        f"  {len(diff.modified)} modified jobs",
+        f"  {diff.count('added')} new jobs",
+        f"  {diff.count('removed')} removed jobs",
+        f"  {diff.count('modified')} modified jobs",
+        f"  {diff.count('reposted')} reposted jobs",
         f"  {diff.total_changes} total changes",
     ]
 
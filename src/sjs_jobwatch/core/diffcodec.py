@@ -0,0 +1,375 @@
+"""
+Compact, JSON-friendly encoding of diffs.
+
+An encoded diff keeps the headers of its two snapshots, the digest of the
+field specs it was computed with, and only the jobs that changed. Each job
+is stored as a row of values in Job field order, and field changes as
+(field, old, new) triples, with the edit summary appended when there is
+one. Decoding is lazy: JobChange objects are only built for the changes
+that are actually read.
+
+Encoded diffs between consecutive snapshots compose into the net diff across
+the whole window, at a cost that depends on the number of changes rather
+than the number or size of the snapshots.
+"""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.diff import ChangeSet, compare_jobs
+from sjs_jobwatch.core.fields import tracked_specs_digest
+from sjs_jobwatch.core.models import (
+    CHANGE_TYPES,
+    FieldChange,
+    Job,
+    JobChange,
+    Snapshot,
+    SnapshotHeader,
+)
+from sjs_jobwatch.core.reposts import find_reposts
+
+# Bumped whenever the encoded layout changes; unknown versions are rejected
+ENCODING_VERSION = 3
+
+# Older layouts that still decode: version 1 predates repost detection and
+# reads as a diff without reposts, version 2 predates edit summaries
+_LEGACY_VERSIONS = (1, 2)
+
+
+def encode_diff(diff: ChangeSet) -> dict[str, Any]:
+    """
+    Encode a diff compactly.
+
+    Args:
+        diff: Diff to encode
+
+    Returns:
+        JSON-serializable dict (see EncodedDiff)
+    """
+    fields = list(Job.model_fields)
+
+    def row(job: Job) -> list[Any]:
+        return _encode_job(fields, job)
+
+    def pair(change: JobChange) -> list[Any]:
+        return [
+            row(change.before),
+            row(change.after),
+            [_encode_change(fc) for fc in change.changes],
+        ]
+
+    return {
+        "version": ENCODING_VERSION,
+        "previous": _header(diff.previous_snapshot).model_dump(mode="json"),
+        "current": _header(diff.current_snapshot).model_dump(mode="json"),
+        "field_specs": tracked_specs_digest(),
+        "fields": fields,
+        "added": [row(change.after) for change in diff.iter_changes("added")],
+        "removed": [row(change.before) for change in diff.iter_changes("removed")],
+        "modified": [pair(change) for change in diff.iter_changes("modified")],
+        "reposted": [pair(change) for change in diff.iter_changes("reposted")],
+    }
+
+
+class EncodedDiff:
+    """
+    A diff decoded lazily from its compact encoding.
+
+    Offers the read side of DiffResult. The snapshots are only available as
+    headers, so nothing here needs the snapshot files.
+    """
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """
+        Wrap an encoded diff.
+
+        Args:
+            data: Output of encode_diff()
+
+        Raises:
+            ValueError: If the data has another encoding version
+        """
+        if data.get("version") not in (*_LEGACY_VERSIONS, ENCODING_VERSION):
+            raise ValueError(f"Unsupported diff encoding version: {data.get('version')}")
+        if "reposted" not in data:
+            data = {**data, "reposted": []}
+        self.data = data
+        self.previous_snapshot = SnapshotHeader(**data["previous"])
+        self.current_snapshot = SnapshotHeader(**data["current"])
+        self._fields: list[str] = data["fields"]
+        # Digest of the field specs that produced the diff (None if older)
+        self.field_specs: str | None = data.get("field_specs")
+
+    @classmethod
+    def from_diff(cls, diff: ChangeSet) -> "EncodedDiff":
+        """Encode a diff."""
+        return cls(encode_diff(diff))
+
+    def with_headers(
+        self, previous: SnapshotHeader, current: SnapshotHeader
+    ) -> "EncodedDiff":
+        """
+        Get this diff relabelled for another pair of snapshots.
+
+        Diffs are stored by content digest, so one entry serves every pair
+        of snapshots with the same contents (e.g. a board flipping between
+        two states); the stored headers are those of the first such pair.
+
+        Args:
+            previous: Header of the earlier snapshot
+            current: Header of the later snapshot
+
+        Returns:
+            Diff with the given headers
+        """
+        return EncodedDiff(
+            {
+                **self.data,
+                "previous": previous.model_dump(mode="json"),
+                "current": current.model_dump(mode="json"),
+            }
+        )
+
+    def count(self, change_type: str) -> int:
+        """
+        Count the changes of one type.
+
+        Args:
+            change_type: "added", "removed", "modified" or "reposted"
+
+        Returns:
+            Number of changes of that type
+        """
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f"Unknown change type: {change_type}")
+        return len(self.data[change_type])
+
+    @property
+    def total_changes(self) -> int:
+        """Total number of changes across all categories."""
+        return sum(len(self.data[kind]) for kind in CHANGE_TYPES)
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if there are any changes."""
+        return self.total_changes > 0
+
+    def iter_changes(self, change_type: str | None = None) -> Iterator[JobChange]:
+        """
+        Iterate over changes, in CHANGE_TYPES order.
+
+        Args:
+            change_type: Only yield changes of this type (None for all)
+
+        Returns:
+            Iterator of job changes
+
+        Raises:
+            ValueError: If the change type is unknown
+        """
+        kinds = CHANGE_TYPES if change_type is None else (change_type,)
+        for kind in kinds:
+            if kind not in CHANGE_TYPES:
+                raise ValueError(f"Unknown change type: {kind}")
+        return self._decode(kinds)
+
+    def _decode(self, kinds: tuple[str, ...]) -> Iterator[JobChange]:
+        """Build JobChange objects for the given change types."""
+        for kind in kinds:
+            for entry in self.data[kind]:
+                if kind == "added":
+                    after = self._job(entry)
+                    yield JobChange(job_id=after.id, before=None, after=after, changes=[])
+                elif kind == "removed":
+                    before = self._job(entry)
+                    yield JobChange(job_id=before.id, before=before, after=None, changes=[])
+                else:
+                    before_row, after_row, changes = entry
+                    before, after = self._job(before_row), self._job(after_row)
+                    yield JobChange(
+                        job_id=after.id,
+                        before=before,
+                        after=after,
+                        changes=[_decode_change(change) for change in changes],
+                        repost_of=before.id if kind == "reposted" else None,
+                    )
+
+    def _job(self, row: list[Any]) -> Job:
+        """Build a job from an encoded row."""
+        return _decode_job(self._fields, row)
+
+
+def compose_diffs(
+    diffs: Sequence[EncodedDiff],
+    previous: SnapshotHeader | None = None,
+    current: SnapshotHeader | None = None,
+) -> EncodedDiff:
+    """
+    Compose the diffs of consecutive snapshot intervals into one net diff.
+
+    The result covers the window's first snapshot to its last, and has the
+    same changes as diffing those two directly: a job added and later
+    removed cancels out, one removed and re-added unchanged disappears, and
+    successive field changes collapse into one change from the first value
+    to the last. Reposts are split back into a removal and an addition, and
+    detected again across the whole window. Changes are listed in the order
+    they first appear in the component diffs, not in snapshot order.
+
+    The exception is a number field with a threshold: steps each below the
+    threshold are missing from the component diffs even when together they
+    cross it, so the net diff misses that change. SnapshotStore.net_diff()
+    diffs the snapshots directly in that case.
+
+    Args:
+        diffs: Diffs of consecutive intervals, oldest first
+        previous: Header of the window's first snapshot (defaults to the
+            first diff's previous snapshot)
+        current: Header of the window's last snapshot (defaults to the
+            last diff's current snapshot)
+
+    Returns:
+        Net diff
+
+    Raises:
+        ValueError: If there are no diffs or they don't form a chain
+    """
+    if not diffs:
+        raise ValueError("No diffs to compose")
+
+    fields = list(Job.model_fields)
+    id_index = fields.index("id")
+    # Job ID -> [row before the window, row after it, field changes or None if stale]
+    net: dict[str, list[Any]] = {}
+
+    for position, diff in enumerate(diffs):
+        if position and (
+            diff.previous_snapshot.content_digest
+            != diffs[position - 1].current_snapshot.content_digest
+        ):
+            raise ValueError(
+                f"Diffs are not consecutive: {diffs[position - 1].current_snapshot.timestamp} "
+                f"is followed by {diff.previous_snapshot.timestamp}"
+            )
+        layout = diff.data["fields"]
+
+        for after in diff.data["added"]:
+            after = _relayout(after, layout, fields)
+            _merge(net, after[id_index], None, after, [])
+        for before in diff.data["removed"]:
+            before = _relayout(before, layout, fields)
+            _merge(net, before[id_index], before, None, [])
+        for before, after, changes in diff.data["modified"]:
+            before, after = _relayout(before, layout, fields), _relayout(after, layout, fields)
+            _merge(net, after[id_index], before, after, changes)
+        for before, after, _ in diff.data["reposted"]:
+            before, after = _relayout(before, layout, fields), _relayout(after, layout, fields)
+            _merge(net, before[id_index], before, None, [])
+            _merge(net, after[id_index], None, after, [])
+
+    added, removed, modified = [], [], []
+    for before, after, changes in net.values():
+        if before is None and after is None:
+            continue
+        if before is None:
+            added.append(after)
+        elif after is None:
+            removed.append(before)
+        else:
+            if changes is None:
+                changes = [
+                    _encode_change(fc)
+                    for fc in compare_jobs(_decode_job(fields, before), _decode_job(fields, after))
+                ]
+            if changes:
+                modified.append([before, after, changes])
+
+    reposted = []
+    if config.DETECT_REPOSTS and added and removed:
+        removed_jobs = [_decode_job(fields, row) for row in removed]
+        added_jobs = [_decode_job(fields, row) for row in added]
+        pairs = find_reposts(removed_jobs, added_jobs)
+        if pairs:
+            paired = {job.id for pair in pairs for job in pair}
+            added = [row for row in added if row[id_index] not in paired]
+            removed = [row for row in removed if row[id_index] not in paired]
+            reposted = [
+                [
+                    _encode_job(fields, old_job),
+                    _encode_job(fields, new_job),
+                    [_encode_change(fc) for fc in compare_jobs(old_job, new_job)],
+                ]
+                for old_job, new_job in pairs
+            ]
+
+    return EncodedDiff(
+        {
+            "version": ENCODING_VERSION,
+            "previous": (previous or diffs[0].previous_snapshot).model_dump(mode="json"),
+            "current": (current or diffs[-1].current_snapshot).model_dump(mode="json"),
+            "field_specs": tracked_specs_digest(),
+            "fields": fields,
+            "added": added,
+            "removed": removed,
+            "modified": modified,
+            "reposted": reposted,
+        }
+    )
+
+
+def _merge(
+    net: dict[str, list[Any]],
+    job_id: str,
+    before: list[Any] | None,
+    after: list[Any] | None,
+    changes: list[Any],
+) -> None:
+    """Fold one job's change in an interval into its net change so far."""
+    entry = net.get(job_id)
+    if entry is None:
+        net[job_id] = [before, after, changes]
+    else:
+        # Keep the earliest "before"; field changes must be recomputed
+        entry[1] = after
+        entry[2] = None
+
+
+def _relayout(row: list[Any], layout: list[str], fields: list[str]) -> list[Any]:
+    """Reorder a row encoded with another field layout (e.g. an older Job model)."""
+    if layout == fields:
+        return row
+    data = dict(zip(layout, row))
+    return [data.get(field) for field in fields]
+
+
+def _encode_job(fields: list[str], job: Job) -> list[Any]:
+    """Encode a job as a row of values in field order."""
+    data = job.model_dump(mode="json")
+    return [data[field] for field in fields]
+
+
+def _encode_change(change: FieldChange) -> list[str | None]:
+    """Encode a field change, leaving out an empty edit summary."""
+    if change.summary is None:
+        return [change.field, change.old_value, change.new_value]
+    return [change.field, change.old_value, change.new_value, change.summary]
+
+
+def _decode_change(entry: list[str | None]) -> FieldChange:
+    """Build a field change from its encoding."""
+    return FieldChange(
+        field=entry[0],
+        old_value=entry[1],
+        new_value=entry[2],
+        summary=entry[3] if len(entry) > 3 else None,
+    )
+
+
+def _decode_job(fields: list[str], row: list[Any]) -> Job:
+    """Build a job from an encoded row."""
+    return Job(**dict(zip(fields, row)))
+
+
+def _header(snapshot: Snapshot | SnapshotHeader) -> SnapshotHeader:
+    """Get the header of a snapshot, or pass a header through."""
+    return snapshot.header() if isinstance(snapshot, Snapshot) else snapshot
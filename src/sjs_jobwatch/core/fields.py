@@ -0,0 +1,410 @@
+"""
+Registry of the job fields tracked by the diff engine.
+
+Each tracked field has a FieldSpec that says how its values are compared
+and displayed. Comparators are built once per field, specialized for its
+kind and options, so the diff's hot loop calls one small function per field
+instead of dispatching on value types. Changes a deployment considers noise,
+such as small pay adjustments or whitespace-only text edits, are rejected
+by the comparator before any FieldChange is created.
+
+Long, description-like fields are "document" fields: they are compared by a
+digest of their normalized text (HTML tags and entities removed, whitespace
+collapsed), so re-rendering an advert doesn't count as a change. Their
+FieldChange carries bounded snippets around the edit plus a short summary
+instead of both full texts.
+
+The defaults can be overridden per deployment with a JSON file (see
+config.FIELD_SPECS_FILE) mapping field names to options, or to null to stop
+tracking a field:
+
+    {
+        "pay_min": {"threshold": 500},
+        "description": {"ignore_whitespace": true},
+        "summary": null,
+        "url": {"kind": "text"}
+    }
+"""
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from sjs_jobwatch.core import config
+
+logger = logging.getLogger(__name__)
+
+FIELD_KINDS = ("text", "document", "number", "date")
+
+# Characters of context kept either side of an edit in a document snippet,
+# and the most characters a snippet may hold
+SNIPPET_CONTEXT = 40
+SNIPPET_MAX_CHARS = 160
+
+# Tracked by default, in diff order
+DEFAULT_TRACKED_FIELDS = {
+    "title": "text",
+    "employer": "text",
+    "category": "text",
+    "classification": "text",
+    "sub_classification": "text",
+    "job_type": "text",
+    "region": "text",
+    "area": "text",
+    "summary": "text",
+    "description": "document",
+    "pay_min": "number",
+    "pay_max": "number",
+    "posted_date": "date",
+    "start_date": "date",
+    "end_date": "date",
+}
+
+_OPTIONS = ("kind", "threshold", "ignore_whitespace", "ignore_case")
+
+# (old value, new value, edit summary) as shown in a FieldChange
+Description = tuple[str | None, str | None, str | None]
+
+_TAG = re.compile(r"<[^>]*>")
+
+
+class FieldSpec:
+    """
+    How one tracked field is compared and displayed.
+
+    Attributes:
+        name: Job field name
+        kind: "text", "document", "number" or "date"
+        changed: Comparator, true if two values differ meaningfully
+        describe: Converts a changed pair of values to what a FieldChange shows
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "text",
+        threshold: float = 0,
+        ignore_whitespace: bool = False,
+        ignore_case: bool = False,
+    ) -> None:
+        """
+        Build a field spec and its comparator.
+
+        Text values are always compared with surrounding whitespace removed,
+        and an empty value counts as missing. Documents always ignore markup
+        and whitespace.
+
+        Args:
+            name: Job field name
+            kind: "text", "document", "number" or "date"
+            threshold: For numbers, ignore changes smaller than this
+            ignore_whitespace: For text, ignore changes to whitespace alone
+            ignore_case: For text and documents, ignore changes to letter case alone
+
+        Raises:
+            ValueError: If the kind is unknown or an option doesn't apply to it
+        """
+        if kind not in FIELD_KINDS:
+            raise ValueError(f"Unknown kind for field {name}: {kind}")
+        if threshold and kind != "number":
+            raise ValueError(f"threshold only applies to number fields, not {name}")
+        if ignore_whitespace and kind != "text":
+            raise ValueError(f"ignore_whitespace only applies to text fields, not {name}")
+        if ignore_case and kind not in ("text", "document"):
+            raise ValueError(f"ignore_case only applies to text and documents, not {name}")
+        if threshold < 0:
+            raise ValueError(f"threshold for {name} must be >= 0")
+
+        self.name = name
+        self.kind = kind
+        self.threshold = threshold
+        self.ignore_whitespace = ignore_whitespace
+        self.ignore_case = ignore_case
+
+        self.changed: Callable[[Any, Any], bool]
+        self.describe: Callable[[Any, Any], Description]
+        if kind == "text":
+            self.changed = _text_comparator(ignore_whitespace, ignore_case)
+            self.describe = _describe_text
+        elif kind == "document":
+            self.changed = _document_comparator(ignore_case)
+            self.describe = _describe_document
+        elif kind == "number":
+            self.changed = _number_comparator(threshold)
+            self.describe = _describe_number
+        else:
+            self.changed = _exact_changed
+            self.describe = _describe_date
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the spec by its options (comparators are rebuilt, e.g. in diff workers)."""
+        return FieldSpec, (
+            self.name,
+            self.kind,
+            self.threshold,
+            self.ignore_whitespace,
+            self.ignore_case,
+        )
+
+    def __repr__(self) -> str:
+        """Show the field and its non-default options."""
+        options = [f"{self.name!r}", f"kind={self.kind!r}"]
+        if self.threshold:
+            options.append(f"threshold={self.threshold}")
+        if self.ignore_whitespace:
+            options.append("ignore_whitespace=True")
+        if self.ignore_case:
+            options.append("ignore_case=True")
+        return f"FieldSpec({', '.join(options)})"
+
+
+def default_field_specs() -> list[FieldSpec]:
+    """Specs of the fields tracked by default."""
+    return [FieldSpec(name, kind) for name, kind in DEFAULT_TRACKED_FIELDS.items()]
+
+
+def load_field_specs(path: Path | None = None) -> list[FieldSpec]:
+    """
+    Build the tracked field specs, applying a deployment's overrides.
+
+    Overridden fields keep their default position; newly tracked fields are
+    appended in file order.
+
+    Args:
+        path: JSON overrides file (defaults to config.FIELD_SPECS_FILE). A
+            missing file leaves the defaults unchanged.
+
+    Returns:
+        Field specs in diff order
+
+    Raises:
+        ValueError: If the file is invalid, sets an unknown option or
+            leaves no field tracked
+    """
+    path = path or config.FIELD_SPECS_FILE
+    try:
+        overrides = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return default_field_specs()
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path} must map field names to options")
+
+    options: dict[str, dict[str, Any] | None] = {
+        name: {"kind": kind} for name, kind in DEFAULT_TRACKED_FIELDS.items()
+    }
+    for name, override in overrides.items():
+        if override is None:
+            options[name] = None
+            continue
+        if not isinstance(override, dict):
+            raise ValueError(f"Options for field {name} in {path} must be an object or null")
+        unknown = set(override) - set(_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown options for field {name}: {', '.join(sorted(unknown))}")
+        options[name] = {**(options.get(name) or {"kind": "text"}), **override}
+
+    specs = [FieldSpec(name, **spec) for name, spec in options.items() if spec is not None]
+    if not specs:
+        raise ValueError(f"{path} must leave at least one field tracked")
+    logger.debug(f"Loaded tracked fields from {path}: {specs}")
+    return specs
+
+
+@lru_cache(maxsize=1)
+def tracked_field_specs() -> tuple[FieldSpec, ...]:
+    """
+    Tracked field specs for this deployment, in diff order.
+
+    Loaded from config.FIELD_SPECS_FILE on first use rather than at import,
+    so a broken file fails the commands that diff with a clear error instead
+    of every import of the package. Call tracked_field_specs.cache_clear()
+    to pick up a changed file.
+
+    Returns:
+        Field specs in diff order
+
+    Raises:
+        ValueError: If the file is invalid (see load_field_specs())
+    """
+    return tuple(load_field_specs())
+
+
+def tracked_specs_digest() -> str:
+    """Digest of the tracked field specs (see field_specs_digest())."""
+    return field_specs_digest(tracked_field_specs())
+
+
+def field_specs_digest(specs: Sequence[FieldSpec]) -> str:
+    """
+    Fingerprint a set of field specs.
+
+    Diffs computed under different specs can disagree, so stored diffs are
+    tagged with the digest of the specs that produced them.
+
+    Args:
+        specs: Field specs in diff order
+
+    Returns:
+        Short hex digest of the fields and their options
+    """
+    text = "\n".join(repr(spec) for spec in specs)
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def _text_comparator(ignore_whitespace: bool, ignore_case: bool) -> Callable[[Any, Any], bool]:
+    """Build a text comparator for the given options."""
+    if ignore_whitespace and ignore_case:
+
+        def normalize(value: str | None) -> str | None:
+            return " ".join(value.split()).casefold() or None if value else None
+
+    elif ignore_whitespace:
+
+        def normalize(value: str | None) -> str | None:
+            return " ".join(value.split()) or None if value else None
+
+    elif ignore_case:
+
+        def normalize(value: str | None) -> str | None:
+            return value.strip().casefold() or None if value else None
+
+    else:
+
+        def normalize(value: str | None) -> str | None:
+            return value.strip() or None if value else None
+
+    def changed(old: str | None, new: str | None) -> bool:
+        return old != new and normalize(old) != normalize(new)
+
+    return changed
+
+
+def _number_comparator(threshold: float) -> Callable[[Any, Any], bool]:
+    """Build a number comparator that ignores changes below a threshold."""
+    if not threshold:
+        return _exact_changed
+
+    def changed(old: float | None, new: float | None) -> bool:
+        if old is None or new is None:
+            return old is not new
+        return abs(new - old) >= threshold
+
+    return changed
+
+
+def _exact_changed(old: Any, new: Any) -> bool:
+    """Compare values exactly (dates, and numbers without a threshold)."""
+    return old != new
+
+
+def _document_comparator(ignore_case: bool) -> Callable[[Any, Any], bool]:
+    """Build a document comparator, optionally ignoring letter case."""
+    if ignore_case:
+
+        def changed(old: str | None, new: str | None) -> bool:
+            return old != new and _folded_digest(old) != _folded_digest(new)
+
+    else:
+
+        def changed(old: str | None, new: str | None) -> bool:
+            return old != new and _document_digest(old) != _document_digest(new)
+
+    return changed
+
+
+def normalize_document(value: str | None) -> str:
+    """
+    Reduce a document to its visible text.
+
+    Args:
+        value: Text, possibly containing HTML
+
+    Returns:
+        Text with tags removed, entities decoded and whitespace collapsed
+    """
+    if not value:
+        return ""
+    if "<" in value:
+        value = _TAG.sub(" ", value)
+    if "&" in value:
+        value = html.unescape(value)
+    return " ".join(value.split())
+
+
+@lru_cache(maxsize=8192)
+def _document_digest(value: str | None) -> bytes:
+    """Digest of a document's normalized text (cached: documents recur across diffs)."""
+    return hashlib.blake2b(normalize_document(value).encode(), digest_size=16).digest()
+
+
+@lru_cache(maxsize=8192)
+def _folded_digest(value: str | None) -> bytes:
+    """Digest of a document's normalized, case-folded text."""
+    return hashlib.blake2b(
+        normalize_document(value).casefold().encode(), digest_size=16
+    ).digest()
+
+
+def _describe_text(old: str | None, new: str | None) -> Description:
+    """Show text values in full."""
+    return old, new, None
+
+
+def _describe_document(old: str | None, new: str | None) -> Description:
+    """
+    Show the edited part of a document and summarize the edit by words.
+
+    Snippets cover the span between the longest common prefix and suffix of
+    the normalized texts, with some context, cut to SNIPPET_MAX_CHARS.
+    """
+    old_text, new_text = normalize_document(old), normalize_document(new)
+    prefix = len(os.path.commonprefix([old_text, new_text]))
+    suffix = len(os.path.commonprefix([old_text[prefix:][::-1], new_text[prefix:][::-1]]))
+
+    old_words, new_words = old_text.split(), new_text.split()
+    word_prefix = len(os.path.commonprefix([old_words, new_words]))
+    word_suffix = len(
+        os.path.commonprefix([old_words[word_prefix:][::-1], new_words[word_prefix:][::-1]])
+    )
+    removed = len(old_words) - word_prefix - word_suffix
+    added = len(new_words) - word_prefix - word_suffix
+    summary = f"{removed} words replaced by {added} ({len(old_words)} → {len(new_words)} words)"
+
+    return (
+        _snippet(old_text, prefix, len(old_text) - suffix) if old else None,
+        _snippet(new_text, prefix, len(new_text) - suffix) if new else None,
+        summary,
+    )
+
+
+def _snippet(text: str, start: int, end: int) -> str:
+    """Cut the edited span [start, end) of a text, with context, to a bounded snippet."""
+    start = max(0, start - SNIPPET_CONTEXT)
+    end = min(len(text), end + SNIPPET_CONTEXT, start + SNIPPET_MAX_CHARS)
+    return f"{'…' if start else ''}{text[start:end]}{'…' if end < len(text) else ''}"
+
+
+def _describe_number(old: float | None, new: float | None) -> Description:
+    """Show numbers as strings."""
+    return (
+        None if old is None else str(old),
+        None if new is None else str(new),
+        None,
+    )
+
+
+def _describe_date(old: datetime | None, new: datetime | None) -> Description:
+    """Show dates in ISO format."""
+    return (
+        None if old is None else old.isoformat(),
+        None if new is None else new.isoformat(),
+        None,
+    )
@@ -0,0 +1,156 @@
+"""
+Shared string tables for repeated categorical job fields.
+
+Regions, categories, employers and the like repeat across thousands of jobs
+and every snapshot. Interning them through one table means each distinct
+value is stored once however many jobs or snapshots refer to it. The table
+also hands out small integer codes, for compact dictionary-encoded columns.
+
+The process-wide table only ever sees these categorical fields, never free
+text such as descriptions, and stops adding values once it holds
+config.INTERN_TABLE_MAX_SIZE of them, so a long-running process's memory
+stays bounded; values past the cap are simply not shared.
+"""
+
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from sjs_jobwatch.core import config
+
+# Job fields whose values repeat heavily across a snapshot
+CATEGORICAL_FIELDS = (
+    "employer",
+    "category",
+    "classification",
+    "sub_classification",
+    "job_type",
+    "region",
+    "area",
+)
+
+
+class InternTable:
+    """
+    Canonical copies of strings, plus a stable integer code for each.
+
+    ``intern`` returns the one shared object for a value. ``encode`` and
+    ``decode`` map values to codes and back; code 0 always means None.
+    Lookups are lock-free; only adding a new value takes the lock.
+    """
+
+    def __init__(self, values: Iterable[str] = (), max_size: int | None = None) -> None:
+        """
+        Initialize the table.
+
+        Args:
+            values: Values to register up front (e.g. enum values, so that
+                interned strings are the enum's own objects)
+            max_size: Most values intern() adds; past it, new values are
+                returned unshared (encode() always assigns a code)
+        """
+        self.max_size = max_size
+        self._canonical: dict[str, str] = {}
+        self._codes: dict[str, int] = {}
+        self._values: list[str | None] = [None]
+        self._lock = threading.Lock()
+        for value in values:
+            self.encode(value)
+
+    def intern(self, value: str | None) -> str | None:
+        """
+        Get the shared copy of a string.
+
+        Args:
+            value: String to intern (None passes through)
+
+        Returns:
+            Equal string, shared by every caller that interned this value
+            (unless the table is full)
+        """
+        if value is None:
+            return None
+        canonical = self._canonical.get(value)
+        if canonical is not None:
+            return canonical
+        with self._lock:
+            if self.max_size is not None and len(self._canonical) >= self.max_size:
+                return self._canonical.get(value, value)
+            return self._canonical.setdefault(value, value)
+
+    def encode(self, value: str | None) -> int:
+        """
+        Get the integer code of a value, assigning one if it is new.
+
+        Args:
+            value: String to encode (None encodes as 0)
+
+        Returns:
+            Code for the value
+        """
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is not None:
+            return code
+        with self._lock:
+            code = self._codes.get(value)
+            if code is None:
+                canonical = self._canonical.setdefault(value, value)
+                code = len(self._values)
+                self._values.append(canonical)
+                self._codes[canonical] = code
+            return code
+
+    def lookup(self, value: str | None) -> int | None:
+        """
+        Get the code of a value without assigning one.
+
+        Args:
+            value: String to look up
+
+        Returns:
+            Code, or None if the value was never encoded
+        """
+        if value is None:
+            return 0
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> str | None:
+        """
+        Get the value for a code.
+
+        Args:
+            code: Code returned by encode()
+
+        Returns:
+            The encoded string (None for code 0)
+
+        Raises:
+            IndexError: If the code was never assigned
+        """
+        return self._values[code]
+
+    def intern_fields(self, fields: dict[str, Any]) -> dict[str, Any]:
+        """
+        Intern the categorical values of a job field dict in place.
+
+        Args:
+            fields: Job field values
+
+        Returns:
+            The same dict
+        """
+        for field in CATEGORICAL_FIELDS:
+            value = fields.get(field)
+            if value is not None:
+                fields[field] = self.intern(value)
+        return fields
+
+    def __len__(self) -> int:
+        """Number of interned values."""
+        return len(self._canonical)
+
+
+# Process-wide table shared by scraping and snapshot loading
+INTERN_TABLE = InternTable(max_size=config.INTERN_TABLE_MAX_SIZE)
@@ -0,0 +1,215 @@
+"""
+Incremental JSON reading helpers.
+
+Lets callers walk a large JSON document and consume one big nested array an
+element at a time, instead of decoding the whole document (and the array)
+into memory before doing anything with it. The document can be supplied in
+chunks, so only a small window of the text needs to be resident. Only the
+standard library JSON decoder is used, so there is no extra dependency.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import Generator, Iterable, Iterator, Sequence
+from typing import Any
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Marker for the streamed array's slot in the remainder document
+_OMITTED = object()
+
+# Consumed text is dropped from the buffer once this many characters pile up
+_TRIM_THRESHOLD = 1 << 16
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def iter_utf8_chunks(
+    data: bytes | memoryview, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Decode UTF-8 bytes into text chunks without copying the whole buffer.
+
+    Args:
+        data: UTF-8 encoded bytes (a memoryview slice avoids any copy)
+        chunk_size: Bytes decoded per chunk
+
+    Yields:
+        Decoded text chunks
+    """
+    view = memoryview(data)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, len(view), chunk_size):
+        yield decoder.decode(view[start : start + chunk_size])
+    yield decoder.decode(b"", final=True)
+
+
+class JsonArrayStream:
+    """
+    Stream the elements of an array nested inside a JSON document.
+
+    Iterating yields the elements of the array found at ``path`` (a list of
+    object keys) one at a time. Everything else in the document is decoded
+    normally and is available afterwards as ``remainder``, with the streamed
+    array's key left out. If no array exists at ``path``, nothing is yielded,
+    ``found`` stays False and ``remainder`` is the whole document.
+
+    The source may be a complete string or an iterable of text chunks. With
+    chunks, text already consumed is discarded as the array is streamed.
+
+    Once the array is reached, ``prefix`` holds the members of the object
+    containing it that come before it, so a caller that only needs those
+    can stop iterating after the first element.
+
+    Example:
+        stream = JsonArrayStream(text, ["props", "pageProps", "results"])
+        for item in stream:
+            handle(item)
+        metadata = stream.remainder
+    """
+
+    def __init__(self, source: str | Iterable[str], path: Sequence[str]) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            source: JSON document, whole or as text chunks
+            path: Object keys leading to the array to stream
+        """
+        self.path = list(path)
+        self.found = False
+        self.remainder: Any = None
+        self.prefix: dict[str, Any] = {}
+
+        if isinstance(source, str):
+            self._buf = source
+            self._chunks: Iterator[str] = iter(())
+            self._eof = True
+        else:
+            self._buf = ""
+            self._chunks = iter(source)
+            self._eof = False
+        # Trimming a fully-resident string would only add copying
+        self._trim = not self._eof
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yield the array's elements, filling ``remainder`` as a side effect."""
+        value, end = yield from self._read_value(self._skip_ws(0), 0)
+        end = self._skip_ws(end)
+        if end != len(self._buf):
+            raise ValueError(f"Extra data after JSON document at position {end}")
+        self.remainder = None if value is _OMITTED else value
+
+    def _grow(self) -> None:
+        """Read chunks until the buffer at least doubles (or input runs out)."""
+        pieces = [self._buf]
+        wanted = max(len(self._buf), 1)
+        added = 0
+        while added < wanted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            pieces.append(chunk)
+            added += len(chunk)
+        self._buf = "".join(pieces)
+
+    def _char(self, pos: int) -> str:
+        """Return the character at ``pos``, reading more input if needed."""
+        while pos >= len(self._buf) and not self._eof:
+            self._grow()
+        if pos >= len(self._buf):
+            raise ValueError("Unexpected end of JSON document")
+        return self._buf[pos]
+
+    def _skip_ws(self, pos: int) -> int:
+        """Return the index of the next non-whitespace character."""
+        while True:
+            match = _WHITESPACE.match(self._buf, pos)
+            pos = match.end() if match else pos
+            if pos < len(self._buf) or self._eof:
+                return pos
+            self._grow()
+
+    def _decode(self, pos: int) -> tuple[Any, int]:
+        """Decode one complete value at ``pos``, reading more input if needed."""
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._grow()
+                continue
+            # A value touching the end of the buffer (e.g. a number) may be cut short
+            if end < len(self._buf) or self._eof:
+                return value, end
+            self._grow()
+
+    def _read_value(self, pos: int, depth: int) -> Generator[Any, None, tuple[Any, int]]:
+        """Read the value at ``pos``, streaming it if it is the target array."""
+        char = self._char(pos)
+        if depth == len(self.path) and char == "[" and not self.found:
+            self.found = True
+            end = yield from self._stream_array(pos)
+            return _OMITTED, end
+        if depth < len(self.path) and char == "{":
+            return (yield from self._read_object(pos, depth))
+        return self._decode(pos)
+
+    def _read_object(self, pos: int, depth: int) -> Generator[Any, None, tuple[Any, int]]:
+        """Read an object on the path, descending into the member named next."""
+        obj: dict[str, Any] = {}
+        pos = self._skip_ws(pos + 1)
+        if self._char(pos) == "}":
+            return obj, pos + 1
+
+        while True:
+            key, pos = self._decode(pos)
+            pos = self._skip_ws(pos)
+            if self._char(pos) != ":":
+                raise ValueError(f"Expecting ':' delimiter at position {pos}")
+            pos = self._skip_ws(pos + 1)
+
+            if key == self.path[depth] and not self.found:
+                if depth == len(self.path) - 1:
+                    self.prefix = dict(obj)
+                value, pos = yield from self._read_value(pos, depth + 1)
+            else:
+                value, pos = self._decode(pos)
+            if value is not _OMITTED:
+                obj[key] = value
+
+            pos = self._skip_ws(pos)
+            char = self._char(pos)
+            if char == ",":
+                pos = self._skip_ws(pos + 1)
+            elif char == "}":
+                return obj, pos + 1
+            else:
+                raise ValueError(f"Expecting ',' or '}}' at position {pos}")
+
+    def _stream_array(self, pos: int) -> Generator[Any, None, int]:
+        """Yield array elements one by one and return the position after it."""
+        pos = self._skip_ws(pos + 1)
+        if self._char(pos) == "]":
+            return pos + 1
+
+        while True:
+            value, pos = self._decode(pos)
+            yield value
+
+            if self._trim and pos > _TRIM_THRESHOLD:
+                self._buf = self._buf[pos:]
+                pos = 0
+
+            pos = self._skip_ws(pos)
+            char = self._char(pos)
+            if char == ",":
+                pos = self._skip_ws(pos + 1)
+            elif char == "]":
+                return pos + 1
+            else:
+                raise ValueError(f"Expecting ',' or ']' at position {pos}")
@@ -8,10 +8,18 @@ These models represent the fundamental business entities and are designed to be:
 - Type-safe
 """
 
+import hashlib
+import operator
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from sjs_jobwatch.core.fields import tracked_field_specs
+from sjs_jobwatch.core.interning import CATEGORICAL_FIELDS, INTERN_TABLE
 
 
 class Region(str, Enum):
@@ -61,6 +69,12 @@ class JobCategory(str, Enum):
     OTHER = "Other"
 
 
+# Interned strings for these are the enum values themselves, so filters
+# comparing a job's field to an enum value hit the identity fast path
+for _value in [*(r.value for r in Region), *(c.value for c in JobCategory)]:
+    INTERN_TABLE.intern(_value)
+
+
 class Severity(str, Enum):
     """Alert severity levels."""
 
@@ -122,6 +136,12 @@ class Job(BaseModel):
     # URL
     url: str | None = Field(None, description="Direct link to job posting")
 
+    @field_validator(*CATEGORICAL_FIELDS)
+    @classmethod
+    def intern_categorical(cls, v: str | None) -> str | None:
+        """Share one copy of each repeated categorical value across all jobs."""
+        return INTERN_TABLE.intern(v)
+
     @field_validator("pay_max")
     @classmethod
     def pay_max_greater_than_min(cls, v: float | None, info: dict) -> float | None:
@@ -131,6 +151,41 @@ class Job(BaseModel):
             raise ValueError(f"pay_max ({v}) must be >= pay_min ({pay_min})")
         return v
 
+    @cached_property
+    def fingerprint(self) -> int:
+        """
+        Hash of the tracked fields, computed once per job.
+        
+        Jobs with equal tracked values always share a fingerprint, so the
+        diff engine only compares fields when fingerprints differ; equal
+        fingerprints are confirmed by comparing the tracked values, as
+        different values can collide. Values are hashed as stored;
+        differences the diff ignores (such as surrounding whitespace) give
+        different fingerprints and are settled by the full field comparison.
+        Uses Python's 64-bit hash, so it is only meaningful within one
+        process: pickling a job leaves it out.
+        """
+        return hash(self.tracked_values())
+
+    def __getstate__(self) -> dict[Any, Any]:
+        """Pickle the job without its cached fingerprint (string hashes differ per process)."""
+        state = super().__getstate__()
+        if "fingerprint" in state["__dict__"]:
+            fields = {k: v for k, v in state["__dict__"].items() if k != "fingerprint"}
+            state = {**state, "__dict__": fields}
+        return state
+
+    def tracked_values(self) -> tuple[Any, ...]:
+        """Values of the tracked fields (see tracked_fields()), in the same order."""
+        return _values_getter()(self.__dict__)
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> "Job":
+        """Copy the job, dropping the cached fingerprint if fields are updated."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.__dict__.pop("fingerprint", None)
+        return copied
+
     def matches_region(self, region: Region | None) -> bool:
         """Check if job matches a region filter."""
         if region is None or region == Region.ALL:
@@ -144,6 +199,72 @@ class Job(BaseModel):
         return self.category == category.value
 
 
+def tracked_fields() -> list[str]:
+    """
+    Job fields compared when diffing snapshots, in diff order (see fields.py).
+    
+    Raises:
+        ValueError: If the deployment's field specs are invalid
+    """
+    return [spec.name for spec in tracked_field_specs()]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve TRACKED_FIELDS when first used, not at import (see tracked_field_specs())."""
+    if name == "TRACKED_FIELDS":
+        return tracked_fields()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# (specs, getter) last built by _values_getter()
+_getter_cache: list[Any] = [None, None]
+
+
+def _values_getter() -> Callable[[dict[str, Any]], tuple[Any, ...]]:
+    """
+    Function fetching the tracked fields from a job's __dict__.
+    
+    Rebuilt only when the tracked field specs are reloaded.
+    
+    Raises:
+        ValueError: If a tracked field isn't a Job field other than id
+    """
+    specs = tracked_field_specs()
+    if _getter_cache[0] is not specs:
+        _getter_cache[:] = specs, _build_values_getter([spec.name for spec in specs])
+    return _getter_cache[1]
+
+
+def _build_values_getter(fields: list[str]) -> Callable[[dict[str, Any]], tuple[Any, ...]]:
+    """Build a function fetching the given fields from a job's __dict__."""
+    untracked = [field for field in fields if field not in Job.model_fields or field == "id"]
+    if untracked:
+        raise ValueError(f"Tracked fields must be Job fields other than id: {', '.join(untracked)}")
+    if len(fields) == 1:
+        # itemgetter() of one key returns the bare value, not a 1-tuple
+        field = fields[0]
+        return lambda values: (values[field],)
+    # Fetches every tracked field in one C-level call
+    return operator.itemgetter(*fields)
+
+
+class SnapshotHeader(BaseModel):
+    """
+    A snapshot's metadata, without its jobs.
+    
+    Cheap to read and pass around when only the timestamp, size or digest
+    of a snapshot is needed.
+    """
+
+    model_config = {"frozen": True}
+
+    timestamp: datetime = Field(..., description="When the snapshot was taken")
+    total_count: int = Field(..., description="Total number of jobs")
+    scrape_duration_seconds: float | None = Field(None, description="How long the scrape took")
+    source_url: str = Field(..., description="URL that was scraped")
+    content_digest: str = Field(..., description="Stable digest of the jobs")
+
+
 class Snapshot(BaseModel):
     """
     A point-in-time snapshot of all jobs scraped from the SJS board.
@@ -160,6 +281,9 @@ class Snapshot(BaseModel):
         None, ge=0, description="How long the scrape took"
     )
     source_url: str = Field(..., description="URL that was scraped")
+    content_digest: str | None = Field(
+        None, description="Stable digest of the jobs (filled in automatically)"
+    )
 
     @field_validator("total_count")
     @classmethod
@@ -170,6 +294,65 @@ class Snapshot(BaseModel):
             raise ValueError(f"total_count ({v}) != actual job count ({len(jobs)})")
         return v
 
+    @model_validator(mode="after")
+    def fill_content_digest(self) -> "Snapshot":
+        """Compute the content digest for snapshots that don't carry one yet."""
+        if self.content_digest is None:
+            # Frozen model - bypass the immutability guard for this one-time fill
+            object.__setattr__(self, "content_digest", compute_content_digest(self.jobs))
+        return self
+
+    def header(self) -> SnapshotHeader:
+        """Get the snapshot's metadata without its jobs."""
+        return SnapshotHeader(
+            timestamp=self.timestamp,
+            total_count=self.total_count,
+            scrape_duration_seconds=self.scrape_duration_seconds,
+            source_url=self.source_url,
+            content_digest=self.content_digest,
+        )
+
+
+def compute_content_digest(jobs: Iterable[Job]) -> str:
+    """
+    Compute a stable digest of a collection of jobs.
+    
+    The digest covers every field of every job and ignores ordering, so two
+    scrapes of an unchanged board produce the same value.
+    
+    Args:
+        jobs: Jobs to digest
+        
+    Returns:
+        Hex SHA-256 digest
+    """
+    hasher = hashlib.sha256()
+    for job in sorted(jobs, key=lambda job: job.id):
+        hasher.update(job.model_dump_json().encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 datetime as written by pydantic's JSON output.
+    
+    Python 3.10's datetime.fromisoformat() rejects the "Z" suffix pydantic
+    writes for UTC datetimes, so it is rewritten as "+00:00" first.
+    
+    Args:
+        value: ISO 8601 string
+        
+    Returns:
+        Parsed datetime
+        
+    Raises:
+        ValueError: If the string isn't an ISO 8601 datetime
+    """
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
 
 class FieldChange(BaseModel):
     """Represents a change to a specific field in a job."""
@@ -179,6 +362,9 @@ class FieldChange(BaseModel):
     field: str = Field(..., description="Name of the field that changed")
     old_value: str | None = Field(None, description="Previous value")
     new_value: str | None = Field(None, description="New value")
+    summary: str | None = Field(
+        None, description="Summary of the edit, for fields shown as snippets"
+    )
 
 
 class JobChange(BaseModel):
@@ -189,6 +375,7 @@ class JobChange(BaseModel):
     - New job (before is None)
     - Removed job (after is None)
     - Modified job (both set, with field changes)
+    - Reposted job (both set, repost_of names the removed job it replaces)
     """
 
     model_config = {"frozen": True}
@@ -199,10 +386,15 @@ class JobChange(BaseModel):
     changes: list[FieldChange] = Field(
         default_factory=list, description="Specific field changes"
     )
+    repost_of: str | None = Field(
+        None, description="ID of the removed job this one reposts, if any"
+    )
 
     @property
     def change_type(self) -> str:
         """Get human-readable change type."""
+        if self.repost_of is not None:
+            return "reposted"
         if self.before is None:
             return "added"
         if self.after is None:
@@ -219,23 +411,65 @@ class JobChange(BaseModel):
         return "Unknown"
 
 
+# Kinds of change in a diff, in the order they are listed
+CHANGE_TYPES = ("added", "removed", "modified", "reposted")
+
+
 class DiffResult(BaseModel):
     """Complete diff between two snapshots."""
 
     model_config = {"frozen": True}
 
-    previous_snapshot: Snapshot = Field(..., description="Earlier snapshot")
-    current_snapshot: Snapshot = Field(..., description="Later snapshot")
+    previous_snapshot: Snapshot | SnapshotHeader = Field(
+        ..., description="Earlier snapshot (or its header)"
+    )
+    current_snapshot: Snapshot | SnapshotHeader = Field(
+        ..., description="Later snapshot (or its header)"
+    )
     added: list[JobChange] = Field(default_factory=list, description="Newly added jobs")
     removed: list[JobChange] = Field(default_factory=list, description="Removed jobs")
     modified: list[JobChange] = Field(default_factory=list, description="Modified jobs")
+    reposted: list[JobChange] = Field(
+        default_factory=list, description="Removed jobs re-listed under a new ID"
+    )
 
     @property
     def total_changes(self) -> int:
         """Total number of changes across all categories."""
-        return len(self.added) + len(self.removed) + len(self.modified)
+        return len(self.added) + len(self.removed) + len(self.modified) + len(self.reposted)
 
     @property
     def has_changes(self) -> bool:
         """Check if there are any changes."""
         return self.total_changes > 0
+
+    def count(self, change_type: str) -> int:
+        """
+        Count the changes of one type.
+        
+        Args:
+            change_type: "added", "removed", "modified" or "reposted"
+            
+        Returns:
+            Number of changes of that type
+        """
+        return len(self._changes(change_type))
+
+    def iter_changes(self, change_type: str | None = None) -> Iterator[JobChange]:
+        """
+        Iterate over changes, in CHANGE_TYPES order.
+        
+        Args:
+            change_type: Only yield changes of this type (None for all)
+            
+        Returns:
+            Iterator of job changes
+        """
+        for kind in CHANGE_TYPES if change_type is None else (change_type,):
+            yield from self._changes(kind)
+
+    def _changes(self, change_type: str) -> list[JobChange]:
+        """Get the list holding one type of change."""
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f"Unknown change type: {change_type}")
+        return getattr(self, change_type)
@@ -0,0 +1,207 @@
+"""
+Detection of jobs re-listed under a new ID.
+
+Employers often close a listing and post the same role again with a new job
+ID. A plain diff reports that as one removed and one added job. This module
+pairs removed jobs with likely reposts among the added ones.
+
+Each job is reduced to word shingles of its title, employer, area and
+summary, and then to a MinHash signature. Locality-sensitive hashing over
+signature bands finds candidate pairs without comparing every removed job
+with every added one. Candidates are confirmed with the exact similarity of
+their shingles, field by field.
+
+Signatures use one-permutation hashing: each shingle is hashed once and
+lands in one of NUM_PERMUTATIONS bins, keeping the minimum per bin, and
+empty bins borrow from the next full one. That costs one hash per shingle
+instead of one per shingle and permutation.
+"""
+
+import re
+import zlib
+from collections import defaultdict, deque
+from collections.abc import Sequence
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.models import Job
+
+# Fields that identify a role, compared when looking for reposts
+REPOST_FIELDS = ("title", "employer", "area", "summary")
+
+# MinHash signature length, split into LSH bands of BAND_ROWS values. Pairs
+# with similarity s become candidates with probability 1 - (1 - s**4)**8:
+# about 98% at 0.8 and 10% at 0.4.
+NUM_PERMUTATIONS = 32
+BAND_ROWS = 4
+
+# LSH buckets holding more added jobs than this are skipped. They come from
+# boilerplate shared by many listings and would make matching quadratic;
+# exact duplicates are paired before LSH, so they don't rely on buckets.
+MAX_BUCKET_SIZE = 64
+
+_WORD = re.compile(r"\w+")
+
+
+def field_shingles(job: Job) -> dict[str, set[str]]:
+    """
+    Break a job's identifying fields into word shingles.
+
+    Args:
+        job: Job to shingle
+
+    Returns:
+        Words and adjacent word pairs of each non-empty field, by field
+    """
+    shingles = {}
+    for field in REPOST_FIELDS:
+        words = _WORD.findall((getattr(job, field) or "").lower())
+        if words:
+            shingles[field] = {*words, *(f"{a} {b}" for a, b in zip(words, words[1:]))}
+    return shingles
+
+
+def minhash(shingles: dict[str, set[str]]) -> tuple[int, ...]:
+    """
+    Compute the MinHash signature of a job's shingles.
+
+    Args:
+        shingles: Output of field_shingles()
+
+    Returns:
+        Signature of NUM_PERMUTATIONS values (empty if there are no shingles)
+    """
+    bins: list[int | None] = [None] * NUM_PERMUTATIONS
+    for field, values in shingles.items():
+        for shingle in values:
+            value = zlib.crc32(f"{field}:{shingle}".encode())
+            index, value = value % NUM_PERMUTATIONS, value // NUM_PERMUTATIONS
+            if bins[index] is None or value < bins[index]:
+                bins[index] = value
+    filled = [index for index, value in enumerate(bins) if value is not None]
+    if not filled:
+        return ()
+
+    # Densify: an empty bin takes the next full bin's value, offset by the
+    # distance so that different borrowing patterns don't collide
+    signature = list(bins)
+    for index, value in enumerate(bins):
+        if value is None:
+            distance = next(
+                (full - index for full in filled if full > index),
+                filled[0] + NUM_PERMUTATIONS - index,
+            )
+            signature[index] = (distance << 32) + bins[(index + distance) % NUM_PERMUTATIONS]
+    return tuple(signature)
+
+
+def similarity(first: dict[str, set[str]], second: dict[str, set[str]]) -> float:
+    """
+    Score how alike two jobs' shingles are.
+
+    Averages the Jaccard similarity of each field that is set on either
+    job, so a long summary can't outweigh a different title.
+
+    Args:
+        first: Shingles of one job
+        second: Shingles of the other
+
+    Returns:
+        Similarity from 0 (nothing shared) to 1 (identical)
+    """
+    fields = first.keys() | second.keys()
+    if not fields:
+        return 0.0
+    total = 0.0
+    for field in fields:
+        a, b = first.get(field, set()), second.get(field, set())
+        total += len(a & b) / len(a | b)
+    return total / len(fields)
+
+
+def find_reposts(
+    removed: Sequence[Job],
+    added: Sequence[Job],
+    threshold: float = config.REPOST_SIMILARITY,
+) -> list[tuple[Job, Job]]:
+    """
+    Pair removed jobs with the added jobs that repost them.
+
+    Runs in roughly linear time: exact duplicates are paired directly, then
+    the remaining added jobs are indexed by signature band and each removed
+    job is only compared with the added jobs it shares a band with. Every
+    job is used in at most one pair, best matches first.
+
+    Args:
+        removed: Jobs that disappeared
+        added: Jobs that appeared
+        threshold: Minimum similarity for a pair (see similarity())
+
+    Returns:
+        (removed job, added job) pairs, in the order of the added jobs
+    """
+    if not removed or not added:
+        return []
+
+    added_shingles = [field_shingles(job) for job in added]
+    twins: dict[frozenset, deque[int]] = defaultdict(deque)
+    for index, shingles in enumerate(added_shingles):
+        if shingles:
+            twins[_shingle_key(shingles)].append(index)
+
+    pairs = []
+    used_removed: set[int] = set()
+    used_added: set[int] = set()
+    unmatched = []
+    for removed_index, job in enumerate(removed):
+        shingles = field_shingles(job)
+        if not shingles:
+            continue
+        # Pair with the first unused added job with identical shingles
+        same = twins.get(_shingle_key(shingles))
+        if same:
+            added_index = same.popleft()
+            used_removed.add(removed_index)
+            used_added.add(added_index)
+            pairs.append((added_index, removed_index))
+        else:
+            unmatched.append((removed_index, shingles, minhash(shingles)))
+
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    if unmatched:
+        for index, shingles in enumerate(added_shingles):
+            if index not in used_added and shingles:
+                for key in _band_keys(minhash(shingles)):
+                    buckets[key].append(index)
+
+    scored = []
+    for removed_index, shingles, signature in unmatched:
+        candidates = set()
+        for key in _band_keys(signature):
+            bucket = buckets.get(key, ())
+            if len(bucket) <= MAX_BUCKET_SIZE:
+                candidates.update(bucket)
+        for added_index in candidates:
+            score = similarity(shingles, added_shingles[added_index])
+            if score >= threshold:
+                scored.append((-score, removed_index, added_index))
+
+    for _, removed_index, added_index in sorted(scored):
+        if removed_index not in used_removed and added_index not in used_added:
+            used_removed.add(removed_index)
+            used_added.add(added_index)
+            pairs.append((added_index, removed_index))
+
+    return [(removed[r], added[a]) for a, r in sorted(pairs)]
+
+
+def _shingle_key(shingles: dict[str, set[str]]) -> frozenset:
+    """Hashable form of a job's shingles, equal only for identical shingles."""
+    return frozenset((field, frozenset(values)) for field, values in shingles.items())
+
+
+def _band_keys(signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+    """Split a signature into LSH band keys."""
+    return [
+        (start, signature[start : start + BAND_ROWS])
+        for start in range(0, len(signature), BAND_ROWS)
+    ]
@@ -7,12 +7,13 @@ mechanism.
 """
 
 import logging
+from itertools import islice
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
 
 from sjs_jobwatch.core import config
-from sjs_jobwatch.core.models import DiffResult
+from sjs_jobwatch.core.diff import ChangeSet
 from sjs_jobwatch.delivery import EmailProvider
 
 logger = logging.getLogger(__name__)
@@ -34,7 +35,7 @@ class EmailRenderer:
             autoescape=True,
         )
 
-    def render(self, diff: DiffResult, max_jobs: int = 50) -> tuple[str, str, str]:
+    def render(self, diff: ChangeSet, max_jobs: int = 50) -> tuple[str, str, str]:
         """
         Render email subject, HTML body, and text body.
 
@@ -50,51 +51,57 @@ class EmailRenderer:
         text = self._render_text(diff, max_jobs)
         return subject, html, text
 
-    def _render_subject(self, diff: DiffResult) -> str:
+    def _render_subject(self, diff: ChangeSet) -> str:
         """Generate concise subject line summarizing changes."""
         if diff.total_changes == 0:
             return "SJS JobWatch: No Changes"
 
         parts = []
-        if diff.added:
-            parts.append(f"{len(diff.added)} new")
-        if diff.removed:
-            parts.append(f"{len(diff.removed)} removed")
-        if diff.modified:
-            parts.append(f"{len(diff.modified)} modified")
+        if diff.count("added"):
+            parts.append(f"{diff.count('added')} new")
+        if diff.count("removed"):
+            parts.append(f"{diff.count('removed')} removed")
+        if diff.count("modified"):
+            parts.append(f"{diff.count('modified')} modified")
+        if diff.count("reposted"):
+            parts.append(f"{diff.count('reposted')} reposted")
 
         return f"SJS JobWatch: {', '.join(parts)}"
 
-    def _render_html(self, diff: DiffResult, max_jobs: int) -> str:
+    def _render_html(self, diff: ChangeSet, max_jobs: int) -> str:
         """Render HTML email body from template."""
         template = self.env.get_template("alert_email.html")
         return template.render(
             period=self._get_period_description(diff),
-            added_count=len(diff.added),
-            removed_count=len(diff.removed),
-            modified_count=len(diff.modified),
+            added_count=diff.count("added"),
+            removed_count=diff.count("removed"),
+            modified_count=diff.count("modified"),
+            reposted_count=diff.count("reposted"),
             total_changes=diff.total_changes,
-            added=diff.added[:max_jobs],
-            removed=diff.removed[:max_jobs],
-            modified=diff.modified[:max_jobs],
+            added=list(islice(diff.iter_changes("added"), max_jobs)),
+            removed=list(islice(diff.iter_changes("removed"), max_jobs)),
+            modified=list(islice(diff.iter_changes("modified"), max_jobs)),
+            reposted=list(islice(diff.iter_changes("reposted"), max_jobs)),
         )
 
-    def _render_text(self, diff: DiffResult, max_jobs: int) -> str:
+    def _render_text(self, diff: ChangeSet, max_jobs: int) -> str:
         """Render plain text email body from template."""
         template = self.env.get_template("alert_email.txt")
         return template.render(
             period=self._get_period_description(diff),
-            added_count=len(diff.added),
-            removed_count=len(diff.removed),
-            modified_count=len(diff.modified),
+            added_count=diff.count("added"),
+            removed_count=diff.count("removed"),
+            modified_count=diff.count("modified"),
+            reposted_count=diff.count("reposted"),
             total_changes=diff.total_changes,
-            added=diff.added[:max_jobs],
-            removed=diff.removed[:max_jobs],
-            modified=diff.modified[:max_jobs],
+            added=list(islice(diff.iter_changes("added"), max_jobs)),
+            removed=list(islice(diff.iter_changes("removed"), max_jobs)),
+            modified=list(islice(diff.iter_changes("modified"), max_jobs)),
+            reposted=list(islice(diff.iter_changes("reposted"), max_jobs)),
         )
 
     @staticmethod
-    def _get_period_description(diff: DiffResult) -> str:
+    def _get_period_description(diff: ChangeSet) -> str:
         """Format time range covered by this diff."""
         prev_time = diff.previous_snapshot.timestamp
         curr_time = diff.current_snapshot.timestamp
@@ -131,7 +138,7 @@ class EmailSender:
     def send_alert(
         self,
         to_email: str,
-        diff: DiffResult,
+        diff: ChangeSet,
         max_jobs: int = config.MAX_JOBS_IN_EMAIL,
     ) -> bool:
         """
@@ -0,0 +1,271 @@
+"""
+Job detail-page fetching.
+
+Search results often leave ``description`` empty. This module fills it in
+from each job's detail page, but only for jobs that are new or whose summary
+fields changed since the previous snapshot. Everything else is served from a
+local description cache, so a warm run makes only a handful of requests.
+"""
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.models import Job, Snapshot, compute_content_digest
+from sjs_jobwatch.ingestion.nextdata import load_next_data
+from sjs_jobwatch.ingestion.scraper import ScrapeError, SJSScraper
+
+logger = logging.getLogger(__name__)
+
+# Search-result fields that decide whether a job's detail page needs refetching
+SUMMARY_FIELDS = {
+    "title",
+    "employer",
+    "category",
+    "classification",
+    "sub_classification",
+    "job_type",
+    "region",
+    "area",
+    "summary",
+    "pay_min",
+    "pay_max",
+    "posted_date",
+    "start_date",
+    "end_date",
+}
+
+# Where the description may live in a detail page's pageProps
+DESCRIPTION_PATHS = [
+    ["job", "description"],
+    ["jobDetails", "description"],
+    ["vacancy", "description"],
+    ["description"],
+]
+
+
+def summary_hash(job: Job) -> str:
+    """
+    Hash the search-result fields of a job.
+
+    Args:
+        job: Job to hash
+
+    Returns:
+        Hex digest that changes whenever a summary field changes
+    """
+    payload = job.model_dump_json(include=SUMMARY_FIELDS)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class DescriptionCache:
+    """
+    Local cache of job descriptions keyed by job ID and summary hash.
+
+    Stored as a single JSON file. An entry only counts as a hit while the
+    job's summary hash still matches the one it was fetched for.
+    """
+
+    def __init__(self, filepath: Path | None = None) -> None:
+        """
+        Initialize the description cache.
+
+        Args:
+            filepath: Cache file (defaults to config.DESCRIPTION_CACHE_FILE)
+        """
+        self.filepath = filepath or config.DESCRIPTION_CACHE_FILE
+        self._entries: dict[str, dict[str, str]] = self._load()
+
+    def get(self, job_id: str, content_hash: str) -> str | None:
+        """
+        Look up a cached description.
+
+        Args:
+            job_id: Job ID
+            content_hash: Current summary hash of the job
+
+        Returns:
+            Description, or None on a miss or a stale entry
+        """
+        entry = self._entries.get(job_id)
+        if entry and entry.get("hash") == content_hash:
+            return entry.get("description")
+        return None
+
+    def put(self, job_id: str, content_hash: str, description: str) -> None:
+        """
+        Store a description.
+
+        Args:
+            job_id: Job ID
+            content_hash: Summary hash the description was fetched for
+            description: Description text
+        """
+        self._entries[job_id] = {"hash": content_hash, "description": description}
+
+    def retain(self, job_ids: set[str]) -> int:
+        """
+        Drop entries for jobs no longer listed.
+
+        Args:
+            job_ids: IDs to keep
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [job_id for job_id in self._entries if job_id not in job_ids]
+        for job_id in stale:
+            del self._entries[job_id]
+        return len(stale)
+
+    def save(self) -> None:
+        """Write the cache to disk atomically."""
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.filepath.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+        temp_path.replace(self.filepath)
+
+    def __len__(self) -> int:
+        """Number of cached descriptions."""
+        return len(self._entries)
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        """Load the cache file, starting empty if it is missing or corrupt."""
+        if not self.filepath.exists():
+            return {}
+        try:
+            return json.loads(self.filepath.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable description cache {self.filepath}: {e}")
+            return {}
+
+
+class DetailFetcher:
+    """
+    Fills in job descriptions from detail pages.
+
+    Detail pages are fetched concurrently through a scraper, so they share its
+    session and per-host rate limiter with search requests.
+    """
+
+    def __init__(
+        self,
+        scraper: SJSScraper | None = None,
+        cache: DescriptionCache | None = None,
+        max_workers: int = config.SCRAPE_MAX_WORKERS,
+    ) -> None:
+        """
+        Initialize the detail fetcher.
+
+        Args:
+            scraper: Scraper to fetch through (defaults to a new one)
+            cache: Description cache (defaults to config.DESCRIPTION_CACHE_FILE)
+            max_workers: Maximum concurrent detail fetches
+        """
+        self.scraper = scraper or SJSScraper()
+        self.cache = cache if cache is not None else DescriptionCache()
+        self.max_workers = max(1, max_workers)
+
+    def enrich(self, snapshot: Snapshot, previous: Snapshot | None = None) -> Snapshot:
+        """
+        Return a copy of a snapshot with job descriptions filled in.
+
+        Jobs that already have a description are left alone. Others are filled
+        from the cache, or from the previous snapshot if their summary is
+        unchanged. Detail pages are only fetched for the remaining new or
+        changed jobs.
+
+        Args:
+            snapshot: Freshly scraped snapshot
+            previous: Previous snapshot to compare summaries against
+
+        Returns:
+            Snapshot with descriptions (the same object if nothing was filled)
+        """
+        previous_jobs = {job.id: job for job in previous.jobs} if previous else {}
+
+        descriptions: dict[str, str] = {}
+        to_fetch: dict[str, str] = {}
+        for job in snapshot.jobs:
+            if job.description:
+                continue
+
+            content_hash = summary_hash(job)
+            cached = self.cache.get(job.id, content_hash)
+            if cached is not None:
+                descriptions[job.id] = cached
+                continue
+
+            old_job = previous_jobs.get(job.id)
+            if old_job and old_job.description and summary_hash(old_job) == content_hash:
+                descriptions[job.id] = old_job.description
+                self.cache.put(job.id, content_hash, old_job.description)
+                continue
+
+            to_fetch[job.id] = content_hash
+
+        logger.info(
+            f"Descriptions: {len(descriptions)} reused, {len(to_fetch)} detail pages to fetch"
+        )
+
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                fetched = executor.map(self._fetch_description, to_fetch)
+                for job_id, description in zip(to_fetch, fetched):
+                    if description is not None:
+                        descriptions[job_id] = description
+                        self.cache.put(job_id, to_fetch[job_id], description)
+
+        self.cache.retain({job.id for job in snapshot.jobs})
+        self.cache.save()
+
+        if not descriptions:
+            return snapshot
+
+        jobs = [
+            job.model_copy(update={"description": descriptions[job.id]})
+            if job.id in descriptions
+            else job
+            for job in snapshot.jobs
+        ]
+        # Only the filled-in jobs are new and the rest are already validated,
+        # so skip revalidation; the content digest must cover the descriptions
+        return Snapshot.model_construct(
+            timestamp=snapshot.timestamp,
+            jobs=jobs,
+            total_count=len(jobs),
+            scrape_duration_seconds=snapshot.scrape_duration_seconds,
+            source_url=snapshot.source_url,
+            content_digest=compute_content_digest(jobs),
+        )
+
+    def _fetch_description(self, job_id: str) -> str | None:
+        """Fetch one detail page and extract its description (None on failure)."""
+        url = config.get_job_url(job_id)
+        try:
+            content = self.scraper.fetch(url, use_cache=False)
+            page_props = load_next_data(content, self.scraper.extractor).get("props", {})
+            return _find_description(page_props.get("pageProps", {}))
+        except (ScrapeError, ValueError) as e:
+            logger.warning(f"Failed to fetch details for job {job_id}: {e}")
+            return None
+
+
+def _find_description(page_props: dict[str, Any]) -> str | None:
+    """Find the description text in a detail page's pageProps."""
+    for path in DESCRIPTION_PATHS:
+        current: Any = page_props
+        try:
+            for key in path:
+                current = current[key]
+        except (KeyError, TypeError):
+            continue
+        if isinstance(current, str) and current.strip():
+            return current
+
+    logger.debug(f"No description found, available keys: {list(page_props.keys())}")
+    return None
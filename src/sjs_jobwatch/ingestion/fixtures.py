@@ -0,0 +1,298 @@
+"""
+Record and replay SJS responses for offline benchmarks and load tests.
+
+Recording wraps a scraper's session so a normal scrape saves every response
+(status, headers and body) to a fixture directory. Replaying serves that
+directory from a local HTTP server, optionally with added latency and
+injected 429/503 errors. Point the scraper at the server with a direct URL,
+or set the ``SJS_BASE_URL`` environment variable to the server's search URL.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import urlsplit
+
+import requests
+
+from sjs_jobwatch.core import config
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the original transfer rather than the (decoded) body
+_TRANSFER_HEADERS = {"connection", "content-encoding", "content-length", "transfer-encoding"}
+
+
+def _request_path(url: str) -> str:
+    """Host-independent key of a URL (path plus query string)."""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+class FixtureStore:
+    """
+    Directory of recorded responses, one entry per request path.
+
+    Entries are keyed by path and query string only, so responses recorded
+    from the live site replay unchanged from any host.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        """
+        Initialize the fixture store.
+
+        Args:
+            base_dir: Fixture directory (defaults to config.FIXTURE_DIR)
+        """
+        self.base_dir = base_dir or config.FIXTURE_DIR
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def save(self, url: str, status: int, headers: Mapping[str, str], body: bytes) -> Path:
+        """
+        Record a response.
+
+        Args:
+            url: Requested URL
+            status: HTTP status code
+            headers: Response headers
+            body: Response body (already decoded)
+
+        Returns:
+            Path of the saved body
+        """
+        path = _request_path(url)
+        key = self._key(path)
+        meta = {
+            "url": url,
+            "path": path,
+            "status": status,
+            "headers": {
+                name: value
+                for name, value in headers.items()
+                if name.lower() not in _TRANSFER_HEADERS
+            },
+        }
+        body_path = self.base_dir / f"{key}.body"
+        body_path.write_bytes(body)
+        (self.base_dir / f"{key}.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return body_path
+
+    def load(self, path: str) -> tuple[int, dict[str, str], bytes] | None:
+        """
+        Look up a recorded response.
+
+        Args:
+            path: Request path including query string (or a full URL)
+
+        Returns:
+            (status, headers, body) or None if nothing was recorded
+        """
+        key = self._key(_request_path(path))
+        try:
+            meta = json.loads((self.base_dir / f"{key}.json").read_text(encoding="utf-8"))
+            body = (self.base_dir / f"{key}.body").read_bytes()
+        except (OSError, json.JSONDecodeError):
+            return None
+        return meta["status"], meta["headers"], body
+
+    def paths(self) -> Iterator[str]:
+        """Yield the request paths of all recorded responses."""
+        for meta_path in sorted(self.base_dir.glob("*.json")):
+            try:
+                yield json.loads(meta_path.read_text(encoding="utf-8"))["path"]
+            except (OSError, json.JSONDecodeError, KeyError):
+                logger.warning(f"Skipping unreadable fixture {meta_path.name}")
+
+    def __len__(self) -> int:
+        """Number of recorded responses."""
+        return sum(1 for _ in self.base_dir.glob("*.json"))
+
+    def _key(self, path: str) -> str:
+        """Filesystem-safe key for a request path."""
+        return hashlib.sha256(path.encode("utf-8")).hexdigest()[:32]
+
+
+class RecordingSession:
+    """
+    Wraps a requests session and records every response it receives.
+
+    Assign it to ``SJSScraper.session`` to capture a real scrape:
+
+        scraper.session = RecordingSession(scraper.session, FixtureStore(path))
+    """
+
+    def __init__(self, session: requests.Session, store: FixtureStore) -> None:
+        """
+        Initialize the recording session.
+
+        Args:
+            session: Session that performs the real requests
+            store: Where responses are recorded
+        """
+        self.session = session
+        self.store = store
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Perform a GET and record its response (304s are not recorded)."""
+        response = self.session.get(url, **kwargs)
+        if response.status_code != 304:
+            self.store.save(url, response.status_code, response.headers, response.content)
+            logger.debug(f"Recorded {url} ({response.status_code})")
+        return response
+
+
+class FixtureServer:
+    """
+    Local HTTP server replaying a fixture directory.
+
+    Serves recorded responses by path, answers conditional requests with 304
+    when the recorded ETag matches, and can add latency and random error
+    responses to mimic a slow or overloaded site. Unknown paths get a 404.
+
+    Example:
+        with FixtureServer(store, latency=0.05, error_rate=0.1) as server:
+            scraper.scrape(url=server.url_for("/jobs/search/"))
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (429, 503),
+        retry_after: int = 1,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initialize the server (call start() or use it as a context manager).
+
+        Args:
+            store: Recorded responses to serve
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Seconds to wait before answering each request
+            error_rate: Fraction of requests answered with an injected error
+            error_statuses: Status codes to choose injected errors from
+            retry_after: Retry-After seconds sent with injected errors
+            seed: Seed for the error-injection RNG
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        if error_rate and not error_statuses:
+            raise ValueError("error_statuses must not be empty when error_rate is set")
+
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, path: str) -> str:
+        """
+        Build a server URL for a recorded path.
+
+        Args:
+            path: Request path (e.g. "/jobs/search/")
+
+        Returns:
+            Absolute URL on this server
+        """
+        return f"{self.base_url}{path}"
+
+    def start(self) -> "FixtureServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Serving {len(self.store)} fixtures at {self.base_url}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stop the server and release its socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _next_error(self) -> int | None:
+        """Count a request and decide whether to inject an error for it."""
+        with self._lock:
+            self.request_count += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.error_count += 1
+                return self._random.choice(self.error_statuses)
+        return None
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        """Build the request handler class bound to this server."""
+        server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if server.latency > 0:
+                    time.sleep(server.latency)
+
+                error = server._next_error()
+                if error is not None:
+                    self._respond(error, {"Retry-After": str(server.retry_after)}, b"")
+                    return
+
+                fixture = server.store.load(self.path)
+                if fixture is None:
+                    self._respond(404, {}, b"No fixture recorded for this path")
+                    return
+
+                status, headers, body = fixture
+                etag = next((v for k, v in headers.items() if k.lower() == "etag"), None)
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self._respond(304, {"ETag": etag}, b"")
+                    return
+                self._respond(status, headers, body)
+
+            def _respond(self, status: int, headers: Mapping[str, str], body: bytes) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"{self.address_string()} - {format % args}")
+
+        return FixtureHandler
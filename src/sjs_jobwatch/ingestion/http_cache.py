@@ -0,0 +1,187 @@
+"""
+On-disk HTTP response cache for conditional requests.
+
+Stores the ETag/Last-Modified validators and body of each fetched URL so the
+scraper can send conditional GETs and recognise when a page hasn't changed.
+
+New responses are staged rather than written straight away: once a page is
+cached the next poll treats it as unchanged, so the caller must only commit
+them after the snapshot built from them has been saved. If anything fails
+first, the staged entries are discarded and the next poll fetches them again.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Mapping
+
+from sjs_jobwatch.core import config
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Filesystem cache of HTTP responses, one entry per URL.
+
+    Each entry is a small JSON metadata file (validators, body digest and any
+    extra annotations) plus the raw body, both named by a hash of the URL.
+    store() and annotate() stage their changes until commit(); lookups only
+    see committed entries, so conditional requests always match a body on disk.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        """
+        Initialize the response cache.
+
+        Args:
+            base_dir: Directory for cache entries (defaults to config.HTTP_CACHE_DIR)
+        """
+        self.base_dir = base_dir or config.HTTP_CACHE_DIR
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        # URL -> (metadata, new body or None) awaiting commit()
+        self._pending: dict[str, tuple[dict[str, Any], bytes | None]] = {}
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Build the conditional request headers for a URL.
+
+        Validators are only sent while we still hold the body, so a 304 can
+        always be answered from the cache.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            If-None-Match / If-Modified-Since headers (possibly empty)
+        """
+        meta = self._read_meta(url)
+        if not meta or not self._body_path(url).exists():
+            return {}
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> bytes | None:
+        """
+        Get the cached body for a URL.
+
+        Args:
+            url: Cached URL
+
+        Returns:
+            Body bytes or None if not cached
+        """
+        try:
+            return self._body_path(url).read_bytes()
+        except OSError:
+            return None
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> bool:
+        """
+        Stage a fresh 200 response until commit().
+
+        Args:
+            url: Requested URL
+            headers: Response headers
+            body: Response body
+
+        Returns:
+            True if the body differs from the cached one (or nothing was cached)
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        meta = self._read_meta(url) or {}
+        changed = meta.get("body_sha256") != digest or not self._body_path(url).exists()
+
+        if changed:
+            # Annotations describe the old body, so drop them
+            meta = {}
+
+        meta.update(
+            url=url,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            body_sha256=digest,
+        )
+        self._pending[url] = (meta, body if changed else None)
+        return changed
+
+    def annotate(self, url: str, **values: Any) -> None:
+        """
+        Attach extra values (e.g. a page count) to a cached entry.
+
+        Annotations are cleared automatically when the body changes, and are
+        staged until commit() like the responses they describe.
+
+        Args:
+            url: Cached URL
+            **values: JSON-serializable values to store
+        """
+        meta, body = self._pending.get(url) or (self._read_meta(url), None)
+        if meta is None:
+            return
+        meta.setdefault("annotations", {}).update(values)
+        self._pending[url] = (meta, body)
+
+    def commit(self) -> None:
+        """Write the staged responses and annotations to disk."""
+        pending, self._pending = self._pending, {}
+        for url, (meta, body) in pending.items():
+            if body is not None:
+                self._body_path(url).write_bytes(body)
+            self._write_meta(url, meta)
+
+    def discard(self) -> None:
+        """Drop the staged responses, so their pages count as changed next time."""
+        if self._pending:
+            logger.debug(f"Discarding {len(self._pending)} uncommitted cache entries")
+        self._pending = {}
+
+    def annotation(self, url: str, key: str) -> Any:
+        """
+        Read an annotation previously stored with annotate().
+
+        Args:
+            url: Cached URL
+            key: Annotation name
+
+        Returns:
+            Stored value or None
+        """
+        meta = self._read_meta(url) or {}
+        return meta.get("annotations", {}).get(key)
+
+    def _key(self, url: str) -> str:
+        """Filesystem-safe key for a URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def _body_path(self, url: str) -> Path:
+        """Path of the cached body for a URL."""
+        return self.base_dir / f"{self._key(url)}.body"
+
+    def _meta_path(self, url: str) -> Path:
+        """Path of the metadata file for a URL."""
+        return self.base_dir / f"{self._key(url)}.json"
+
+    def _read_meta(self, url: str) -> dict[str, Any] | None:
+        """Load metadata for a URL, or None if absent/corrupt."""
+        path = self._meta_path(url)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+
+    def _write_meta(self, url: str, meta: dict[str, Any]) -> None:
+        """Write metadata for a URL atomically."""
+        path = self._meta_path(url)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(meta), encoding="utf-8")
+        temp_path.replace(path)
@@ -0,0 +1,231 @@
+"""
+Bulk construction of Job objects from raw SJS result dicts.
+
+Running the full pydantic constructor for every search result is the most
+expensive part of parsing a large page. The normalizer here already produces
+values of exactly the types Job declares and enforces its invariants, so most
+rows are built without running pydantic validation at all. A random sample of
+rows still goes through full validation, so if the site's data drifts away
+from what the normalizer expects we find out in the logs. Sampling only
+decides which rows are checked, never which jobs are kept; the price is that
+a row pydantic would reject is kept as the normalizer built it. Deployments
+that can't accept that validate every row (a sample rate of 1.0), which
+drops rejected rows instead.
+"""
+
+import logging
+import random
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from pydantic import ValidationError
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.interning import INTERN_TABLE
+from sjs_jobwatch.core.models import Job, parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Job fields copied as-is from the raw dict; they must be strings (or None)
+_TEXT_FIELDS = (
+    "category",
+    "classification",
+    "sub_classification",
+    "job_type",
+    "region",
+    "area",
+    "summary",
+    "description",
+)
+
+
+def normalize_job(raw: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Turn a raw search result into keyword arguments for Job.
+
+    The result holds every Job field, already of the declared type, and
+    satisfies the model's constraints (non-empty title/employer,
+    non-negative pay, pay_max >= pay_min).
+
+    Args:
+        raw: Raw job data from JSON
+
+    Returns:
+        Job field values, or None if required fields are missing
+
+    Raises:
+        ValueError: If a field has an unexpected type or breaks a constraint
+    """
+    get = raw.get
+    job_id = get("jobId") or get("id")
+    title = get("title")
+    employer = get("businessName") or get("employer")
+
+    title = str(title).strip() if title else ""
+    employer = str(employer).strip() if employer else ""
+    if not job_id or not title or not employer:
+        logger.debug(f"Skipping job with missing required fields: {get('title', 'unknown')}")
+        return None
+
+    job_id = str(job_id)
+    fields: dict[str, Any] = {
+        "id": job_id,
+        "title": title,
+        "employer": employer,
+        "category": get("category"),
+        "classification": get("classification"),
+        "sub_classification": get("subClassification"),
+        "job_type": get("jobType") or get("type"),
+        "region": get("regionName") or get("region"),
+        "area": get("areaName") or get("area"),
+        "summary": get("summary"),
+        "description": get("description"),
+    }
+    for field in _TEXT_FIELDS:
+        value = fields[field]
+        if value is not None and type(value) is not str:
+            raise ValueError(f"{field} should be a string, got {type(value).__name__}")
+    INTERN_TABLE.intern_fields(fields)
+
+    pay_min = _parse_pay(get("payMin") or get("salaryMin"))
+    pay_max = _parse_pay(get("payMax") or get("salaryMax"))
+    if pay_min is not None and not pay_min >= 0:
+        raise ValueError(f"pay_min ({pay_min}) must be >= 0")
+    if pay_max is not None and not pay_max >= 0:
+        raise ValueError(f"pay_max ({pay_max}) must be >= 0")
+    if pay_min is not None and pay_max is not None and pay_max < pay_min:
+        raise ValueError(f"pay_max ({pay_max}) must be >= pay_min ({pay_min})")
+    fields["pay_min"] = pay_min
+    fields["pay_max"] = pay_max
+
+    fields["posted_date"] = _parse_date(get("postedDate"))
+    fields["start_date"] = _parse_date(get("startDate"))
+    fields["end_date"] = _parse_date(get("endDate") or get("closingDate"))
+    fields["url"] = config.get_job_url(job_id)
+
+    return fields
+
+
+def construct_trusted(fields: dict[str, Any]) -> Job:
+    """
+    Build a Job from normalized values without validating them.
+
+    Only safe for dicts from normalize_job(), which always hold every field
+    with a correctly typed value.
+
+    Args:
+        fields: Output of normalize_job()
+
+    Returns:
+        Job object
+    """
+    return Job.model_construct(**fields)
+
+
+class JobBuilder:
+    """
+    Builds Job objects from raw result dicts, validating only a sample.
+
+    A sample rate of 1.0 validates every row (the strict path); 0.0 trusts
+    the normalizer completely. Rows that fail validation, or that validation
+    changes, are logged and counted in ``drift_count``. Below 1.0, a sampled
+    row that fails validation is still built as the normalizer parsed it, so
+    the jobs returned never depend on which rows were sampled; in strict
+    mode it is skipped, so no job that fails validation is returned.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = config.JOB_VALIDATION_SAMPLE_RATE,
+        seed: int | None = 0,
+    ) -> None:
+        """
+        Initialize the builder.
+
+        Args:
+            sample_rate: Fraction of rows to run through full validation (0-1)
+            seed: Seed for the sampling RNG (fixed by default so runs are
+                reproducible; None for a random one)
+        """
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.drift_count = 0
+        self._random = random.Random(seed)
+
+    def build(self, raw_jobs: Iterable[dict[str, Any]]) -> Iterator[Job]:
+        """
+        Convert raw job dicts to Job objects, skipping ones that fail to parse.
+
+        Args:
+            raw_jobs: Raw job data from JSON (may be a lazy stream)
+
+        Yields:
+            Job objects
+        """
+        for raw in raw_jobs:
+            try:
+                fields = normalize_job(raw)
+            except Exception as e:
+                logger.warning(f"Failed to parse job: {e}")
+                continue
+            if fields is None:
+                continue
+
+            if self.sample_rate and self._random.random() < self.sample_rate:
+                job = self._validate(fields)
+                if job is not None:
+                    yield job
+            else:
+                yield construct_trusted(fields)
+
+    def _validate(self, fields: dict[str, Any]) -> Job | None:
+        """
+        Build a job through full validation, logging schema drift.
+
+        In strict mode a row the model rejects is skipped (None); otherwise
+        it is kept as the normalizer built it, exactly as it would have been
+        had it not been sampled. A row validation changes is kept with the
+        validated values.
+        """
+        try:
+            job = Job(**fields)
+        except ValidationError as e:
+            self.drift_count += 1
+            if self.sample_rate >= 1.0:
+                logger.warning(f"Schema drift: job {fields['id']} failed validation, skipped: {e}")
+                return None
+            logger.warning(
+                f"Schema drift: job {fields['id']} failed validation, kept as parsed: {e}"
+            )
+            return construct_trusted(fields)
+        if job.__dict__ != fields:
+            self.drift_count += 1
+            logger.warning(f"Schema drift: validation changed job {fields['id']}, kept validated")
+        return job
+
+
+def _parse_date(date_str: str | None) -> datetime | None:
+    """Parse ISO date string safely."""
+    if not date_str or not isinstance(date_str, str):
+        return None
+    return _parse_iso_date(date_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(date_str: str) -> datetime | None:
+    """Parse an ISO date string (cached - many jobs share the same dates)."""
+    try:
+        return parse_datetime(date_str)
+    except ValueError:
+        return None
+
+
+def _parse_pay(value: Any) -> float | None:
+    """Parse pay value safely."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
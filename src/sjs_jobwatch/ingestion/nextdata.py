@@ -0,0 +1,143 @@
+"""
+Extraction of the Next.js ``__NEXT_DATA__`` payload from SJS pages.
+
+The SJS pages embed all job data as JSON in a single script tag. Building a
+full BeautifulSoup tree to find that one tag costs far more than decoding the
+JSON itself, so the default strategy slices the payload straight out of the
+response bytes and only falls back to BeautifulSoup when that fails.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable
+
+from bs4 import BeautifulSoup
+
+from sjs_jobwatch.core import config
+
+logger = logging.getLogger(__name__)
+
+# The exact markup Next.js emits, matched with plain byte searches
+_SCRIPT_ID_MARKER = b'id="__NEXT_DATA__"'
+_SCRIPT_END = b"</script>"
+
+# Looser match for attribute order/quoting variants
+_SCRIPT_PATTERN = re.compile(
+    rb"<script[^>]*\bid=[\"']?__NEXT_DATA__[\"']?[^>]*>(.*?)</script>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def find_payload_span(content: bytes) -> tuple[int, int] | None:
+    """
+    Locate the __NEXT_DATA__ JSON in the raw response bytes without copying it.
+
+    Args:
+        content: Raw HTML response body
+
+    Returns:
+        (start, end) byte offsets of the script's JSON payload, or None
+    """
+    marker = content.find(_SCRIPT_ID_MARKER)
+    if marker != -1:
+        start = content.find(b">", marker)
+        end = content.find(_SCRIPT_END, start)
+        if start != -1 and end != -1:
+            return start + 1, end
+
+    match = _SCRIPT_PATTERN.search(content)
+    if match:
+        return match.span(1)
+    return None
+
+
+def extract_payload_fast(content: bytes) -> bytes | None:
+    """
+    Find the __NEXT_DATA__ JSON directly in the raw response bytes.
+
+    Args:
+        content: Raw HTML response body
+
+    Returns:
+        The script's JSON payload, or None if it could not be located
+    """
+    span = find_payload_span(content)
+    if span is None:
+        return None
+    return content[span[0] : span[1]]
+
+
+def extract_payload_soup(content: bytes) -> str | None:
+    """
+    Find the __NEXT_DATA__ JSON by parsing the page with BeautifulSoup.
+
+    Args:
+        content: Raw HTML response body
+
+    Returns:
+        The script's JSON payload, or None if the tag is missing
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    script = soup.find("script", {"id": "__NEXT_DATA__"})
+    if not script or not script.string:
+        return None
+    return script.string
+
+
+# Available extraction strategies, selectable via config.NEXT_DATA_EXTRACTOR
+EXTRACTORS: dict[str, Callable[[bytes], bytes | str | None]] = {
+    "fast": extract_payload_fast,
+    "soup": extract_payload_soup,
+}
+
+
+def extract_payload(content: bytes, strategy: str = config.NEXT_DATA_EXTRACTOR) -> bytes | str:
+    """
+    Extract the raw __NEXT_DATA__ JSON text using the chosen strategy.
+
+    The ``fast`` strategy falls back to BeautifulSoup if the byte search
+    finds nothing, so unusual markup still works.
+
+    Args:
+        content: Raw HTML response body
+        strategy: Name of a strategy in EXTRACTORS
+
+    Returns:
+        The JSON payload
+
+    Raises:
+        ValueError: If the strategy is unknown or the payload is missing
+    """
+    try:
+        extractor = EXTRACTORS[strategy]
+    except KeyError:
+        raise ValueError(
+            f"Unknown extraction strategy: {strategy}. Valid options: {', '.join(EXTRACTORS)}"
+        ) from None
+
+    payload = extractor(content)
+    if payload is None and extractor is not extract_payload_soup:
+        logger.debug(f"{strategy} extraction missed __NEXT_DATA__, falling back to soup")
+        payload = extract_payload_soup(content)
+
+    if not payload:
+        raise ValueError("Could not find __NEXT_DATA__ script tag")
+    return payload
+
+
+def load_next_data(content: bytes, strategy: str = config.NEXT_DATA_EXTRACTOR) -> dict[str, Any]:
+    """
+    Extract and decode the __NEXT_DATA__ payload of a page.
+
+    Args:
+        content: Raw HTML response body
+        strategy: Name of a strategy in EXTRACTORS
+
+    Returns:
+        Decoded Next.js data
+
+    Raises:
+        ValueError: If the payload is missing or is not valid JSON
+    """
+    return json.loads(extract_payload(content, strategy))
@@ -0,0 +1,125 @@
+"""
+Request rate limiting for outbound HTTP.
+
+A token bucket per host keeps us polite to the SJS servers while allowing
+short bursts, so a single request never pays a fixed post-request delay.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlsplit
+
+from sjs_jobwatch.core import config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each request takes one token; callers that find the bucket empty reserve
+    a future token and wait for it, so waiters are served in arrival order.
+    The lock is only held while reserving, never while sleeping, which makes
+    the bucket safe to share between threads and asyncio tasks.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum burst size
+            clock: Monotonic time source
+            sleep: Blocking sleep function
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limited, waiting {wait:.2f}s")
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Wait for a token without blocking the event loop.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_host_limiter(
+    url: str,
+    rate: float = config.REQUEST_RATE,
+    burst: float = config.REQUEST_BURST,
+) -> TokenBucket:
+    """
+    Get the shared token bucket for a URL's host.
+
+    Every fetcher talking to the same host draws from the same bucket. The
+    first caller for a host decides its rate and burst.
+
+    Args:
+        url: Any URL on the host (or a bare hostname)
+        rate: Requests per second allowed for the host
+        burst: Number of requests allowed back-to-back
+
+    Returns:
+        Token bucket for the host
+    """
+    host = urlsplit(url).netloc or url
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(rate=rate, capacity=burst)
+            _buckets[host] = bucket
+        return bucket
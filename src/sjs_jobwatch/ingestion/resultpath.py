@@ -0,0 +1,196 @@
+"""
+Discovery of where job results live inside a page's Next.js ``pageProps``.
+
+Rather than probing a fixed list of guessed key paths, the resolver searches
+``pageProps`` once for the largest list of job-like dicts and remembers the
+path it found for each source. Later scrapes only check that the remembered
+path still leads to a list of jobs, and fall back to a fresh search when the
+site changes its payload shape.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Where SJS search results have been seen; tried first for a new source
+DEFAULT_RESULT_PATH = ["searchResults", "results"]
+
+# How deep into pageProps the search looks for a results list
+MAX_SEARCH_DEPTH = 6
+
+
+def source_key(url: str) -> str:
+    """
+    Key identifying pages that share a payload shape.
+
+    Query strings (filters, page numbers) don't change the shape, so only
+    the host and path are used.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Source key
+    """
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def is_job_like(item: Any) -> bool:
+    """Check whether a decoded JSON value looks like a raw job listing."""
+    return isinstance(item, dict) and "title" in item and ("jobId" in item or "id" in item)
+
+
+def find_result_path(page_props: dict[str, Any]) -> list[str] | None:
+    """
+    Search pageProps for the largest list of job-like dicts.
+
+    Args:
+        page_props: The ``props.pageProps`` dictionary from __NEXT_DATA__
+
+    Returns:
+        Key path to the list, or None if no list holds any job-like dicts
+    """
+    best_path: list[str] | None = None
+    best_count = 0
+    stack: list[tuple[list[str], dict[str, Any]]] = [([], page_props)]
+
+    while stack:
+        path, node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict) and len(path) < MAX_SEARCH_DEPTH:
+                stack.append(([*path, key], value))
+            elif isinstance(value, list):
+                count = sum(1 for item in value if is_job_like(item))
+                # Prefer more jobs, then the shallower path
+                if count > best_count or (
+                    count and count == best_count and len(path) + 1 < len(best_path or [])
+                ):
+                    best_path, best_count = [*path, key], count
+
+    return best_path
+
+
+def follow_path(page_props: dict[str, Any], path: list[str]) -> list[Any] | None:
+    """
+    Cheaply check that a path still leads to a list of jobs.
+
+    Only the first element is inspected, so this costs next to nothing even
+    for very large result lists. An empty list fits, but can't show that the
+    results haven't moved elsewhere.
+
+    Args:
+        page_props: The ``props.pageProps`` dictionary from __NEXT_DATA__
+        path: Key path to check
+
+    Returns:
+        The list at the path, or None if the path no longer fits
+    """
+    current: Any = page_props
+    for key in path:
+        if not isinstance(current, dict) or key not in current:
+            return None
+        current = current[key]
+
+    if not isinstance(current, list):
+        return None
+    if current and not is_job_like(current[0]):
+        return None
+    return current
+
+
+class ResultPathResolver:
+    """
+    Remembers where each source keeps its job results.
+
+    Paths live in memory and, when a cache file is given, are persisted as
+    JSON so they survive restarts. Safe to share between scraper threads.
+    """
+
+    def __init__(self, cache_file: Path | None = None) -> None:
+        """
+        Initialize the resolver.
+
+        Args:
+            cache_file: JSON file to persist paths in (None keeps them in memory only)
+        """
+        self.cache_file = cache_file
+        self._paths: dict[str, list[str]] = self._load()
+        self._lock = threading.Lock()
+
+    def cached_path(self, source: str) -> list[str] | None:
+        """
+        Get the remembered results path for a source.
+
+        Args:
+            source: Source key (see source_key())
+
+        Returns:
+            Key path, or None if the source hasn't been resolved yet
+        """
+        return self._paths.get(source)
+
+    def resolve(self, page_props: dict[str, Any], source: str = "") -> list[Any] | None:
+        """
+        Find the raw job results in a page.
+
+        Tries the remembered path for the source (or the default path for a
+        new source) first, and only searches the whole payload if that
+        doesn't lead to a list of jobs. An empty list there is only trusted
+        once a search finds no jobs anywhere else, and a default path is only
+        remembered once it has led to jobs.
+
+        Args:
+            page_props: The ``props.pageProps`` dictionary from __NEXT_DATA__
+            source: Source key (see source_key())
+
+        Returns:
+            The raw results list, or None if no results could be found
+        """
+        path = self._paths.get(source, DEFAULT_RESULT_PATH)
+        results = follow_path(page_props, path)
+        if results:
+            if source not in self._paths:
+                self._remember(source, path)
+            return results
+
+        found = find_result_path(page_props)
+        if found is None:
+            # An empty list at the path is an empty board; no list at all is None
+            return results
+
+        if source in self._paths:
+            logger.warning(f"Job results moved from {'.'.join(path)} to {'.'.join(found)}")
+        else:
+            logger.info(f"Found job results at {'.'.join(found)}")
+        self._remember(source, found)
+        return follow_path(page_props, found)
+
+    def _remember(self, source: str, path: list[str]) -> None:
+        """Store a path for a source and persist it."""
+        with self._lock:
+            self._paths[source] = list(path)
+            if self.cache_file is None:
+                return
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.cache_file.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(self._paths, indent=2), encoding="utf-8")
+                temp_path.replace(self.cache_file)
+            except OSError as e:
+                logger.warning(f"Could not save result paths to {self.cache_file}: {e}")
+
+    def _load(self) -> dict[str, list[str]]:
+        """Load persisted paths, starting empty if the file is missing or corrupt."""
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+        try:
+            return json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable result path cache {self.cache_file}: {e}")
+            return {}
@@ -2,22 +2,35 @@
 Web scraping module for the SJS job board.
 
 This module handles fetching and parsing job listings from the SJS website.
-Uses simple HTTP requests + BeautifulSoup instead of heavyweight browser automation.
+Uses simple HTTP requests instead of heavyweight browser automation.
 """
 
 import json
 import logging
+import math
 import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
-from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from sjs_jobwatch.core import config
-from sjs_jobwatch.core.models import Job, Snapshot
+from sjs_jobwatch.core.jsonstream import JsonArrayStream, iter_utf8_chunks
+from sjs_jobwatch.core.models import Job, Snapshot, compute_content_digest
+from sjs_jobwatch.ingestion.http_cache import ResponseCache
+from sjs_jobwatch.ingestion.jobbuilder import JobBuilder
+from sjs_jobwatch.ingestion.nextdata import find_payload_span, load_next_data
+from sjs_jobwatch.ingestion.ratelimit import get_host_limiter
+from sjs_jobwatch.ingestion.resultpath import (
+    DEFAULT_RESULT_PATH,
+    ResultPathResolver,
+    source_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,16 +54,37 @@ class SJSScraper:
         self,
         timeout: int = config.REQUEST_TIMEOUT,
         delay: float = config.REQUEST_DELAY,
+        max_workers: int = config.SCRAPE_MAX_WORKERS,
+        extractor: str = config.NEXT_DATA_EXTRACTOR,
+        cache: ResponseCache | None = None,
+        streaming: bool = config.SCRAPE_STREAMING,
+        validation_sample_rate: float = config.JOB_VALIDATION_SAMPLE_RATE,
+        result_paths: ResultPathResolver | None = None,
     ) -> None:
         """
         Initialize the scraper.
         
         Args:
             timeout: HTTP request timeout in seconds
-            delay: Delay between requests in seconds
+            delay: Average delay between requests to one host in seconds
+                (0 disables rate limiting)
+            max_workers: Maximum concurrent page fetches in multi-page scrapes
+            extractor: __NEXT_DATA__ extraction strategy ("fast" or "soup")
+            cache: Response cache enabling conditional requests (None = always refetch)
+            streaming: Decode search results incrementally to reduce peak memory
+            validation_sample_rate: Fraction of parsed jobs run through full
+                model validation (1.0 validates every job)
+            result_paths: Remembers where each source keeps its results
+                (None = a fresh in-memory resolver)
         """
         self.timeout = timeout
         self.delay = delay
+        self.max_workers = max(1, max_workers)
+        self.extractor = extractor
+        self.cache = cache
+        self.streaming = streaming
+        self.builder = JobBuilder(sample_rate=validation_sample_rate)
+        self.result_paths = result_paths if result_paths is not None else ResultPathResolver()
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
@@ -64,7 +98,11 @@ class SJSScraper:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Size the connection pool so concurrent page fetches don't block each other
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=max(10, self.max_workers),
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
@@ -89,6 +127,8 @@ class SJSScraper:
         region: str = "All",
         category: str = "All",
         keyword: str = "",
+        all_pages: bool = False,
+        max_pages: int = config.SCRAPE_MAX_PAGES,
     ) -> Snapshot:
         """
         Scrape job listings from SJS.
@@ -98,6 +138,8 @@ class SJSScraper:
             region: Region filter
             category: Category filter
             keyword: Keyword search
+            all_pages: Fetch every results page, not just the first
+            max_pages: Upper bound on pages fetched when all_pages is set
             
         Returns:
             Snapshot containing all found jobs
@@ -105,180 +147,381 @@ class SJSScraper:
         Raises:
             ScrapeError: If scraping fails
         """
-        start_time = time.time()
+        target_url = url or config.get_sjs_url(region, category, keyword)
+        snapshot = self._scrape(target_url, all_pages, max_pages, only_if_changed=False)
+        if snapshot is None:
+            raise ScrapeError("Scrape produced no snapshot")
+        return snapshot
 
-        # Build URL
+    def scrape_if_changed(
+        self,
+        url: str | None = None,
+        region: str = "All",
+        category: str = "All",
+        keyword: str = "",
+        all_pages: bool = False,
+        max_pages: int = config.SCRAPE_MAX_PAGES,
+    ) -> Snapshot | None:
+        """
+        Scrape job listings, skipping all parsing if the board is unchanged.
+        
+        Uses conditional requests against the response cache. If every page
+        comes back 304 Not Modified (or byte-identical to the cached copy),
+        nothing is parsed and None is returned. Without a cache this behaves
+        like scrape().
+        
+        New responses are only staged in the cache: call cache.commit() once
+        the snapshot is saved (or cache.discard() if that fails), otherwise
+        the next call would report the board as unchanged.
+        
+        Args:
+            url: Direct URL to scrape (overrides other params)
+            region: Region filter
+            category: Category filter
+            keyword: Keyword search
+            all_pages: Fetch every results page, not just the first
+            max_pages: Upper bound on pages fetched when all_pages is set
+            
+        Returns:
+            Snapshot of current jobs, or None if nothing changed since the last fetch
+            
+        Raises:
+            ScrapeError: If scraping fails
+        """
         target_url = url or config.get_sjs_url(region, category, keyword)
+        return self._scrape(target_url, all_pages, max_pages, only_if_changed=True)
+
+    def _scrape(
+        self,
+        target_url: str,
+        all_pages: bool,
+        max_pages: int,
+        only_if_changed: bool,
+    ) -> Snapshot | None:
+        """Fetch and parse the results pages for scrape() / scrape_if_changed()."""
+        start_time = time.time()
         logger.info(f"Scraping SJS jobs from: {target_url}")
+        source = source_key(target_url)
 
         try:
-            # Fetch the page
-            response = self.session.get(target_url, timeout=self.timeout)
-            response.raise_for_status()
-
-            # Parse HTML
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract job data from Next.js data script
-            jobs = self._extract_jobs(soup)
+            content, changed = self._fetch(target_url)
+
+            # The first page also tells us how many pages there are
+            first_jobs: list[Job] | None = None
+            page_count = 1
+            if all_pages:
+                cached_count = (
+                    self.cache.annotation(target_url, "page_count")
+                    if self.cache and not changed
+                    else None
+                )
+                if cached_count is not None:
+                    page_count = cached_count
+                else:
+                    first_jobs, page_props = self._read_page(content, source)
+                    page_count = _find_page_count(page_props, len(first_jobs))
+                    if self.cache:
+                        self.cache.annotate(target_url, page_count=page_count)
+                page_count = min(page_count, max_pages)
+
+            other_pages: list[tuple[bytes, bool]] = []
+            if page_count > 1:
+                logger.info(f"Fetching {page_count - 1} more pages")
+                other_pages = self._fetch_pages(target_url, range(2, page_count + 1))
+                changed = changed or any(page_changed for _, page_changed in other_pages)
+
+            if only_if_changed and not changed:
+                logger.info("Job board unchanged since last fetch, skipping parse")
+                return None
+
+            if first_jobs is None:
+                first_jobs, _ = self._read_page(content, source)
+            pages = [first_jobs]
+            pages.extend(self._read_page(body, source)[0] for body, _ in other_pages)
+            jobs = _merge_pages(pages)
 
             duration = time.time() - start_time
             logger.info(f"Successfully scraped {len(jobs)} jobs in {duration:.2f}s")
 
-            # Be respectful - add delay
-            time.sleep(self.delay)
-
-            return Snapshot(
+            # Jobs are already built and de-duplicated, so skip revalidating them
+            return Snapshot.model_construct(
                 timestamp=datetime.now(),
                 jobs=jobs,
                 total_count=len(jobs),
                 scrape_duration_seconds=duration,
                 source_url=target_url,
+                content_digest=compute_content_digest(jobs),
             )
 
+        except ScrapeError:
+            self._discard_cache()
+            raise
         except requests.RequestException as e:
+            self._discard_cache()
             raise ScrapeError(f"Failed to fetch page: {e}") from e
         except Exception as e:
+            self._discard_cache()
             raise ScrapeError(f"Failed to parse page: {e}") from e
 
-    def _extract_jobs(self, soup: BeautifulSoup) -> list[Job]:
+    def _discard_cache(self) -> None:
+        """Forget the responses of a failed scrape, so the next one sees them as changed."""
+        if self.cache:
+            self.cache.discard()
+
+    def _fetch_pages(self, base_url: str, page_numbers: range) -> list[tuple[bytes, bool]]:
         """
-        Extract job listings from the parsed HTML.
+        Fetch several results pages concurrently.
         
-        Looks for the __NEXT_DATA__ script tag which contains
-        server-rendered job data as JSON.
+        All workers share this scraper's session, so connections are pooled.
         
         Args:
-            soup: Parsed HTML
+            base_url: URL of the first results page
+            page_numbers: Page numbers to fetch
             
         Returns:
-            List of Job objects
+            (body, changed) for each page, in page order
+        """
+        urls = [_page_url(base_url, page) for page in page_numbers]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._fetch, urls))
+
+    def _wait_for_rate_limit(self, url: str) -> None:
+        """Be respectful - wait for the host's shared rate limiter before a request."""
+        if self.delay > 0:
+            get_host_limiter(url, rate=1 / self.delay).acquire()
+
+    def fetch(self, url: str, use_cache: bool = True) -> bytes:
+        """
+        Fetch any SJS page through this scraper's session, cache and rate limiter.
+        
+        Args:
+            url: Page URL
+            use_cache: Use the response cache (if the scraper has one)
+            
+        Returns:
+            Response body
             
         Raises:
-            ScrapeError: If data cannot be extracted
+            ScrapeError: If the request fails
+        """
+        try:
+            content, _ = self._fetch(url, use_cache=use_cache)
+        except requests.RequestException as e:
+            raise ScrapeError(f"Failed to fetch page: {e}") from e
+        return content
+
+    def _fetch(self, url: str, use_cache: bool = True) -> tuple[bytes, bool]:
+        """
+        Fetch a page, using a conditional request when it is cached.
+        
+        Args:
+            url: Page URL
+            use_cache: Use the response cache (if the scraper has one)
+            
+        Returns:
+            (body, changed) - changed is False on 304 or a byte-identical body
+            
+        Raises:
+            requests.RequestException: If the request fails
         """
-        # Find the Next.js data script
-        script = soup.find("script", {"id": "__NEXT_DATA__"})
+        cache = self.cache if use_cache else None
+        self._wait_for_rate_limit(url)
+        headers = cache.conditional_headers(url) if cache else {}
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+
+        if response.status_code == 304:
+            body = cache.load_body(url) if cache else None
+            if body is None:
+                raise ScrapeError(f"Got 304 Not Modified without a cached body for {url}")
+            logger.debug(f"Not modified: {url}")
+            return body, False
 
-        if not script or not script.string:
-            raise ScrapeError("Could not find __NEXT_DATA__ script tag")
+        response.raise_for_status()
 
+        if cache:
+            return response.content, cache.store(url, response.headers, response.content)
+        return response.content, True
+
+    def _read_page(self, content: bytes, source: str = "") -> tuple[list[Job], dict[str, Any]]:
+        """
+        Parse a page into its jobs and its ``pageProps`` metadata.
+        
+        Args:
+            content: Raw HTML response body
+            source: Source key used to remember where results live
+            
+        Returns:
+            (jobs, page_props) - in streaming mode page_props omits the results array
+        """
+        if self.streaming:
+            return self._stream_page(content, source)
+        page_props = self._parse_page(content)
+        return self._extract_jobs(page_props, source), page_props
+
+    def _stream_page(self, content: bytes, source: str) -> tuple[list[Job], dict[str, Any]]:
+        """
+        Parse a page incrementally, building each Job as its result is decoded.
+        
+        Avoids holding the decoded payload, the raw results list and the Job
+        objects in memory at the same time. Needs the "fast" extractor to find
+        the payload in place; otherwise the page is parsed normally.
+        
+        Args:
+            content: Raw HTML response body
+            source: Source key used to remember where results live
+            
+        Returns:
+            (jobs, page_props without the results array)
+            
+        Raises:
+            ScrapeError: If data cannot be extracted
+        """
+        span = find_payload_span(content) if self.extractor == "fast" else None
+        if span is None:
+            page_props = self._parse_page(content)
+            return self._extract_jobs(page_props, source), page_props
+
+        # Decode the payload window by window, straight out of the response bytes
+        path = self.result_paths.cached_path(source) or DEFAULT_RESULT_PATH
+        chunks = iter_utf8_chunks(memoryview(content)[span[0] : span[1]])
+        stream = JsonArrayStream(chunks, ["props", "pageProps", *path])
         try:
-            # Parse the JSON data
-            data = json.loads(script.string)
-
-            # Navigate to the job results (path may vary - adjust as needed)
-            # This is a guess based on common Next.js patterns
-            page_props = data.get("props", {}).get("pageProps", {})
-
-            # Try multiple possible paths
-            raw_jobs = None
-            for path in [
-                ["searchResults", "results"],
-                ["jobs", "results"],
-                ["results"],
-                ["jobs"],
-            ]:
-                current = page_props
-                try:
-                    for key in path:
-                        current = current[key]
-                    if isinstance(current, list):
-                        raw_jobs = current
-                        break
-                except (KeyError, TypeError):
-                    continue
-
-            if raw_jobs is None:
-                logger.warning("Could not find job results in expected location")
-                logger.debug(f"Available keys: {list(page_props.keys())}")
-                # Return empty list rather than crashing
-                return []
-
-            # Convert raw job data to Job objects
-            jobs = []
-            for raw_job in raw_jobs:
-                try:
-                    job = self._parse_job(raw_job)
-                    if job:
-                        jobs.append(job)
-                except Exception as e:
-                    logger.warning(f"Failed to parse job: {e}")
-                    continue
-
-            return jobs
+            jobs = list(self._build_jobs(stream))
+        except ValueError as e:
+            raise ScrapeError(f"Failed to decode JSON data: {e}") from e
 
+        page_props = (stream.remainder or {}).get("props", {}).get("pageProps", {})
+        if not stream.found:
+            # Results live elsewhere; nothing was streamed, so the remainder is the whole page
+            jobs = self._extract_jobs(page_props, source)
+        return jobs, page_props
+
+    def _parse_page(self, content: bytes) -> dict[str, Any]:
+        """
+        Decode a page's Next.js ``pageProps`` payload.
+        
+        Args:
+            content: Raw HTML response body
+            
+        Returns:
+            The ``props.pageProps`` dictionary from __NEXT_DATA__
+            
+        Raises:
+            ScrapeError: If data cannot be extracted
+        """
+        try:
+            data = load_next_data(content, self.extractor)
         except json.JSONDecodeError as e:
             raise ScrapeError(f"Failed to decode JSON data: {e}") from e
+        except ValueError as e:
+            raise ScrapeError(str(e)) from e
+
+        return data.get("props", {}).get("pageProps", {})
 
-    def _parse_job(self, raw: dict[str, Any]) -> Job | None:
+    def _extract_jobs(self, page_props: dict[str, Any], source: str = "") -> list[Job]:
         """
-        Parse a single raw job dictionary into a Job object.
+        Extract job listings from the Next.js page props.
         
         Args:
-            raw: Raw job data from JSON
+            page_props: The ``props.pageProps`` dictionary from __NEXT_DATA__
+            source: Source key used to remember where results live
             
         Returns:
-            Job object or None if required fields are missing
+            List of Job objects
+            
+        Raises:
+            ScrapeError: If no job results can be found in the page
         """
-        # Extract required fields
-        job_id = raw.get("jobId") or raw.get("id")
-        title = raw.get("title")
-        employer = raw.get("businessName") or raw.get("employer")
+        raw_jobs = self.result_paths.resolve(page_props, source)
+        if raw_jobs is None:
+            logger.debug(f"Available keys: {list(page_props.keys())}")
+            # Failing beats an empty list, which would look like every job was removed
+            raise ScrapeError("Could not find job results in page data")
 
-        # Validate required fields
-        if not job_id or not title or not employer:
-            logger.debug(f"Skipping job with missing required fields: {raw.get('title', 'unknown')}")
-            return None
+        return list(self._build_jobs(raw_jobs))
 
-        # Build URL to the job posting
-        job_url = f"https://www.sjs.govt.nz/jobs/{job_id}" if job_id else None
+    def _build_jobs(self, raw_jobs: Iterable[dict[str, Any]]) -> Iterator[Job]:
+        """
+        Convert raw job dicts to Job objects, skipping ones that fail to parse.
+        
+        Args:
+            raw_jobs: Raw job data from JSON (may be a lazy stream)
+            
+        Yields:
+            Job objects
+        """
+        return self.builder.build(raw_jobs)
 
-        # Create the Job object
-        try:
-            return Job(
-                id=str(job_id),
-                title=str(title).strip(),
-                employer=str(employer).strip(),
-                category=raw.get("category"),
-                classification=raw.get("classification"),
-                sub_classification=raw.get("subClassification"),
-                job_type=raw.get("jobType") or raw.get("type"),
-                region=raw.get("regionName") or raw.get("region"),
-                area=raw.get("areaName") or raw.get("area"),
-                summary=raw.get("summary"),
-                description=raw.get("description"),
-                pay_min=_parse_pay(raw.get("payMin") or raw.get("salaryMin")),
-                pay_max=_parse_pay(raw.get("payMax") or raw.get("salaryMax")),
-                posted_date=_parse_date(raw.get("postedDate")),
-                start_date=_parse_date(raw.get("startDate")),
-                end_date=_parse_date(raw.get("endDate") or raw.get("closingDate")),
-                url=job_url,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to create Job object: {e}")
-            return None
 
+# Keys the search payload may use to describe pagination
+PAGE_COUNT_KEYS = ("totalPages", "pageCount", "numberOfPages")
+TOTAL_RESULTS_KEYS = ("totalResults", "totalCount", "resultCount", "total")
+PAGE_SIZE_KEYS = ("pageSize", "perPage", "resultsPerPage")
 
-# Helper functions for parsing (module level for efficiency)
-def _parse_date(date_str: str | None) -> datetime | None:
-    """Parse ISO date string safely."""
-    if not date_str:
-        return None
-    try:
-        return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-    except (ValueError, AttributeError):
-        return None
 
+def _find_page_count(page_props: dict[str, Any], first_page_size: int) -> int:
+    """
+    Work out how many results pages a search has.
+    
+    Looks in pageProps and its immediate sub-objects (e.g. ``searchResults``)
+    for an explicit page count, falling back to total results / page size.
+    
+    Args:
+        page_props: The ``props.pageProps`` dictionary of the first page
+        first_page_size: Number of jobs found on the first page
+        
+    Returns:
+        Number of pages (at least 1)
+    """
+    containers = [page_props] + [v for v in page_props.values() if isinstance(v, dict)]
+
+    for container in containers:
+        for key in PAGE_COUNT_KEYS:
+            value = container.get(key)
+            if isinstance(value, int) and value > 0:
+                return value
+
+    for container in containers:
+        total = next(
+            (container[k] for k in TOTAL_RESULTS_KEYS if isinstance(container.get(k), int)),
+            None,
+        )
+        if total is None:
+            continue
+        page_size = next(
+            (container[k] for k in PAGE_SIZE_KEYS if isinstance(container.get(k), int)),
+            first_page_size,
+        )
+        if page_size > 0:
+            return max(1, math.ceil(total / page_size))
+
+    return 1
 
-def _parse_pay(value: Any) -> float | None:
-    """Parse pay value safely."""
-    if value is None:
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+
+def _page_url(url: str, page: int) -> str:
+    """Return ``url`` with its ``page`` query parameter set."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "page"]
+    if page > 1:
+        query.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _merge_pages(pages: list[list[Job]]) -> list[Job]:
+    """
+    Merge per-page job lists, keeping the first occurrence of each job ID.
+    
+    Listings can shift between pages while we fetch them, so the same job
+    may show up twice.
+    """
+    seen: set[str] = set()
+    merged: list[Job] = []
+    for page in pages:
+        for job in page:
+            if job.id not in seen:
+                seen.add(job.id)
+                merged.append(job)
+    return merged
 
 
 # Convenience function for one-off scrapes
@@ -287,6 +530,7 @@ def scrape_sjs_jobs(
     region: str = "All",
     category: str = "All",
     keyword: str = "",
+    all_pages: bool = False,
 ) -> Snapshot:
     """
     Convenience function to scrape SJS jobs.
@@ -296,9 +540,12 @@ def scrape_sjs_jobs(
         region: Region filter
         category: Category filter
         keyword: Keyword search
+        all_pages: Fetch every results page, not just the first
         
     Returns:
         Snapshot of current jobs
     """
     scraper = SJSScraper()
-    return scraper.scrape(url=url, region=region, category=category, keyword=keyword)
+    return scraper.scrape(
+        url=url, region=region, category=category, keyword=keyword, all_pages=all_pages
+    )
@@ -0,0 +1,185 @@
+"""
+Reading and writing snapshot files, compressed or not.
+
+Snapshot text, especially job descriptions, compresses very well. Files
+can be stored plain (.json), gzipped (.json.gz, standard library) or
+zstd-compressed (.json.zst, needs the optional zstandard package). The
+format is always taken from the file name, so stores can switch codecs at
+any time and older files stay readable.
+
+Files are encoded and decoded as streams: writing serializes straight into
+the compressor, and reading decodes the jobs array element by element from
+decompressed chunks, so neither side holds the whole file text in memory.
+"""
+
+import gzip
+import io
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from sjs_jobwatch.core.jsonstream import JsonArrayStream
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for zstd-compressed snapshots
+    zstandard = None
+
+# File name suffix of each codec, after ".json"
+CODEC_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Fast levels: snapshot JSON is so repetitive that higher levels gain little
+# (see benchmarks/bench_codecs.py)
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+# Characters of decompressed text decoded at a time when reading
+READ_CHUNK_SIZE = 1 << 16
+
+
+def codec_suffix(codec: str) -> str:
+    """
+    Get the file name suffix of a codec, checking it can be used.
+
+    Args:
+        codec: "none", "gzip" or "zstd"
+
+    Returns:
+        Suffix to append to ".json"
+
+    Raises:
+        ValueError: If the codec is unknown, or is zstd and zstandard isn't installed
+    """
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unknown snapshot compression: {codec}")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package")
+    return CODEC_SUFFIXES[codec]
+
+
+def open_snapshot_file(path: Path, mode: str = "r", codec: str | None = None) -> IO[str]:
+    """
+    Open a snapshot file as UTF-8 text, (de)compressing as needed.
+
+    Args:
+        path: File to open
+        mode: "r" or "w"
+        codec: Codec to use (defaults to the one named by the file's suffix)
+
+    Returns:
+        Text file object
+
+    Raises:
+        ValueError: If the codec can't be used
+    """
+    codec = codec or codec_for(path)
+    codec_suffix(codec)
+    if codec == "gzip":
+        return gzip.open(path, f"{mode}t", compresslevel=GZIP_LEVEL, encoding="utf-8")
+    if codec == "zstd":
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, "wb"))
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def codec_for(path: Path) -> str:
+    """Get the codec named by a file's suffix."""
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if suffix and path.name.endswith(suffix):
+            return codec
+    return "none"
+
+
+def write_snapshot_file(
+    path: Path, data: dict[str, Any], indent: int | None = None, codec: str | None = None
+) -> None:
+    """
+    Serialize stored snapshot data into a file.
+
+    Args:
+        path: File to write
+        data: Data to write
+        indent: JSON indentation (None = compact)
+        codec: Codec to use (defaults to the one named by the file's suffix)
+    """
+    separators = (",", ":") if indent is None else None
+    with open_snapshot_file(path, "w", codec) as f:
+        json.dump(data, f, indent=indent, separators=separators, ensure_ascii=False)
+
+
+def read_snapshot_file(path: Path) -> dict[str, Any]:
+    """
+    Decode a snapshot file, streaming its jobs array.
+
+    Args:
+        path: File to read
+
+    Returns:
+        The decoded document
+    """
+    with open_snapshot_file(path) as f:
+        stream = JsonArrayStream(_iter_chunks(f), ["jobs"])
+        jobs = list(stream)
+    if not stream.found:
+        return stream.remainder
+    return {**stream.remainder, "jobs": jobs}
+
+
+def read_snapshot_metadata(
+    path: Path, keys: Iterable[str], payload: str = "jobs"
+) -> dict[str, Any]:
+    """
+    Decode a snapshot file's metadata, without its jobs.
+
+    Files that store their metadata before the jobs are read only up to
+    where the jobs start (no further input is read once the array is
+    reached, even if it is empty), so the cost doesn't grow with the number
+    of jobs. Other files (written before metadata came first) are decoded
+    in full.
+
+    Args:
+        path: File to read
+        keys: Metadata keys the caller needs
+        payload: Key of the array the metadata comes before ("added" for
+            deltas, see deltas.payload_key())
+
+    Returns:
+        The decoded document without that array (at least the given keys,
+        where the file has them)
+    """
+    with open_snapshot_file(path) as f:
+
+        def chunks() -> Iterator[str]:
+            for chunk in _iter_chunks(f):
+                if stream.found:
+                    return
+                yield chunk
+
+        stream = JsonArrayStream(chunks(), [payload])
+        try:
+            next(iter(stream), None)
+        except ValueError:
+            # Input stops at the array, so decoding past its start may run out
+            if not stream.found:
+                raise
+        if not stream.found:
+            return stream.remainder
+        if all(key in stream.prefix for key in keys):
+            return stream.prefix
+
+    # Written before metadata came first
+    with open_snapshot_file(path) as f:
+        stream = JsonArrayStream(_iter_chunks(f), [payload])
+        for _ in stream:
+            pass
+    return stream.remainder
+
+
+def _iter_chunks(f: IO[str]) -> Iterator[str]:
+    """Read a text file in chunks."""
+    while chunk := f.read(READ_CHUNK_SIZE):
+        yield chunk
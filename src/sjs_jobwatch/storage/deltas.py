@@ -0,0 +1,117 @@
+"""
+Delta encoding of stored snapshots.
+
+Consecutive snapshots usually differ by a handful of jobs, so most of them
+are stored as a delta against the snapshot before: the jobs added, the IDs
+removed and, for modified jobs, only the fields that changed. A full
+snapshot (a keyframe) is written every few snapshots, so rebuilding any
+snapshot replays a bounded number of deltas.
+
+Deltas work on the stored JSON form of snapshots, so replaying them neither
+builds nor validates Job objects, and decoded keyframes and deltas compose
+into exactly the data a full snapshot file would hold.
+"""
+
+from typing import Any
+
+DELTA_SUFFIX = ".delta.json"
+
+# Keys of a delta file that aren't snapshot metadata
+_DELTA_KEYS = ("base", "job_count", "added", "removed", "modified", "order")
+
+
+def payload_key(filename: str) -> str:
+    """
+    Key of the first bulky array in a snapshot file.
+
+    Keyframes and deltas both store their metadata before it, so a reader
+    can stop there: "jobs" in a keyframe, "added" in a delta.
+    """
+    return "added" if DELTA_SUFFIX in filename else "jobs"
+
+
+def is_delta(data: dict[str, Any]) -> bool:
+    """Whether decoded snapshot file data is a delta rather than a keyframe."""
+    return "base" in data
+
+
+def encode_delta(base: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Encode a snapshot as a delta against an earlier one.
+
+    Args:
+        base: Stored data of the earlier snapshot (a full snapshot, not a delta)
+        data: Stored data of the snapshot to encode
+
+    Returns:
+        Delta data: the snapshot's metadata plus the job changes. The job
+        order is stored only when replaying wouldn't reproduce it (replay
+        keeps surviving jobs in place and appends added ones).
+
+    Raises:
+        ValueError: If either snapshot has duplicate job IDs
+    """
+    base_jobs = {raw["id"]: raw for raw in base["jobs"]}
+    jobs = data["jobs"]
+    current_ids = [raw["id"] for raw in jobs]
+    current = set(current_ids)
+    if len(base_jobs) != len(base["jobs"]) or len(current) != len(jobs):
+        raise ValueError("Snapshots with duplicate job IDs can't be delta-encoded")
+
+    added = []
+    modified = []
+    for raw in jobs:
+        old = base_jobs.get(raw["id"])
+        if old is None:
+            added.append(raw)
+        elif raw != old:
+            changes = {
+                key: value for key, value in raw.items() if key not in old or old[key] != value
+            }
+            changes.update((key, None) for key in old.keys() - raw.keys())
+            modified.append({**changes, "id": raw["id"]})
+
+    removed = [job_id for job_id in base_jobs if job_id not in current]
+
+    delta = {key: value for key, value in data.items() if key != "jobs"}
+    delta.update(
+        base=base["timestamp"],
+        job_count=len(jobs),
+        added=added,
+        removed=removed,
+        modified=modified,
+    )
+    replayed = [job_id for job_id in base_jobs if job_id in current]
+    replayed.extend(raw["id"] for raw in added)
+    if replayed != current_ids:
+        delta["order"] = current_ids
+    return delta
+
+
+def apply_delta(base: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Rebuild a snapshot from the snapshot before it and its delta.
+
+    Args:
+        base: Stored data of the earlier snapshot (a full snapshot)
+        delta: The delta, as written by encode_delta()
+
+    Returns:
+        Stored data of the full snapshot
+    """
+    jobs = {raw["id"]: raw for raw in base["jobs"]}
+    for job_id in delta["removed"]:
+        jobs.pop(job_id, None)
+    for changes in delta["modified"]:
+        jobs[changes["id"]] = {**jobs[changes["id"]], **changes}
+    for raw in delta["added"]:
+        jobs[raw["id"]] = raw
+
+    if "order" in delta:
+        job_list = [jobs[job_id] for job_id in delta["order"]]
+    else:
+        job_list = list(jobs.values())
+
+    data = {key: value for key, value in delta.items() if key not in _DELTA_KEYS}
+    data["jobs"] = job_list
+    return data
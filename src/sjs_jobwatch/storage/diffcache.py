@@ -0,0 +1,151 @@
+"""
+Content-addressed cache of computed diffs.
+
+Diffing two large snapshots means loading and validating both files; the
+result for a given pair never changes as long as the tracked field specs
+don't. The cache stores each diff in its compact encoding, keyed by the
+content digests of the two snapshots and the digest of the field specs, so
+re-running a diff or rendering alerts for many subscribers reads one small
+file instead, and changing the specs makes older entries miss.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.diffcodec import EncodedDiff
+from sjs_jobwatch.core.fields import tracked_specs_digest
+
+logger = logging.getLogger(__name__)
+
+
+class DiffCache:
+    """
+    Directory of encoded diffs, one JSON file per snapshot pair.
+
+    Reading an entry refreshes its modification time, which drives eviction:
+    entries unused for longer than the age limit are removed, then the least
+    recently used ones until the cache fits its size limit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = config.DIFF_CACHE_MAX_BYTES,
+        max_age_days: int = config.DIFF_CACHE_MAX_AGE_DAYS,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory to keep cached diffs in (created on first write)
+            max_bytes: Total size to keep the cache under (0 = no size limit)
+            max_age_days: Evict entries unused for this many days (0 = never)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+    def get(
+        self,
+        previous_digest: str,
+        current_digest: str,
+        field_specs: str | None = None,
+    ) -> EncodedDiff | None:
+        """
+        Look up the diff between two snapshots.
+
+        Args:
+            previous_digest: Content digest of the earlier snapshot
+            current_digest: Content digest of the later snapshot
+            field_specs: Digest of the field specs the diff must be computed with
+                (defaults to the tracked field specs)
+
+        Returns:
+            Cached diff, or None if it isn't cached (or the entry is unreadable)
+        """
+        field_specs = field_specs or tracked_specs_digest()
+        path = self._path(previous_digest, current_digest, field_specs)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            diff = EncodedDiff(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Dropping unreadable cached diff {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if diff.field_specs != field_specs:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return diff
+
+    def put(self, diff: EncodedDiff) -> Path:
+        """
+        Store a diff, then evict entries beyond the cache limits.
+
+        Args:
+            diff: Encoded diff to store
+
+        Returns:
+            Path of the cache entry
+        """
+        path = self._path(
+            diff.previous_snapshot.content_digest,
+            diff.current_snapshot.content_digest,
+            diff.field_specs,
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(diff.data, separators=(",", ":")), encoding="utf-8")
+        temp_path.replace(path)
+        logger.debug(f"Cached diff with {diff.total_changes} changes in {path.name}")
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """
+        Remove entries that are too old, and the least recently used ones
+        beyond the size limit.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        # Most recently used first
+        entries.sort(key=lambda entry: entry[1].st_mtime, reverse=True)
+
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days > 0 else None
+        total = 0
+        removed = 0
+        for path, stat in entries:
+            total += stat.st_size
+            too_old = cutoff is not None and stat.st_mtime < cutoff
+            if too_old or 0 < self.max_bytes < total:
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+                removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} cached diffs")
+        return removed
+
+    def __len__(self) -> int:
+        """Number of cached diffs."""
+        return sum(1 for _ in self.cache_dir.glob("*.json"))
+
+    def _path(self, previous_digest: str, current_digest: str, field_specs: str | None) -> Path:
+        """Get the cache file for a snapshot pair diffed under some field specs."""
+        return self.cache_dir / f"{previous_digest}_{current_digest}_{field_specs}.json"
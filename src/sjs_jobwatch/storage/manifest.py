@@ -0,0 +1,254 @@
+"""
+Index of the snapshots in a snapshot directory.
+
+Listing snapshots used to mean statting every file, and showing their
+metadata meant parsing every file in full. The manifest is an append-only
+JSON Lines file with one record per saved or deleted snapshot, holding
+everything needed to list, count and pick snapshots without opening them.
+
+Records are replayed in order on load: an "add" record (re)defines a
+snapshot and a "remove" record drops it. Pruning compacts the file. If the
+manifest is missing it is rebuilt from the snapshot files on first use.
+"""
+
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from sjs_jobwatch.core.models import Snapshot, SnapshotHeader
+from sjs_jobwatch.storage.compression import (
+    CODEC_SUFFIXES,
+    read_snapshot_file,
+    read_snapshot_metadata,
+)
+from sjs_jobwatch.storage.deltas import payload_key
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.jsonl"
+
+
+class ManifestEntry(BaseModel):
+    """Metadata of one stored snapshot."""
+
+    model_config = {"frozen": True}
+
+    filename: str = Field(..., description="Snapshot file name within the store")
+    timestamp: datetime = Field(..., description="When the snapshot was taken")
+    total_count: int = Field(..., ge=0, description="Total jobs reported by the board")
+    job_count: int = Field(..., ge=0, description="Jobs stored in the snapshot")
+    scrape_duration_seconds: float | None = Field(None, description="Scrape duration")
+    source_url: str = Field(..., description="URL that was scraped")
+    content_digest: str = Field(..., description="Digest of the snapshot's jobs")
+    size_bytes: int = Field(..., ge=0, description="Size of the snapshot file")
+    base: datetime | None = Field(
+        None, description="Timestamp of the snapshot a delta is based on (None for keyframes)"
+    )
+
+    @classmethod
+    def from_snapshot(
+        cls, snapshot: Snapshot, filepath: Path, base: datetime | None = None
+    ) -> "ManifestEntry":
+        """Describe a snapshot just written to a file."""
+        return cls(
+            filename=filepath.name,
+            timestamp=snapshot.timestamp,
+            total_count=snapshot.total_count,
+            job_count=len(snapshot.jobs),
+            scrape_duration_seconds=snapshot.scrape_duration_seconds,
+            source_url=snapshot.source_url,
+            content_digest=snapshot.content_digest,
+            size_bytes=filepath.stat().st_size,
+            base=base,
+        )
+
+    def header(self) -> SnapshotHeader:
+        """Get the snapshot header."""
+        return SnapshotHeader(
+            timestamp=self.timestamp,
+            total_count=self.total_count,
+            scrape_duration_seconds=self.scrape_duration_seconds,
+            source_url=self.source_url,
+            content_digest=self.content_digest,
+        )
+
+
+class SnapshotManifest:
+    """
+    Append-only manifest of a snapshot directory.
+
+    Entries are cached in memory and re-read only when the file changes, so
+    repeated lookups cost one stat() of the manifest. Writes invalidate the
+    cache, which also picks up records appended by other processes.
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        """
+        Initialize the manifest.
+
+        Args:
+            base_dir: Snapshot directory (the manifest lives inside it)
+        """
+        self.base_dir = base_dir
+        self.path = base_dir / MANIFEST_FILENAME
+        self._entries: dict[str, ManifestEntry] = {}
+        self._signature: tuple[int, int] | None = None
+
+    def entries(self) -> list[ManifestEntry]:
+        """
+        Get the stored snapshots.
+
+        Returns:
+            Entries, newest first (by the timestamp in the file name)
+        """
+        self._refresh()
+        return sorted(self._entries.values(), key=lambda entry: entry.filename, reverse=True)
+
+    def get(self, filename: str) -> ManifestEntry | None:
+        """
+        Get the entry of one snapshot file.
+
+        Args:
+            filename: Snapshot file name within the store
+
+        Returns:
+            Its entry, or None if the manifest doesn't list it
+        """
+        self._refresh()
+        return self._entries.get(filename)
+
+    def __len__(self) -> int:
+        """Number of stored snapshots."""
+        self._refresh()
+        return len(self._entries)
+
+    def add(self, entry: ManifestEntry) -> None:
+        """
+        Record a saved snapshot, replacing any entry for the same file.
+
+        Args:
+            entry: Snapshot metadata
+        """
+        self._refresh()
+        self._append([{"op": "add", **entry.model_dump(mode="json")}])
+
+    def remove(self, filenames: Iterable[str]) -> None:
+        """
+        Record deleted snapshots.
+
+        Args:
+            filenames: Names of the deleted snapshot files
+        """
+        self._refresh()
+        records = [
+            {"op": "remove", "filename": filename}
+            for filename in filenames
+            if filename in self._entries
+        ]
+        if records:
+            self._append(records)
+
+    def compact(self) -> None:
+        """Rewrite the manifest with one record per stored snapshot."""
+        self._refresh()
+        self._write(self._entries.values())
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the manifest by reading every snapshot file.
+
+        Unreadable files are skipped.
+
+        Returns:
+            Number of snapshots indexed
+        """
+        files = sorted(_snapshot_files(self.base_dir))
+        entries = []
+        for filepath in files:
+            try:
+                entries.append(_read_entry(filepath))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable snapshot {filepath.name}: {e}")
+        self._write(entries)
+        logger.info(f"Rebuilt snapshot manifest with {len(entries)} snapshots")
+        return len(entries)
+
+    def _refresh(self) -> None:
+        """Reload the manifest if it changed on disk, rebuilding it if it is missing."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if not any(_snapshot_files(self.base_dir)):
+                self._entries, self._signature = {}, None
+                return
+            self.rebuild()
+            stat = self.path.stat()
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return
+
+        entries: dict[str, ManifestEntry] = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record.pop("op") == "remove":
+                        entries.pop(record["filename"], None)
+                    else:
+                        entry = ManifestEntry(**record)
+                        entries[entry.filename] = entry
+                except Exception:
+                    # A torn last line from an interrupted write
+                    logger.warning(f"Ignoring unreadable manifest record in {self.path}")
+                    continue
+        self._entries, self._signature = entries, signature
+
+    def _append(self, records: list[dict]) -> None:
+        """Append records to the manifest."""
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        self._signature = None
+
+    def _write(self, entries: Iterable[ManifestEntry]) -> None:
+        """Replace the manifest atomically with "add" records for the given entries."""
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps({"op": "add", **entry.model_dump(mode="json")}) + "\n")
+        temp_path.replace(self.path)
+        self._signature = None
+
+
+def _read_entry(filepath: Path) -> ManifestEntry:
+    """Index a snapshot file from its metadata (older files are read in full)."""
+    data = read_snapshot_metadata(
+        filepath, ("content_digest", "job_count"), payload_key(filepath.name)
+    )
+    if data.get("content_digest") is None or "job_count" not in data:
+        # Written before metadata came first: the jobs are needed
+        data = read_snapshot_file(filepath)
+    # Snapshots written before digests existed get one computed here
+    digest = data.get("content_digest") or Snapshot(**data).content_digest
+    return ManifestEntry(
+        filename=filepath.name,
+        timestamp=data["timestamp"],
+        total_count=data["total_count"],
+        job_count=data.get("job_count", len(data.get("jobs", []))),
+        scrape_duration_seconds=data.get("scrape_duration_seconds"),
+        source_url=data["source_url"],
+        content_digest=digest,
+        size_bytes=filepath.stat().st_size,
+        base=data.get("base"),
+    )
+
+
+def _snapshot_files(base_dir: Path) -> Iterator[Path]:
+    """Snapshot files in a directory, in any codec."""
+    for suffix in CODEC_SUFFIXES.values():
+        yield from base_dir.glob(f"snapshot_*.json{suffix}")
@@ -6,14 +6,46 @@ Handles saving, loading, and managing historical snapshots of job listings.
 
 import json
 import logging
+from collections.abc import Iterator
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 
 from sjs_jobwatch.core import config
-from sjs_jobwatch.core.models import Snapshot
+from sjs_jobwatch.core.columnar import ColumnarSnapshot
+from sjs_jobwatch.core.diff import diff_snapshots
+from sjs_jobwatch.core.diffcodec import EncodedDiff, compose_diffs
+from sjs_jobwatch.core.fields import tracked_field_specs
+from sjs_jobwatch.core.interning import InternTable
+from sjs_jobwatch.core.models import Job, Snapshot, SnapshotHeader, parse_datetime
+from sjs_jobwatch.storage.compression import (
+    CODEC_SUFFIXES,
+    codec_suffix,
+    read_snapshot_file,
+    read_snapshot_metadata,
+    write_snapshot_file,
+)
+from sjs_jobwatch.storage.deltas import (
+    DELTA_SUFFIX,
+    apply_delta,
+    encode_delta,
+    is_delta,
+    payload_key,
+)
+from sjs_jobwatch.storage.diffcache import DiffCache
+from sjs_jobwatch.storage.manifest import ManifestEntry, SnapshotManifest
 
 logger = logging.getLogger(__name__)
 
+# Append-only log of scrapes that matched the latest stored snapshot
+HEARTBEAT_FILENAME = "heartbeats.jsonl"
+
+# Subdirectory holding cached diffs between stored snapshots
+DIFF_CACHE_DIRNAME = "diffs"
+
+# Subdirectory holding the diff between each snapshot and the one before it
+DIFF_LOG_DIRNAME = "diff_log"
+
 
 class SnapshotStore:
     """
@@ -25,42 +57,160 @@ class SnapshotStore:
     - Easy manual inspection
     - Natural chronological ordering
     - Git-friendly diffs (if desired)
+    
+    A manifest (see manifest.py) indexes the files, so listing, counting and
+    reading snapshot metadata never open the snapshots themselves.
+    
+    Only every Nth snapshot (a keyframe) is stored in full; the others are
+    stored as deltas against the snapshot before them (see deltas.py) and
+    rebuilt on load by replaying from the nearest keyframe.
+    
+    Files can be compressed (see compression.py); the codec is recorded in
+    the file name, so files written with any codec stay readable.
     """
 
-    def __init__(self, base_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        base_dir: Path | None = None,
+        keyframe_interval: int | None = None,
+        compression: str | None = None,
+    ) -> None:
         """
         Initialize snapshot storage.
         
         Args:
             base_dir: Directory to store snapshots (defaults to config.SNAPSHOT_DIR)
+            keyframe_interval: Store every Nth snapshot in full (defaults to
+                config.SNAPSHOT_KEYFRAME_INTERVAL; 1 = no deltas)
+            compression: Codec for new files, "none", "gzip" or "zstd"
+                (defaults to config.SNAPSHOT_COMPRESSION)
+            
+        Raises:
+            ValueError: If keyframe_interval is less than 1, or the codec is
+                unknown or unavailable
         """
+        if keyframe_interval is None:
+            keyframe_interval = config.SNAPSHOT_KEYFRAME_INTERVAL
+        if keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval must be at least 1, got {keyframe_interval}")
+
         self.base_dir = base_dir or config.SNAPSHOT_DIR
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+        self.compression = compression or config.SNAPSHOT_COMPRESSION
+        self._suffix = codec_suffix(self.compression)
+        # Data of the last snapshot saved, to encode the next one against
+        self._head: dict | None = None
+        self.manifest = SnapshotManifest(self.base_dir)
+        self.diff_cache = DiffCache(self.base_dir / DIFF_CACHE_DIRNAME)
+        # Interval diffs are kept as long as the snapshots they connect
+        self.diff_log = DiffCache(
+            self.base_dir / DIFF_LOG_DIRNAME,
+            max_bytes=0,
+            max_age_days=config.SNAPSHOT_RETENTION_DAYS,
+        )
+
+    def close(self) -> None:
+        """Release resources held by the store (file storage holds none)."""
 
     def save(self, snapshot: Snapshot) -> Path:
         """
         Save a snapshot to disk.
         
+        The snapshot is written as a delta against the latest stored one,
+        unless it is due to be a keyframe.
+        
         Args:
             snapshot: Snapshot to save
             
         Returns:
             Path where snapshot was saved
         """
-        filename = self._get_filename(snapshot.timestamp)
-        filepath = self.base_dir / filename
+        keyframe_path = self.base_dir / (self._get_filename(snapshot.timestamp) + self._suffix)
+        delta_path = self.base_dir / (self._get_delta_filename(snapshot.timestamp) + self._suffix)
 
         # Convert to JSON
         data = snapshot.model_dump(mode="json")
 
-        # Write atomically (write to temp file, then rename)
+        base = self._delta_base(snapshot)
+        if base is not None:
+            try:
+                delta = encode_delta(base, data)
+            except ValueError as e:
+                logger.debug(f"Storing snapshot in full: {e}")
+                base = None
+
+        if base is None:
+            filepath = keyframe_path
+            self._write_file(filepath, _keyframe_data(data), indent=2)
+        else:
+            filepath = delta_path
+            self._write_file(filepath, delta, indent=None)
+
+        # A snapshot saved again may change between keyframe and delta, or codec
+        for replaced in self._snapshot_files(snapshot.timestamp):
+            if replaced != filepath:
+                replaced.unlink()
+                self.manifest.remove([replaced.name])
+
+        self.manifest.add(
+            ManifestEntry.from_snapshot(
+                snapshot, filepath, base=base["timestamp"] if base is not None else None
+            )
+        )
+        self._head = data
+        logger.info(f"Saved snapshot with {len(snapshot.jobs)} jobs to {filepath}")
+        return filepath
+
+    def _delta_base(self, snapshot: Snapshot) -> dict | None:
+        """
+        Get the stored data to encode a snapshot against.
+        
+        Args:
+            snapshot: Snapshot about to be saved
+            
+        Returns:
+            Data of the latest stored snapshot, or None if the snapshot
+            should be stored as a keyframe
+        """
+        if self.keyframe_interval == 1:
+            return None
+
+        entries = self.manifest.entries()
+        # Deltas only go forward in time, and only from a snapshot with a keyframe
+        latest_name = self._get_filename(entries[0].timestamp) if entries else None
+        if latest_name is None or latest_name >= self._get_filename(snapshot.timestamp):
+            return None
+        deltas = 0
+        for entry in entries:
+            if entry.base is None:
+                break
+            deltas += 1
+        else:
+            return None
+        if deltas + 1 >= self.keyframe_interval:
+            return None
+
+        latest = entries[0]
+        if self._head is not None and self._head.get("content_digest") == latest.content_digest:
+            return self._head
+        try:
+            return self._read_data(latest.timestamp, {})
+        except Exception as e:
+            logger.warning(f"Storing snapshot in full, latest snapshot unreadable: {e}")
+            return None
+
+    def _write_file(self, filepath: Path, data: dict, indent: int | None) -> None:
+        """
+        Write a snapshot file atomically (write to temp file, then rename).
+        
+        Raises:
+            OSError: If the file can't be written
+        """
         temp_path = filepath.with_suffix(".tmp")
         try:
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_snapshot_file(temp_path, data, indent=indent, codec=self.compression)
             temp_path.rename(filepath)
-            logger.info(f"Saved snapshot with {len(snapshot.jobs)} jobs to {filepath}")
-            return filepath
         except Exception as e:
             # Clean up temp file if something went wrong
             if temp_path.exists():
@@ -77,16 +227,12 @@ class SnapshotStore:
         Returns:
             Snapshot or None if not found
         """
-        filename = self._get_filename(timestamp)
-        filepath = self.base_dir / filename
-
-        if not filepath.exists():
+        filepath = self._find_file(timestamp)
+        if filepath is None:
             return None
 
         try:
-            with open(filepath, encoding="utf-8") as f:
-                data = json.load(f)
-            return Snapshot(**data)
+            return Snapshot(**self._read_data(timestamp, {}))
         except Exception as e:
             logger.error(f"Failed to load snapshot from {filepath}: {e}")
             return None
@@ -101,17 +247,47 @@ class SnapshotStore:
         Returns:
             List of snapshots (newest first)
         """
-        files = self.list_snapshots()
+        # Jobs unchanged between snapshots are loaded once and shared
+        shared_jobs: dict[tuple, Job] = {}
+        # Snapshots rebuilt so far, so delta chains are replayed once
+        loaded: dict[str, dict] = {}
 
         snapshots = []
-        for filepath in files[:n]:
+        for entry in self.manifest.entries()[:n]:
             try:
-                with open(filepath, encoding="utf-8") as f:
-                    data = json.load(f)
-                snapshot = Snapshot(**data)
+                data = self._read_data(entry.timestamp, loaded)
+                snapshot = _snapshot_from_data(data, shared_jobs)
                 snapshots.append(snapshot)
             except Exception as e:
-                logger.warning(f"Failed to load snapshot from {filepath}: {e}")
+                logger.warning(f"Failed to load snapshot from {entry.filename}: {e}")
+                continue
+
+        return snapshots
+
+    def load_latest_columnar(self, n: int = 1) -> list[ColumnarSnapshot]:
+        """
+        Load the most recent N snapshots in columnar form.
+        
+        Builds the columns straight from the stored JSON without creating Job
+        objects, sharing identical text across snapshots. Suited to loading
+        long histories for analytics.
+        
+        Args:
+            n: Number of snapshots to load
+            
+        Returns:
+            List of columnar snapshots (newest first)
+        """
+        strings = InternTable()
+        loaded: dict[str, dict] = {}
+
+        snapshots = []
+        for entry in self.manifest.entries()[:n]:
+            try:
+                data = self._read_data(entry.timestamp, loaded)
+                snapshots.append(ColumnarSnapshot.from_records(data, strings))
+            except Exception as e:
+                logger.warning(f"Failed to load snapshot from {entry.filename}: {e}")
                 continue
 
         return snapshots
@@ -123,14 +299,277 @@ class SnapshotStore:
         Returns:
             List of snapshot file paths
         """
-        files = list(self.base_dir.glob("snapshot_*.json"))
-        # Sort by modification time, newest first
-        files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-        return files
+        return [self.base_dir / entry.filename for entry in self.manifest.entries()]
 
     def count(self) -> int:
         """Get total number of snapshots stored."""
-        return len(self.list_snapshots())
+        return len(self.manifest)
+
+    def latest_digest(self) -> str | None:
+        """
+        Get the content digest of the most recent snapshot.
+        
+        Returns:
+            Hex digest, or None if there are no readable snapshots
+        """
+        headers = self.load_headers(n=1)
+        return headers[0].content_digest if headers else None
+
+    def load_headers(self, n: int = 1) -> list[SnapshotHeader]:
+        """
+        Load the metadata of the most recent N snapshots, without their jobs.
+        
+        Reads only the manifest.
+        
+        Args:
+            n: Number of snapshots to read
+            
+        Returns:
+            List of snapshot headers (newest first)
+        """
+        return list(islice(self.iter_headers(), n))
+
+    def iter_headers(self) -> Iterator[SnapshotHeader]:
+        """
+        Iterate over the metadata of the stored snapshots, without their jobs.
+        
+        Reads only the manifest.
+        
+        Yields:
+            Snapshot headers, newest first
+        """
+        for entry in self.manifest.entries():
+            yield entry.header()
+
+    def load_header(self, timestamp: datetime) -> SnapshotHeader | None:
+        """
+        Load a snapshot's metadata by timestamp, without its jobs.
+        
+        Uses the manifest entry when there is one. Otherwise reads the
+        metadata at the start of the keyframe or delta file and stops at
+        its jobs, so it takes the same time however many jobs there are.
+        Files written before metadata came first are loaded in full.
+        
+        Args:
+            timestamp: Timestamp of the snapshot
+            
+        Returns:
+            Snapshot header or None if not found
+        """
+        filepath = self._find_file(timestamp)
+        if filepath is None:
+            return None
+
+        entry = self.manifest.get(filepath.name)
+        if entry is not None:
+            return entry.header()
+
+        try:
+            metadata = read_snapshot_metadata(
+                filepath, SnapshotHeader.model_fields, payload_key(filepath.name)
+            )
+            if metadata.get("content_digest") is not None:
+                return SnapshotHeader(**metadata)
+        except Exception as e:
+            logger.error(f"Failed to load snapshot header from {filepath}: {e}")
+            return None
+
+        # Written before digests existed
+        snapshot = self.load(timestamp)
+        return snapshot.header() if snapshot is not None else None
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the manifest from the snapshot files.
+        
+        Returns:
+            Number of snapshots indexed
+        """
+        return self.manifest.rebuild()
+
+    def diff(
+        self, previous: SnapshotHeader, current: SnapshotHeader, log: bool = False
+    ) -> EncodedDiff:
+        """
+        Get the diff between two stored snapshots, computing it only once.
+        
+        Diffs are cached by the two snapshots' content digests, so asking
+        again for the same pair reads a small cache file instead of loading
+        and diffing both snapshots. A cached diff is returned with the
+        headers of the requested snapshots.
+        
+        Args:
+            previous: Header of the earlier snapshot
+            current: Header of the later snapshot
+            log: Keep the diff in the diff log, which only drops entries
+                along with their snapshots. Use for consecutive snapshots,
+                so net_diff() can compose windows from the log.
+            
+        Returns:
+            The diff
+            
+        Raises:
+            OSError: If a snapshot isn't cached and can't be loaded
+        """
+        logged = self.diff_log.get(previous.content_digest, current.content_digest)
+        if logged is not None:
+            return logged.with_headers(previous, current)
+
+        diff = self.diff_cache.get(previous.content_digest, current.content_digest)
+        if diff is not None:
+            diff = diff.with_headers(previous, current)
+        else:
+            shared_jobs: dict[tuple, Job] = {}
+            loaded: dict[str, dict] = {}
+            snapshots = []
+            for header in (previous, current):
+                try:
+                    data = self._read_data(header.timestamp, loaded)
+                    snapshots.append(_snapshot_from_data(data, shared_jobs))
+                except Exception as e:
+                    raise OSError(f"Failed to load snapshot {header.timestamp}: {e}") from e
+            diff = EncodedDiff.from_diff(diff_snapshots(*snapshots))
+            if not log:
+                self._keep_diff(self.diff_cache, diff)
+
+        if log:
+            self._keep_diff(self.diff_log, diff)
+        return diff
+
+    def net_diff(self, headers: list[SnapshotHeader]) -> EncodedDiff:
+        """
+        Get the net diff across a window of stored snapshots.
+        
+        When the diff of every consecutive pair is logged or cached, they
+        are composed without loading any snapshot, so the cost follows the
+        number of changes. Otherwise, or when a tracked field has a change
+        threshold (see compose_diffs()), the first and last snapshots are
+        diffed directly.
+        
+        Args:
+            headers: Snapshot headers, newest first (as from load_headers())
+            
+        Returns:
+            Diff from the oldest to the newest snapshot
+            
+        Raises:
+            ValueError: If fewer than two headers are given
+        """
+        if len(headers) < 2:
+            raise ValueError("Need at least two snapshots to diff")
+
+        oldest_first = headers[::-1]
+        if any(spec.threshold for spec in tracked_field_specs()):
+            return self.diff(oldest_first[0], oldest_first[-1])
+        intervals = []
+        for previous, current in zip(oldest_first, oldest_first[1:]):
+            diff = self._stored_diff(previous, current)
+            if diff is None:
+                logger.debug(f"No stored diff for {previous.timestamp} → {current.timestamp}")
+                return self.diff(oldest_first[0], oldest_first[-1])
+            intervals.append(diff)
+
+        return compose_diffs(intervals, oldest_first[0], oldest_first[-1])
+
+    def _stored_diff(
+        self, previous: SnapshotHeader, current: SnapshotHeader
+    ) -> EncodedDiff | None:
+        """Look up a diff in the diff log, then the diff cache."""
+        for store in (self.diff_log, self.diff_cache):
+            diff = store.get(previous.content_digest, current.content_digest)
+            if diff is not None:
+                logger.debug(f"Using stored diff for {previous.timestamp} → {current.timestamp}")
+                return diff.with_headers(previous, current)
+        return None
+
+    @staticmethod
+    def _keep_diff(store: DiffCache, diff: EncodedDiff) -> None:
+        """Write a diff to the log or cache, warning rather than failing."""
+        try:
+            store.put(diff)
+        except OSError as e:
+            logger.warning(f"Could not store diff: {e}")
+
+    def record_heartbeat(self, snapshot: Snapshot) -> None:
+        """
+        Record that a scrape found the same jobs as the latest snapshot.
+        
+        Appends one line to the heartbeat log instead of writing another
+        full snapshot file.
+        
+        Args:
+            snapshot: The (unchanged) snapshot that was scraped
+        """
+        entry = {
+            "timestamp": snapshot.timestamp.isoformat(),
+            "content_digest": snapshot.content_digest,
+            "total_count": snapshot.total_count,
+            "scrape_duration_seconds": snapshot.scrape_duration_seconds,
+            "source_url": snapshot.source_url,
+        }
+        with open(self.base_dir / HEARTBEAT_FILENAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        logger.info(f"Recorded unchanged heartbeat ({snapshot.total_count} jobs)")
+
+    def load_heartbeats(self) -> list[dict]:
+        """
+        Load the heartbeat log.
+        
+        Returns:
+            Heartbeat entries, oldest first
+        """
+        path = self.base_dir / HEARTBEAT_FILENAME
+        if not path.exists():
+            return []
+
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def _prune_heartbeats(self, cutoff: datetime) -> int:
+        """
+        Drop heartbeat log entries older than a cutoff.
+        
+        Unreadable entries, which load_heartbeats() skips, are dropped too.
+        
+        Args:
+            cutoff: Oldest heartbeat time to keep (naive local time)
+            
+        Returns:
+            Number of entries removed
+        """
+        path = self.base_dir / HEARTBEAT_FILENAME
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Could not read heartbeats to prune: {e}")
+            return 0
+
+        kept = []
+        for line in lines:
+            timestamp = _heartbeat_time(line)
+            if timestamp is not None and timestamp >= cutoff:
+                kept.append(line)
+        removed = len(lines) - len(kept)
+        if not removed:
+            return 0
+        try:
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_text("".join(kept), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not prune heartbeats: {e}")
+            return 0
+        logger.debug(f"Pruned {removed} old heartbeats")
+        return removed
 
     def prune_old_snapshots(
         self,
@@ -140,6 +579,11 @@ class SnapshotStore:
         """
         Remove old snapshots based on age or count limits.
         
+        Deltas kept while the snapshot they are based on is removed are
+        rewritten as keyframes first. Deltas that can't be rebuilt because
+        their chain is already broken are removed too. Heartbeats older than
+        the age limit are dropped from the heartbeat log.
+        
         Args:
             days: Remove snapshots older than this many days (None = use config)
             max_count: Keep at most this many snapshots (None = use config)
@@ -160,6 +604,7 @@ class SnapshotStore:
                 timestamp = self._parse_timestamp_from_filename(filepath.name)
                 if timestamp and timestamp < cutoff:
                     to_delete.append(filepath)
+            self._prune_heartbeats(cutoff)
 
         # Check count limit
         if max_count > 0 and len(all_files) > max_count:
@@ -169,46 +614,156 @@ class SnapshotStore:
         # Remove duplicates
         to_delete = list(set(to_delete))
 
+        # Keep the delta chains of the remaining snapshots intact, oldest first
+        doomed = {
+            self._get_filename(self._parse_timestamp_from_filename(path.name))
+            for path in to_delete
+        }
+        loaded: dict[str, dict] = {}
+        for entry in reversed(self.manifest.entries()):
+            key = self._get_filename(entry.timestamp)
+            if key in doomed:
+                continue
+            if self._find_file(entry.timestamp) is None:
+                # Deleted from the directory without the store
+                doomed.add(key)
+                to_delete.append(self.base_dir / entry.filename)
+                continue
+            if entry.base is None or self._get_filename(entry.base) not in doomed:
+                continue
+            try:
+                self._rewrite_as_keyframe(entry, loaded)
+            except Exception as e:
+                logger.warning(f"Removing snapshot {entry.filename} with a broken delta chain: {e}")
+                doomed.add(key)
+                to_delete.append(self.base_dir / entry.filename)
+
         # Delete files
         deleted = 0
+        gone = []
         for filepath in to_delete:
             try:
                 filepath.unlink()
                 deleted += 1
+                gone.append(filepath.name)
                 logger.debug(f"Deleted old snapshot: {filepath.name}")
+            except FileNotFoundError:
+                gone.append(filepath.name)
             except Exception as e:
                 logger.warning(f"Failed to delete {filepath}: {e}")
 
+        if gone:
+            self.manifest.remove(gone)
+            self.manifest.compact()
         if deleted > 0:
             logger.info(f"Pruned {deleted} old snapshots")
 
         return deleted
 
-    def export_to_csv(self, snapshot: Snapshot, output_path: Path) -> None:
+    def _rewrite_as_keyframe(self, entry: ManifestEntry, loaded: dict[str, dict]) -> None:
+        """
+        Replace a delta with a keyframe of the same snapshot.
+        
+        Args:
+            entry: Manifest entry of the delta
+            loaded: Snapshots rebuilt so far (see _read_data())
+        """
+        data = self._read_data(entry.timestamp, loaded)
+        filepath = self.base_dir / (self._get_filename(entry.timestamp) + self._suffix)
+        self._write_file(filepath, _keyframe_data(data), indent=2)
+        (self.base_dir / entry.filename).unlink(missing_ok=True)
+        self.manifest.remove([entry.filename])
+        self.manifest.add(
+            entry.model_copy(
+                update={
+                    "filename": filepath.name,
+                    "size_bytes": filepath.stat().st_size,
+                    "base": None,
+                }
+            )
+        )
+        logger.debug(f"Rewrote {entry.filename} as a keyframe")
+
+    def _find_file(self, timestamp: datetime) -> Path | None:
+        """Get the keyframe or delta file of a snapshot, if it exists."""
+        return next(self._snapshot_files(timestamp), None)
+
+    def _snapshot_files(self, timestamp: datetime) -> Iterator[Path]:
+        """Existing keyframe and delta files of a snapshot, in any codec."""
+        suffixes = [self._suffix, *(s for s in CODEC_SUFFIXES.values() if s != self._suffix)]
+        for filename in (self._get_filename(timestamp), self._get_delta_filename(timestamp)):
+            for suffix in suffixes:
+                filepath = self.base_dir / (filename + suffix)
+                if filepath.exists():
+                    yield filepath
+
+    def _read_data(self, timestamp: datetime, loaded: dict[str, dict]) -> dict:
+        """
+        Read a snapshot's full stored data, replaying deltas from its keyframe.
+        
+        Args:
+            timestamp: Timestamp of the snapshot
+            loaded: Snapshots already rebuilt, by keyframe file name. Updated
+                with every snapshot rebuilt along the way.
+            
+        Returns:
+            Stored data, as in a keyframe file
+            
+        Raises:
+            FileNotFoundError: If the snapshot or one it is based on is missing
+            ValueError: If a delta isn't based on an earlier snapshot
+        """
+        chain = []
+        key = self._get_filename(timestamp)
+        while key not in loaded:
+            filepath = self._find_file(timestamp)
+            if filepath is None:
+                raise FileNotFoundError(f"No stored snapshot {key}")
+            data = read_snapshot_file(filepath)
+            if not is_delta(data):
+                loaded[key] = data
+                break
+            chain.append((key, data))
+            timestamp = parse_datetime(data["base"])
+            base_key = self._get_filename(timestamp)
+            if base_key >= key:
+                raise ValueError(f"Delta {filepath.name} isn't based on an earlier snapshot")
+            key = base_key
+
+        data = loaded[key]
+        for delta_key, delta in reversed(chain):
+            data = apply_delta(data, delta)
+            loaded[delta_key] = data
+        return data
+
+    def export_to_csv(self, snapshot: Snapshot | ColumnarSnapshot, output_path: Path) -> None:
         """
         Export a snapshot to CSV format.
         
         Args:
-            snapshot: Snapshot to export
+            snapshot: Snapshot to export (regular or columnar)
             output_path: Where to save the CSV
         """
         import csv
 
+        if isinstance(snapshot, ColumnarSnapshot):
+            count = len(snapshot)
+            rows = snapshot.iter_rows()
+        else:
+            count = len(snapshot.jobs)
+            rows = (job.model_dump(mode="json") for job in snapshot.jobs)
+
         with open(output_path, "w", newline="", encoding="utf-8") as f:
-            if not snapshot.jobs:
+            if not count:
                 return
 
-            # Use all fields from the first job as headers
-            fieldnames = list(snapshot.jobs[0].model_dump().keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=list(Job.model_fields))
 
             writer.writeheader()
-            for job in snapshot.jobs:
-                # Convert job to dict, handling None values
-                row = job.model_dump(mode="json")
+            for row in rows:
                 writer.writerow(row)
 
-        logger.info(f"Exported {len(snapshot.jobs)} jobs to {output_path}")
+        logger.info(f"Exported {count} jobs to {output_path}")
 
     def export_to_json(self, snapshot: Snapshot, output_path: Path) -> None:
         """
@@ -232,6 +787,15 @@ class SnapshotStore:
         """
         return timestamp.strftime("snapshot_%Y-%m-%d_%H-%M-%S.json")
 
+    @staticmethod
+    def _get_delta_filename(timestamp: datetime) -> str:
+        """
+        Generate filename for a snapshot stored as a delta.
+        
+        Format: snapshot_YYYY-MM-DD_HH-MM-SS.delta.json
+        """
+        return timestamp.strftime(f"snapshot_%Y-%m-%d_%H-%M-%S{DELTA_SUFFIX}")
+
     @staticmethod
     def _parse_timestamp_from_filename(filename: str) -> datetime | None:
         """
@@ -244,8 +808,81 @@ class SnapshotStore:
             Datetime or None if parsing fails
         """
         try:
-            # Remove prefix and suffix
-            date_str = filename.replace("snapshot_", "").replace(".json", "")
+            # Remove prefix and suffixes
+            date_str = filename.replace("snapshot_", "").split(".", 1)[0]
             return datetime.strptime(date_str, "%Y-%m-%d_%H-%M-%S")
         except ValueError:
             return None
+
+
+def _keyframe_data(data: dict) -> dict:
+    """
+    Arrange a snapshot's stored data for a keyframe file.
+    
+    The metadata, including the job count, comes before the jobs, so it can
+    be read without decoding them (see read_snapshot_metadata()).
+    """
+    jobs = data["jobs"]
+    metadata = {key: value for key, value in data.items() if key not in ("jobs", "job_count")}
+    return {**metadata, "job_count": len(jobs), "jobs": jobs}
+
+
+def _snapshot_from_data(data: dict, shared_jobs: dict[tuple, Job]) -> Snapshot:
+    """
+    Build a snapshot from its stored JSON, reusing identical jobs.
+    
+    Jobs are frozen, so a job stored with exactly the same values in several
+    snapshots can be one shared object instead of a copy per snapshot.
+    
+    Args:
+        data: Decoded snapshot file
+        shared_jobs: Jobs already built, keyed by their stored values
+        
+    Returns:
+        Snapshot
+    """
+    jobs = []
+    for raw in data.get("jobs", []):
+        try:
+            key = tuple(raw.items())
+            job = shared_jobs.get(key)
+        except TypeError:
+            # Unhashable values (not written by this store) - just build it
+            key, job = None, None
+        if job is None:
+            job = Job(**raw)
+            if key is not None:
+                shared_jobs[key] = job
+        jobs.append(job)
+    return Snapshot(**{**data, "jobs": jobs})
+
+
+def _heartbeat_time(line: str) -> datetime | None:
+    """Naive local time of a heartbeat log line, or None if it's unreadable."""
+    try:
+        timestamp = parse_datetime(json.loads(line)["timestamp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    return timestamp.astimezone().replace(tzinfo=None) if timestamp.tzinfo else timestamp
+
+
+def get_snapshot_store(base_dir: Path | None = None) -> SnapshotStore:
+    """
+    Create the snapshot store selected by config.SNAPSHOT_BACKEND.
+    
+    Args:
+        base_dir: Directory to store snapshots (defaults to config.SNAPSHOT_DIR)
+        
+    Returns:
+        A SnapshotStore, or a SQLiteSnapshotStore for the "sqlite" backend
+        
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if config.SNAPSHOT_BACKEND == "files":
+        return SnapshotStore(base_dir)
+    if config.SNAPSHOT_BACKEND == "sqlite":
+        from sjs_jobwatch.storage.sqlite_store import SQLiteSnapshotStore
+
+        return SQLiteSnapshotStore(base_dir)
+    raise ValueError(f"Unknown snapshot backend: {config.SNAPSHOT_BACKEND}")
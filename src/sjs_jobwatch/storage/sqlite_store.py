@@ -0,0 +1,467 @@
+"""
+SQLite-backed snapshot storage.
+
+An alternative to the JSON files of SnapshotStore, with the same API, for
+deployments that want to query their history. Each distinct version of a
+job is stored once, in the job_versions table, keyed by a hash of its
+content; a snapshot is a row in the snapshots table plus one snapshot_jobs
+row per listed job, pointing at its version. A job unchanged across a
+hundred snapshots is stored once, and questions such as "which Wellington
+jobs were open at time T" or "how did job 123 change" are answered from
+indexes without loading whole snapshots.
+
+The database runs in WAL mode, so readers (the CLI, alert runs) don't block
+the scraper's writes.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sjs_jobwatch.core import config
+from sjs_jobwatch.core.columnar import ColumnarSnapshot
+from sjs_jobwatch.core.interning import InternTable
+from sjs_jobwatch.core.models import Job, Snapshot, SnapshotHeader, parse_datetime
+from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+SQLITE_FILENAME = "snapshots.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    timestamp TEXT NOT NULL,
+    total_count INTEGER NOT NULL,
+    scrape_duration_seconds REAL,
+    source_url TEXT NOT NULL,
+    content_digest TEXT NOT NULL,
+    job_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_versions (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL UNIQUE,
+    region TEXT,
+    category TEXT,
+    end_time REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_versions_job_id ON job_versions (job_id);
+CREATE INDEX IF NOT EXISTS job_versions_region ON job_versions (region);
+CREATE INDEX IF NOT EXISTS job_versions_category ON job_versions (category);
+CREATE TABLE IF NOT EXISTS snapshot_jobs (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    version_id INTEGER NOT NULL REFERENCES job_versions (id),
+    PRIMARY KEY (snapshot_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshot_jobs_version ON snapshot_jobs (version_id, snapshot_id);
+"""
+
+_HEADER_COLUMNS = "timestamp, total_count, scrape_duration_seconds, source_url, content_digest"
+
+
+class SQLiteSnapshotStore(SnapshotStore):
+    """
+    Snapshot storage in a SQLite database.
+
+    Diffs, the diff cache and log, heartbeats and exports work as in
+    SnapshotStore and keep their files next to the database.
+    """
+
+    def __init__(self, base_dir: Path | None = None, db_path: Path | None = None) -> None:
+        """
+        Initialize snapshot storage, creating the database if needed.
+
+        Args:
+            base_dir: Directory for the database and diff caches (defaults
+                to config.SNAPSHOT_DIR)
+            db_path: Database file (defaults to snapshots.db in base_dir)
+        """
+        super().__init__(base_dir, keyframe_interval=1)
+        self.db_path = db_path or self.base_dir / SQLITE_FILENAME
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def save(self, snapshot: Snapshot) -> Path:
+        """
+        Save a snapshot, replacing any snapshot taken in the same second.
+
+        Only job versions not already stored are written.
+
+        Args:
+            snapshot: Snapshot to save
+
+        Returns:
+            Path of the database
+        """
+        data = snapshot.model_dump(mode="json")
+        versions = [_version_row(raw, job) for raw, job in zip(data["jobs"], snapshot.jobs)]
+
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM snapshots WHERE key = ?", (self._key(snapshot.timestamp),)
+                )
+                cursor = self._conn.execute(
+                    f"INSERT INTO snapshots (key, {_HEADER_COLUMNS}, job_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self._key(snapshot.timestamp),
+                        data["timestamp"],
+                        snapshot.total_count,
+                        snapshot.scrape_duration_seconds,
+                        snapshot.source_url,
+                        snapshot.content_digest,
+                        len(snapshot.jobs),
+                    ),
+                )
+                snapshot_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO job_versions "
+                    "(job_id, content_hash, region, category, end_time, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    versions,
+                )
+                self._conn.executemany(
+                    "INSERT INTO snapshot_jobs (snapshot_id, position, version_id) "
+                    "SELECT ?, ?, id FROM job_versions WHERE content_hash = ?",
+                    (
+                        (snapshot_id, position, version[1])
+                        for position, version in enumerate(versions)
+                    ),
+                )
+        except sqlite3.Error as e:
+            raise OSError(f"Failed to save snapshot: {e}") from e
+
+        logger.info(f"Saved snapshot with {len(snapshot.jobs)} jobs to {self.db_path}")
+        return self.db_path
+
+    def load(self, timestamp: datetime) -> Snapshot | None:
+        """
+        Load a specific snapshot by timestamp.
+
+        Args:
+            timestamp: Timestamp of snapshot to load
+
+        Returns:
+            Snapshot or None if not found
+        """
+        try:
+            return Snapshot(**self._read_data(timestamp, {}))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load snapshot {timestamp} from {self.db_path}: {e}")
+            return None
+
+    def load_latest(self, n: int = 1) -> list[Snapshot]:
+        """
+        Load the most recent N snapshots.
+
+        A job version listed in several of them is built once and shared.
+
+        Args:
+            n: Number of snapshots to load
+
+        Returns:
+            List of snapshots (newest first)
+        """
+        shared_jobs: dict[int, Job] = {}
+
+        snapshots = []
+        for snapshot_id, metadata in self._latest_rows(n):
+            jobs = []
+            for version_id, text in self._conn.execute(
+                "SELECT v.id, v.data FROM snapshot_jobs sj "
+                "JOIN job_versions v ON v.id = sj.version_id "
+                "WHERE sj.snapshot_id = ? ORDER BY sj.position",
+                (snapshot_id,),
+            ):
+                job = shared_jobs.get(version_id)
+                if job is None:
+                    job = shared_jobs[version_id] = Job(**json.loads(text))
+                jobs.append(job)
+            try:
+                snapshots.append(Snapshot(**metadata, jobs=jobs))
+            except Exception as e:
+                logger.warning(f"Failed to load snapshot {metadata['timestamp']}: {e}")
+
+        return snapshots
+
+    def load_latest_columnar(self, n: int = 1) -> list[ColumnarSnapshot]:
+        """
+        Load the most recent N snapshots in columnar form.
+
+        Args:
+            n: Number of snapshots to load
+
+        Returns:
+            List of columnar snapshots (newest first)
+        """
+        strings = InternTable()
+
+        snapshots = []
+        for snapshot_id, metadata in self._latest_rows(n):
+            data = {**metadata, "jobs": self._read_jobs(snapshot_id)}
+            snapshots.append(ColumnarSnapshot.from_records(data, strings))
+        return snapshots
+
+    def list_snapshots(self) -> list[Path]:
+        """Snapshots live in the database, so there are no snapshot files to list."""
+        return []
+
+    def count(self) -> int:
+        """Get total number of snapshots stored."""
+        return self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def load_headers(self, n: int = 1) -> list[SnapshotHeader]:
+        """
+        Load the metadata of the most recent N snapshots, without their jobs.
+
+        Args:
+            n: Number of snapshots to read
+
+        Returns:
+            List of snapshot headers (newest first)
+        """
+        rows = self._conn.execute(
+            f"SELECT {_HEADER_COLUMNS} FROM snapshots ORDER BY key DESC LIMIT ?", (n,)
+        )
+        return [SnapshotHeader(**_header_fields(row)) for row in rows]
+
+    def iter_headers(self) -> Iterator[SnapshotHeader]:
+        """
+        Iterate over the metadata of the stored snapshots, without their jobs.
+
+        Yields:
+            Snapshot headers, newest first
+        """
+        rows = self._conn.execute(f"SELECT {_HEADER_COLUMNS} FROM snapshots ORDER BY key DESC")
+        for row in rows:
+            yield SnapshotHeader(**_header_fields(row))
+
+    def load_header(self, timestamp: datetime) -> SnapshotHeader | None:
+        """
+        Load a snapshot's metadata by timestamp, without its jobs.
+
+        Args:
+            timestamp: Timestamp of the snapshot
+
+        Returns:
+            Snapshot header or None if not found
+        """
+        row = self._conn.execute(
+            f"SELECT {_HEADER_COLUMNS} FROM snapshots WHERE key = ?", (self._key(timestamp),)
+        ).fetchone()
+        return SnapshotHeader(**_header_fields(row)) if row is not None else None
+
+    def rebuild_index(self) -> int:
+        """The database is its own index; reports the number of snapshots."""
+        return self.count()
+
+    def find_jobs(
+        self,
+        at: datetime | None = None,
+        region: str | None = None,
+        category: str | None = None,
+    ) -> list[Job]:
+        """
+        Find the jobs that were open at a given time.
+
+        A job is open at a time if it was listed in the latest snapshot taken
+        by then and its closing date hadn't passed. Closing dates are compared
+        as instants, so they may use any UTC offset; naive times (``at``
+        included) are taken as local time, like the snapshot timestamps.
+
+        Args:
+            at: Time to look at (None = the latest snapshot)
+            region: Only jobs in this region
+            category: Only jobs in this category
+
+        Returns:
+            Matching jobs, in listing order
+        """
+        if at is None:
+            row = self._conn.execute("SELECT id FROM snapshots ORDER BY key DESC LIMIT 1")
+        else:
+            row = self._conn.execute(
+                "SELECT id FROM snapshots WHERE key <= ? ORDER BY key DESC LIMIT 1",
+                (self._key(_local(at)),),
+            )
+        found = row.fetchone()
+        if found is None:
+            return []
+
+        query = (
+            "SELECT v.data FROM snapshot_jobs sj JOIN job_versions v ON v.id = sj.version_id "
+            "WHERE sj.snapshot_id = ?"
+        )
+        params: list = [found[0]]
+        if region is not None:
+            query += " AND v.region = ?"
+            params.append(region)
+        if category is not None:
+            query += " AND v.category = ?"
+            params.append(category)
+        if at is not None:
+            query += " AND (v.end_time IS NULL OR v.end_time >= ?)"
+            params.append(_epoch_seconds(at))
+        query += " ORDER BY sj.position"
+
+        return [Job(**json.loads(text)) for (text,) in self._conn.execute(query, params)]
+
+    def job_history(self, job_id: str) -> list[tuple[datetime, Job]]:
+        """
+        Get every stored version of a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            (timestamp of the first snapshot listing the version, job) pairs,
+            oldest first
+        """
+        rows = self._conn.execute(
+            "SELECT MIN(s.key), MIN(s.timestamp), v.data FROM job_versions v "
+            "JOIN snapshot_jobs sj ON sj.version_id = v.id "
+            "JOIN snapshots s ON s.id = sj.snapshot_id "
+            "WHERE v.job_id = ? GROUP BY v.id ORDER BY 1",
+            (job_id,),
+        )
+        return [
+            (parse_datetime(timestamp), Job(**json.loads(text)))
+            for _, timestamp, text in rows
+        ]
+
+    def prune_old_snapshots(
+        self,
+        days: int | None = None,
+        max_count: int | None = None,
+    ) -> int:
+        """
+        Remove old snapshots based on age or count limits.
+
+        Job versions no longer listed in any snapshot are removed with them,
+        and heartbeats older than the age limit from the heartbeat log.
+
+        Args:
+            days: Remove snapshots older than this many days (None = use config)
+            max_count: Keep at most this many snapshots (None = use config)
+
+        Returns:
+            Number of snapshots deleted
+        """
+        days = days if days is not None else config.SNAPSHOT_RETENTION_DAYS
+        max_count = max_count if max_count is not None else config.MAX_SNAPSHOTS
+
+        with self._conn:
+            deleted = 0
+            if days > 0:
+                cutoff = datetime.now() - timedelta(days=days)
+                deleted += self._conn.execute(
+                    "DELETE FROM snapshots WHERE key < ?", (self._key(cutoff),)
+                ).rowcount
+                self._prune_heartbeats(cutoff)
+            if max_count > 0:
+                deleted += self._conn.execute(
+                    "DELETE FROM snapshots WHERE id NOT IN "
+                    "(SELECT id FROM snapshots ORDER BY key DESC LIMIT ?)",
+                    (max_count,),
+                ).rowcount
+            if deleted:
+                self._conn.execute(
+                    "DELETE FROM job_versions WHERE id NOT IN "
+                    "(SELECT version_id FROM snapshot_jobs)"
+                )
+
+        if deleted > 0:
+            logger.info(f"Pruned {deleted} old snapshots")
+        return deleted
+
+    def _read_data(self, timestamp: datetime, loaded: dict[str, dict]) -> dict:
+        """
+        Read a snapshot's stored data.
+
+        Args:
+            timestamp: Timestamp of the snapshot
+            loaded: Snapshots already read, by key
+
+        Returns:
+            Stored data, as in a snapshot file
+
+        Raises:
+            FileNotFoundError: If there is no such snapshot
+        """
+        key = self._key(timestamp)
+        if key not in loaded:
+            row = self._conn.execute(
+                f"SELECT id, {_HEADER_COLUMNS} FROM snapshots WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"No stored snapshot {key}")
+            loaded[key] = {**_header_fields(row[1:]), "jobs": self._read_jobs(row[0])}
+        return loaded[key]
+
+    def _latest_rows(self, n: int) -> list[tuple[int, dict]]:
+        """IDs and metadata of the most recent N snapshots, newest first."""
+        rows = self._conn.execute(
+            f"SELECT id, {_HEADER_COLUMNS} FROM snapshots ORDER BY key DESC LIMIT ?", (n,)
+        ).fetchall()
+        return [(row[0], _header_fields(row[1:])) for row in rows]
+
+    def _read_jobs(self, snapshot_id: int) -> list[dict]:
+        """Stored data of a snapshot's jobs, in listing order."""
+        rows = self._conn.execute(
+            "SELECT v.data FROM snapshot_jobs sj JOIN job_versions v ON v.id = sj.version_id "
+            "WHERE sj.snapshot_id = ? ORDER BY sj.position",
+            (snapshot_id,),
+        )
+        return [json.loads(text) for (text,) in rows]
+
+    @staticmethod
+    def _key(timestamp: datetime) -> str:
+        """Sortable key of a snapshot, to the second like snapshot file names."""
+        return timestamp.strftime("%Y-%m-%d_%H-%M-%S")
+
+
+def _version_row(raw: dict, job: Job) -> tuple:
+    """Row of the job_versions table for a job and its stored data."""
+    text = json.dumps(raw, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    content_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    return (
+        raw["id"],
+        content_hash,
+        raw.get("region"),
+        raw.get("category"),
+        _epoch_seconds(job.end_date),
+        text,
+    )
+
+
+def _epoch_seconds(value: datetime | None) -> float | None:
+    """POSIX timestamp of a datetime (naive values are local time)."""
+    return value.timestamp() if value is not None else None
+
+
+def _local(value: datetime) -> datetime:
+    """Naive local time of a datetime, to match snapshot keys."""
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def _header_fields(row: tuple) -> dict:
+    """Snapshot metadata from the header columns of a snapshots row."""
+    return dict(zip(_HEADER_COLUMNS.split(", "), row))
@@ -385,6 +385,1821 @@ def test_no_circular_imports():
     print("  ✓ No circular imports detected")
 
 
+def _next_data_page(page_props):
+    """Build a minimal SJS-style HTML page embedding page_props as __NEXT_DATA__."""
+    import json
+
+    payload = json.dumps({"props": {"pageProps": page_props}})
+    return (
+        "<html><head><title>Jobs</title></head><body><div id='__next'></div>"
+        f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+        "</body></html>"
+    ).encode("utf-8")
+
+
+class _FakeResponse:
+    """Stand-in for requests.Response serving canned content."""
+
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class _FakeSession:
+    """Stand-in for requests.Session that serves pages keyed by URL."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.requested.append(url)
+        return _FakeResponse(self.pages[url])
+
+
+def test_paginated_scrape():
+    """Test multi-page scraping merges pages and de-duplicates jobs."""
+    print("Testing paginated scrape...")
+
+    from sjs_jobwatch.ingestion.scraper import SJSScraper
+
+    base = "https://example.test/jobs/search/"
+
+    def raw(job_id):
+        return {"jobId": job_id, "title": f"Job {job_id}", "businessName": "Agency"}
+
+    pages = {
+        base: _next_data_page(
+            {"searchResults": {"results": [raw(1), raw(2)], "totalResults": 5, "pageSize": 2}}
+        ),
+        f"{base}?page=2": _next_data_page({"searchResults": {"results": [raw(2), raw(3)]}}),
+        f"{base}?page=3": _next_data_page({"searchResults": {"results": [raw(4), raw(5)]}}),
+    }
+
+    scraper = SJSScraper(delay=0, max_workers=2)
+    scraper.session = _FakeSession(pages)
+
+    first_only = scraper.scrape(url=base)
+    assert [job.id for job in first_only.jobs] == ["1", "2"]
+
+    snapshot = scraper.scrape(url=base, all_pages=True)
+    assert [job.id for job in snapshot.jobs] == ["1", "2", "3", "4", "5"]
+    assert snapshot.total_count == 5
+
+    print("  ✓ Paginated scrape OK")
+
+
+def test_token_bucket():
+    """Test token bucket allows bursts and then paces requests."""
+    print("Testing token bucket...")
+
+    from sjs_jobwatch.ingestion.ratelimit import TokenBucket, get_host_limiter
+
+    now = [0.0]
+    slept = []
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=lambda: now[0], sleep=fake_sleep)
+
+    # Burst of three goes straight through
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    # Fourth waits for one token at 2/s
+    assert abs(bucket.acquire() - 0.5) < 1e-9
+    assert slept == [0.5]
+
+    # Idle time refills the bucket
+    now[0] += 10
+    assert bucket.acquire() == 0.0
+
+    # Limiters are shared per host
+    assert get_host_limiter("https://a.test/x") is get_host_limiter("https://a.test/y")
+    assert get_host_limiter("https://a.test/x") is not get_host_limiter("https://b.test/x")
+
+    print("  ✓ Token bucket OK")
+
+
+def test_next_data_extraction():
+    """Test fast and soup __NEXT_DATA__ extraction agree."""
+    print("Testing __NEXT_DATA__ extraction...")
+
+    import json
+
+    from sjs_jobwatch.ingestion.nextdata import EXTRACTORS, load_next_data
+
+    page = _next_data_page({"results": [{"jobId": 1, "title": "A & B", "businessName": "X"}]})
+    decoded = [json.loads(extract(page)) for extract in EXTRACTORS.values()]
+    assert all(data == decoded[0] for data in decoded)
+    assert decoded[0]["props"]["pageProps"]["results"][0]["title"] == "A & B"
+
+    # Unusual attribute order still works via the fallback pattern
+    odd = b"<script type='application/json' id='__NEXT_DATA__'>{\"a\": 1}</script>"
+    assert load_next_data(odd, "fast") == {"a": 1}
+
+    try:
+        load_next_data(b"<html></html>", "fast")
+        assert False, "Should have raised for missing payload"
+    except ValueError:
+        pass
+
+    print("  ✓ __NEXT_DATA__ extraction OK")
+
+
+def test_conditional_scrape():
+    """Test conditional requests skip parsing when the board is unchanged."""
+    print("Testing conditional scrape...")
+
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.ingestion.http_cache import ResponseCache
+    from sjs_jobwatch.ingestion.scraper import SJSScraper
+
+    url = "https://example.test/jobs/search/"
+    page = _next_data_page({"results": [{"jobId": 1, "title": "Dev", "businessName": "X"}]})
+
+    class ConditionalSession(_FakeSession):
+        def get(self, url, timeout=None, headers=None):
+            self.requested.append(url)
+            if headers and headers.get("If-None-Match") == '"v1"':
+                return _FakeResponse(b"", status_code=304)
+            return _FakeResponse(self.pages[url], headers={"ETag": '"v1"'})
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        scraper = SJSScraper(delay=0, cache=ResponseCache(temp_dir))
+        scraper.session = ConditionalSession({url: page})
+
+        # First fetch populates the cache once the caller commits it
+        first = scraper.scrape_if_changed(url=url)
+        assert first is not None and len(first.jobs) == 1
+        scraper.cache.commit()
+
+        # 304 -> nothing changed
+        assert scraper.scrape_if_changed(url=url) is None
+
+        # Plain scrape still builds a snapshot from the cached body
+        assert len(scraper.scrape(url=url).jobs) == 1
+
+        # Byte-identical body without validators also counts as unchanged
+        scraper.session = _FakeSession({url: page})
+        assert scraper.scrape_if_changed(url=url) is None
+
+        print("  ✓ Conditional scrape OK")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_conditional_scrape_partial_failure():
+    """Test a failed or uncommitted scrape doesn't mark its pages as unchanged."""
+    print("Testing conditional scrape after a partial failure...")
+
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.ingestion.http_cache import ResponseCache
+    from sjs_jobwatch.ingestion.scraper import ScrapeError, SJSScraper
+
+    base = "https://example.test/jobs/search/"
+    pages = {
+        base: _next_data_page(
+            {
+                "searchResults": {
+                    "results": [{"jobId": 1, "title": "Dev", "businessName": "X"}],
+                    "totalResults": 2,
+                    "pageSize": 1,
+                }
+            }
+        ),
+        f"{base}?page=2": _next_data_page(
+            {"searchResults": {"results": [{"jobId": 2, "title": "Ops", "businessName": "Y"}]}}
+        ),
+    }
+
+    class FlakySession(_FakeSession):
+        failing = True
+
+        def get(self, url, timeout=None, headers=None):
+            self.requested.append(url)
+            if url.endswith("page=2") and self.failing:
+                return _FakeResponse(b"", status_code=503)
+            return _FakeResponse(self.pages[url])
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        scraper = SJSScraper(delay=0, max_workers=1, cache=ResponseCache(temp_dir))
+        scraper.session = FlakySession(pages)
+
+        # Page 2 fails: the page 1 body fetched on the way must not be kept
+        try:
+            scraper.scrape_if_changed(url=base, all_pages=True)
+            raise AssertionError("Expected ScrapeError")
+        except ScrapeError:
+            pass
+
+        scraper.session.failing = False
+        snapshot = scraper.scrape_if_changed(url=base, all_pages=True)
+        assert snapshot is not None and len(snapshot.jobs) == 2
+
+        # Saving failed, so the caller discards: the change is reported again
+        scraper.cache.discard()
+        snapshot = scraper.scrape_if_changed(url=base, all_pages=True)
+        assert snapshot is not None and len(snapshot.jobs) == 2
+
+        # Saved and committed: now the board counts as unchanged
+        scraper.cache.commit()
+        assert scraper.scrape_if_changed(url=base, all_pages=True) is None
+
+        print("  ✓ Conditional scrape partial failure OK")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_snapshot_digest():
+    """Test snapshot content digests and unchanged heartbeats."""
+    print("Testing snapshot digests...")
+
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    job1 = Job(id="1", title="Developer", employer="Agency A")
+    job2 = Job(id="2", title="Analyst", employer="Agency B")
+
+    def make(jobs, timestamp):
+        return Snapshot(timestamp=timestamp, jobs=jobs, total_count=len(jobs), source_url="test")
+
+    first = make([job1, job2], datetime(2024, 1, 1))
+    reordered = make([job2, job1], datetime(2024, 1, 2))
+    changed = make([job1], datetime(2024, 1, 3))
+
+    assert first.content_digest == reordered.content_digest
+    assert first.content_digest != changed.content_digest
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir)
+        assert store.latest_digest() is None
+
+        store.save(first)
+        assert store.latest_digest() == first.content_digest
+        assert store.load(first.timestamp).content_digest == first.content_digest
+
+        store.record_heartbeat(reordered)
+        heartbeats = store.load_heartbeats()
+        assert len(heartbeats) == 1
+        assert heartbeats[0]["content_digest"] == first.content_digest
+        assert store.count() == 1
+
+        # Heartbeats are pruned with the snapshots they confirm
+        recent = make([job2, job1], datetime.now())
+        store.record_heartbeat(recent)
+        store.prune_old_snapshots(days=30, max_count=0)
+        assert store.count() == 0
+        assert [h["timestamp"] for h in store.load_heartbeats()] == [recent.timestamp.isoformat()]
+
+        print("  ✓ Snapshot digests OK")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_streaming_parse():
+    """Test streaming parsing matches the regular parser."""
+    print("Testing streaming parse...")
+
+    from sjs_jobwatch.core.jsonstream import JsonArrayStream, iter_utf8_chunks
+    from sjs_jobwatch.ingestion.scraper import SJSScraper
+
+    document = '{"a": {"n": 2, "items": [1, [2], {"x": "é"}, 12345], "z": "end"}}'
+    for source in (document, iter_utf8_chunks(document.encode("utf-8"), chunk_size=3)):
+        stream = JsonArrayStream(source, ["a", "items"])
+        assert list(stream) == [1, [2], {"x": "é"}, 12345]
+        assert stream.found
+        assert stream.remainder == {"a": {"n": 2, "z": "end"}}
+        assert stream.prefix == {"n": 2}
+
+    raw = [{"jobId": i, "title": f"Job {i}", "businessName": "Agency"} for i in range(1, 6)]
+    raw.append({"jobId": 99})  # missing fields - skipped by both parsers
+    pages = [
+        _next_data_page({"searchResults": {"totalResults": 5, "results": raw}}),
+        _next_data_page({"jobs": raw}),  # not on the streamed path - falls back
+    ]
+
+    regular = SJSScraper(delay=0)
+    streaming = SJSScraper(delay=0, streaming=True)
+    for source, page in enumerate(pages):
+        jobs, _ = regular._read_page(page, str(source))
+        streamed, page_props = streaming._read_page(page, str(source))
+        assert streamed == jobs
+        assert len(streamed) == 5
+
+    # Metadata survives without the results array
+    _, page_props = streaming._read_page(pages[0], "0")
+    assert page_props == {"searchResults": {"totalResults": 5}}
+
+    print("  ✓ Streaming parse OK")
+
+
+def test_detail_fetcher():
+    """Test detail pages are only fetched for new or changed jobs."""
+    print("Testing detail fetcher...")
+
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.core import config
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.ingestion.details import DescriptionCache, DetailFetcher
+    from sjs_jobwatch.ingestion.scraper import SJSScraper
+
+    def detail(job_id):
+        return _next_data_page({"job": {"id": job_id, "description": f"About job {job_id}"}})
+
+    def snapshot(jobs):
+        return Snapshot(
+            timestamp=datetime.now(),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    pages = {config.get_job_url(str(i)): detail(i) for i in range(1, 4)}
+    previous = snapshot(
+        [
+            Job(id="1", title="Same", employer="A", description="Old 1"),
+            Job(id="2", title="Before", employer="A", description="Old 2"),
+        ]
+    )
+    current = snapshot(
+        [
+            Job(id="1", title="Same", employer="A"),
+            Job(id="2", title="After", employer="A"),
+            Job(id="3", title="New", employer="A"),
+        ]
+    )
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        scraper = SJSScraper(delay=0)
+        scraper.session = _FakeSession(pages)
+        cache = DescriptionCache(temp_dir / "descriptions.json")
+        fetcher = DetailFetcher(scraper, cache)
+
+        enriched = fetcher.enrich(current, previous)
+        descriptions = {job.id: job.description for job in enriched.jobs}
+        assert descriptions == {"1": "Old 1", "2": "About job 2", "3": "About job 3"}
+        assert sorted(scraper.session.requested) == [
+            config.get_job_url("2"),
+            config.get_job_url("3"),
+        ]
+        assert enriched.content_digest != current.content_digest
+
+        # Warm run: everything comes from the persisted cache
+        scraper.session = _FakeSession(pages)
+        fetcher = DetailFetcher(scraper, DescriptionCache(temp_dir / "descriptions.json"))
+        again = fetcher.enrich(current, previous)
+        assert scraper.session.requested == []
+        assert again.content_digest == enriched.content_digest
+
+        # Jobs that already have descriptions are kept as they are
+        assert fetcher.enrich(enriched, previous) is enriched
+        partial = snapshot([enriched.jobs[0], current.jobs[1]])
+        filled = fetcher.enrich(partial, previous)
+        assert filled.jobs[0] is enriched.jobs[0]
+        assert filled.content_digest == snapshot(filled.jobs).content_digest
+
+        print("  ✓ Detail fetcher OK")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_job_builder():
+    """Test trusted bulk job construction matches full validation."""
+    print("Testing job builder...")
+
+    from sjs_jobwatch.ingestion.jobbuilder import JobBuilder, construct_trusted, normalize_job
+
+    raw = [
+        {
+            "jobId": i,
+            "title": f" Job {i} ",
+            "businessName": "Agency",
+            "regionName": "Wellington",
+            "payMin": "50000",
+            "payMax": 60000,
+            "closingDate": "2024-06-01T17:00:00Z",
+        }
+        for i in range(1, 21)
+    ]
+    raw += [
+        {"jobId": 90, "title": "   ", "businessName": "Agency"},  # blank title
+        {"jobId": 91, "title": "Pay", "businessName": "A", "payMin": 10, "payMax": 5},
+        {"jobId": 92, "title": "Neg", "businessName": "A", "payMin": -1},
+        {"jobId": 93, "title": "Type", "businessName": "A", "category": {"id": 4}},
+    ]
+
+    strict = list(JobBuilder(sample_rate=1.0).build(raw))
+    trusted = list(JobBuilder(sample_rate=0.0).build(raw))
+    sampled = list(JobBuilder(sample_rate=0.5, seed=1).build(raw))
+    assert len(strict) == 20
+    assert trusted == strict
+    assert sampled == strict
+    assert trusted[0].model_dump_json() == strict[0].model_dump_json()
+    assert trusted[0].title == "Job 1"
+
+    # Trusted jobs behave like validated ones
+    try:
+        trusted[0].title = "Changed"
+        assert False, "Should have raised"
+    except Exception:
+        pass
+    assert trusted[0].model_copy(update={"title": "Other"}).title == "Other"
+
+    # Rows the normalizer lets through but the model rejects count as drift.
+    # When sampled they are kept just as if they hadn't been; strict mode
+    # skips them.
+    fields = normalize_job(raw[0])
+    fields["pay_min"] = -5.0
+    builder = JobBuilder(sample_rate=0.5)
+    assert builder._validate(dict(fields)) == construct_trusted(dict(fields))
+    assert builder.drift_count == 1
+    builder = JobBuilder(sample_rate=1.0)
+    assert builder._validate(dict(fields)) is None
+    assert builder.drift_count == 1
+
+    # Sampling is reproducible by default
+    assert JobBuilder(sample_rate=0.5)._random.random() == JobBuilder(0.5)._random.random()
+
+    print("  ✓ Job builder OK")
+
+
+def test_fixture_replay():
+    """Test recorded responses replay from the local fixture server."""
+    print("Testing fixture replay...")
+
+    import shutil
+    import tempfile
+
+    import requests
+
+    from sjs_jobwatch.ingestion.fixtures import FixtureServer, FixtureStore, RecordingSession
+    from sjs_jobwatch.ingestion.scraper import SJSScraper
+
+    live = "https://www.sjs.govt.nz/jobs/search/"
+    raw = [{"jobId": i, "title": f"Job {i}", "businessName": "Agency"} for i in range(1, 5)]
+    pages = {
+        live: _next_data_page({"searchResults": {"totalPages": 2, "results": raw[:2]}}),
+        live + "?page=2": _next_data_page({"searchResults": {"results": raw[2:]}}),
+    }
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        # Record a scrape against the fake live site
+        store = FixtureStore(temp_dir)
+        scraper = SJSScraper(delay=0)
+        scraper.session = RecordingSession(_FakeSession(pages), store)
+        recorded = scraper.scrape(url=live, all_pages=True)
+        assert len(store) == 2
+        assert sorted(store.paths()) == ["/jobs/search/", "/jobs/search/?page=2"]
+
+        # Replay it over real HTTP
+        with FixtureServer(store) as server:
+            replayed = SJSScraper(delay=0).scrape(
+                url=server.url_for("/jobs/search/"), all_pages=True
+            )
+            assert replayed.content_digest == recorded.content_digest
+            assert server.request_count == 2
+            assert requests.get(server.url_for("/missing")).status_code == 404
+
+        # Injected errors carry Retry-After
+        with FixtureServer(store, error_rate=1.0, error_statuses=[503], seed=1) as server:
+            response = requests.get(server.url_for("/jobs/search/"))
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+            assert server.error_count == 1
+
+        print("  ✓ Fixture replay OK")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_result_path_resolver():
+    """Test job results are found, remembered and re-found after a shape change."""
+    print("Testing result path resolver...")
+
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.ingestion.resultpath import ResultPathResolver, find_result_path
+    from sjs_jobwatch.ingestion.scraper import ScrapeError, SJSScraper
+
+    raw = [{"jobId": i, "title": f"Job {i}", "businessName": "Agency"} for i in range(1, 4)]
+    nested = {
+        "filters": [{"id": 1, "name": "Region"}],
+        "data": {"search": {"featured": raw[:1], "listings": raw}},
+    }
+    assert find_result_path(nested) == ["data", "search", "listings"]
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        cache_file = temp_dir / "result_paths.json"
+        resolver = ResultPathResolver(cache_file)
+        assert resolver.resolve(nested, "sjs/jobs") == raw
+        assert resolver.cached_path("sjs/jobs") == ["data", "search", "listings"]
+
+        # Persisted for the next run
+        reloaded = ResultPathResolver(cache_file)
+        assert reloaded.cached_path("sjs/jobs") == ["data", "search", "listings"]
+
+        # Cached path still valid: an empty result list is a real answer
+        empty = {"data": {"search": {"featured": [], "listings": []}}}
+        assert reloaded.resolve(empty, "sjs/jobs") == []
+
+        # ...unless the jobs are now somewhere else, for cached and default paths
+        stale = {"data": {"search": {"listings": []}}, "results": {"items": raw}}
+        assert reloaded.resolve(stale, "sjs/jobs") == raw
+        assert reloaded.cached_path("sjs/jobs") == ["results", "items"]
+        fresh = ResultPathResolver()
+        assert fresh.resolve({"searchResults": {"results": []}}, "sjs/new") == []
+        assert fresh.cached_path("sjs/new") is None
+        stale = {"searchResults": {"results": []}, "data": {"jobs": raw}}
+        assert fresh.resolve(stale, "sjs/new") == raw
+        assert fresh.cached_path("sjs/new") == ["data", "jobs"]
+
+        # Shape changed: recover and remember the new location
+        moved = {"searchResults": {"results": raw}, "data": {"search": {"listings": [1, 2]}}}
+        assert reloaded.resolve(moved, "sjs/jobs") == raw
+        assert reloaded.cached_path("sjs/jobs") == ["searchResults", "results"]
+    finally:
+        shutil.rmtree(temp_dir)
+
+    # No results anywhere is an error, not an empty board
+    scraper = SJSScraper(delay=0)
+    try:
+        scraper._read_page(_next_data_page({"message": "maintenance"}))
+        assert False, "Should have raised"
+    except ScrapeError:
+        pass
+
+    print("  ✓ Result path resolver OK")
+
+
+def test_interning():
+    """Test repeated categorical values and unchanged jobs share objects."""
+    print("Testing interning...")
+
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.core.interning import InternTable
+    from sjs_jobwatch.core.models import Job, Region, Snapshot
+    from sjs_jobwatch.ingestion.jobbuilder import JobBuilder
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    table = InternTable(["Wellington"])
+    assert table.encode(None) == 0
+    code = table.encode("Auckland")
+    assert table.encode("".join(["Auck", "land"])) == code
+    assert table.decode(code) == "Auckland"
+    assert table.lookup("Otago") is None
+    assert table.intern("".join(["Wel", "lington"])) is table.decode(1)
+
+    # A full table stops sharing new values but keeps the ones it has
+    capped = InternTable(["Wellington"], max_size=1)
+    otago = "".join(["Ota", "go"])
+    assert capped.intern(otago) is otago and capped.intern("Otago") is not otago
+    assert capped.intern("".join(["Wel", "lington"])) is capped.decode(1)
+    assert len(capped) == 1
+
+    # Validated and trusted jobs both end up with shared strings
+    area = "".join(["Te ", "Aro"])
+    job_a = Job(id="1", title="A", employer="Agency", area=area, region="Wellington")
+    job_b = Job(id="2", title="B", employer="Agency", area="".join(["Te ", "A", "ro"]))
+    assert job_a.area is job_b.area
+    assert job_a.region is Region.WELLINGTON.value
+    raw = {"jobId": 3, "title": "C", "businessName": "".join(["Age", "ncy"])}
+    (job_c,) = JobBuilder(sample_rate=0.0).build([raw])
+    assert job_c.employer is job_a.employer
+
+    # Unchanged jobs are shared between loaded snapshots
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir)
+        for day, jobs in ((1, [job_a, job_b]), (2, [job_a, job_c])):
+            store.save(
+                Snapshot(
+                    timestamp=datetime(2024, 1, day),
+                    jobs=jobs,
+                    total_count=len(jobs),
+                    source_url="https://example.test/",
+                )
+            )
+        newest, oldest = store.load_latest(n=2)
+        assert newest.jobs[0] is oldest.jobs[0]
+        assert newest.jobs[0] == job_a
+        assert newest.jobs[1] == job_c
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Interning OK")
+
+
+def test_columnar_snapshot():
+    """Test columnar snapshots round-trip, filter, count and diff like Snapshot."""
+    print("Testing columnar snapshot...")
+
+    import shutil
+    import tempfile
+    from datetime import timezone
+
+    from sjs_jobwatch.core.columnar import ColumnarSnapshot, diff_columnar
+    from sjs_jobwatch.core.diff import diff_snapshots
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    def snapshot(jobs, day):
+        return Snapshot(
+            timestamp=datetime(2024, 1, day),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    closing = datetime(2024, 6, 1, 17, 0, 0, 123, tzinfo=timezone.utc)
+    jobs = [
+        Job(id="1", title="Dev", employer="A", region="Wellington", category="ICT",
+            pay_min=80000, pay_max=100000, end_date=closing),
+        Job(id="2", title="Nurse", employer="B", region="Auckland", category="Health",
+            pay_min=60000, posted_date=datetime(2024, 5, 1, 9, 0)),
+        Job(id="3", title="Analyst", employer="A", region="Wellington", category="Policy"),
+    ]
+    previous = snapshot(jobs, 1)
+    columns = ColumnarSnapshot.from_snapshot(previous)
+
+    # Lossless round trip, including the content digest
+    restored = columns.to_snapshot()
+    assert restored.jobs == previous.jobs
+    assert restored.content_digest == previous.content_digest
+    assert restored.jobs[0].end_date == closing
+    assert restored.jobs[1].posted_date.tzinfo is None
+    assert list(columns.iter_rows()) == [job.model_dump(mode="json") for job in jobs]
+    # Built from stored JSON too, where UTC datetimes end in "Z"
+    stored = previous.model_dump(mode="json")
+    assert stored["jobs"][0]["end_date"].endswith("Z")
+    assert ColumnarSnapshot.from_records(stored).to_snapshot().jobs == previous.jobs
+
+    # Filtering and counting
+    assert columns.select(region="Wellington") == [0, 2]
+    assert columns.select(region="Wellington", min_pay=90000) == [0]
+    assert columns.select(max_pay=70000) == [1]
+    assert columns.select(region="Otago") == []
+    assert columns.filter(category="ICT").ids == ["1"]
+    assert columns.count_by("employer") == {"A": 2, "B": 1}
+
+    # Diff matches the regular diff
+    current = snapshot(
+        [jobs[0], jobs[1].model_copy(update={"pay_max": 70000.0}),
+         Job(id="4", title="Chef", employer="C")],
+        2,
+    )
+    expected = diff_snapshots(previous, current)
+    result = diff_columnar(columns, ColumnarSnapshot.from_snapshot(current))
+    assert [c.job_id for c in result.added] == [c.job_id for c in expected.added] == ["4"]
+    assert [c.job_id for c in result.removed] == [c.job_id for c in expected.removed] == ["3"]
+    assert result.modified == expected.modified
+    assert result.previous_snapshot == previous.header()
+    assert result.current_snapshot == current.header()
+    assert columns.take([0, 1]).header() == snapshot(jobs[:2], 1).header()
+
+    # Loading straight from storage matches converting loaded snapshots
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir)
+        store.save(previous)
+        store.save(current)
+        loaded = store.load_latest_columnar(n=2)
+        assert [c.to_snapshot() for c in loaded] == store.load_latest(n=2)
+
+        store.export_to_csv(loaded[0], temp_dir / "columnar.csv")
+        store.export_to_csv(current, temp_dir / "regular.csv")
+        assert (temp_dir / "columnar.csv").read_text() == (temp_dir / "regular.csv").read_text()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Columnar snapshot OK")
+
+
+def test_job_fingerprint():
+    """Test job fingerprints let the diff skip unchanged jobs."""
+    print("Testing job fingerprint...")
+
+    from sjs_jobwatch.core import diff as diff_module
+    from sjs_jobwatch.core.diff import diff_snapshots
+    from sjs_jobwatch.core.models import Job, Snapshot
+
+    def snapshot(jobs):
+        return Snapshot(
+            timestamp=datetime.now(),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    job = Job(id="1", title="Dev", employer="A", summary="Build things")
+    same = Job(id="1", title="Dev", employer="A", summary="Build things", url="elsewhere")
+    assert job.fingerprint == same.fingerprint  # url is not tracked
+    assert job.model_copy(update={"title": "Lead"}).fingerprint != job.fingerprint
+    assert job.model_copy().fingerprint == job.fingerprint
+
+    # The cached fingerprint never leaves the process (hash() is salted per process)
+    import pickle
+
+    unpickled = pickle.loads(pickle.dumps(job))
+    assert "fingerprint" in job.__dict__ and "fingerprint" not in unpickled.__dict__
+    assert unpickled == job and unpickled.fingerprint == job.fingerprint
+
+    # Only jobs with different fingerprints reach the field-by-field comparison
+    compared = []
+    original = diff_module.compare_jobs
+
+    def counting_compare(old_job, new_job):
+        compared.append(old_job.id)
+        return original(old_job, new_job)
+
+    previous = snapshot([job, Job(id="2", title="Ops", employer="B", summary="Run")])
+    current = snapshot(
+        [same, Job(id="2", title="Ops", employer="B", summary=" Run ")]  # whitespace only
+    )
+    diff_module.compare_jobs = counting_compare
+    try:
+        result = diff_snapshots(previous, current)
+    finally:
+        diff_module.compare_jobs = original
+    assert compared == ["2"]
+    assert not result.has_changes
+
+    # A fingerprint collision doesn't hide a change
+    promoted = job.model_copy(update={"title": "Lead"})
+    promoted.__dict__["fingerprint"] = job.fingerprint
+    changes = diff_snapshots(snapshot([job]), snapshot([promoted])).modified
+    assert [fc.field for change in changes for fc in change.changes] == ["title"]
+
+    # Still importable from the diff module, as before the field specs
+    from sjs_jobwatch.core.diff import TRACKED_FIELDS
+    from sjs_jobwatch.core.models import tracked_fields
+
+    assert TRACKED_FIELDS == tracked_fields()
+
+    print("  ✓ Job fingerprint OK")
+
+
+def test_parallel_diff():
+    """Test the sharded parallel diff matches the serial diff."""
+    print("Testing parallel diff...")
+
+    from sjs_jobwatch.core.diff import diff_snapshots
+    from sjs_jobwatch.core.models import Job, Snapshot
+
+    def job(i, **fields):
+        return Job(id=str(i), title=f"Job {i}", employer="Agency", pay_min=50_000 + i, **fields)
+
+    def snapshot(jobs):
+        return Snapshot(
+            timestamp=datetime.now(),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    previous = snapshot([job(i) for i in range(40)])
+    current_jobs = [job(i) for i in range(5, 40)] + [job(i) for i in range(40, 45)]
+    current_jobs[4] = job(9, summary="New")
+    current_jobs.append(job(7, area="Te Aro"))  # repeated ID: last one wins
+    current = snapshot(current_jobs)
+
+    serial = diff_snapshots(previous, current, workers=1)
+    parallel = diff_snapshots(previous, current, workers=2)
+    for name in ("added", "removed", "modified"):
+        assert getattr(parallel, name) == getattr(serial, name), name
+    assert [change.job_id for change in parallel.modified] == ["7", "9"]
+    assert parallel.modified[0].changes[0].new_value == "Te Aro"
+    assert len(parallel.added) == 5 and len(parallel.removed) == 5
+
+    print("  ✓ Parallel diff OK")
+
+
+def test_diff_stream():
+    """Test the lazy diff stream matches the full diff."""
+    print("Testing diff stream...")
+
+    from itertools import islice
+
+    from sjs_jobwatch.alerts.email import EmailRenderer
+    from sjs_jobwatch.core import diff as diff_module
+    from sjs_jobwatch.core.diff import DiffStream, count_diff, diff_snapshots, iter_diff
+    from sjs_jobwatch.core.models import Job, Snapshot
+
+    def job(i, **fields):
+        return Job(id=str(i), title=f"Job {i}", employer="Agency", **fields)
+
+    def snapshot(jobs):
+        return Snapshot(
+            timestamp=datetime.now(),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    previous = snapshot([job(i) for i in range(30)])
+    current = snapshot(
+        [job(i, area="Te Aro") if i % 5 == 0 else job(i) for i in range(10, 40)]
+    )
+    full = diff_snapshots(previous, current)
+
+    assert list(iter_diff(previous, current)) == list(full.iter_changes())
+    assert count_diff(previous, current) == {
+        "added": 10, "removed": 10, "modified": 4, "reposted": 0
+    }
+
+    # Counting and partial iteration build only what they need
+    compared = []
+    original = diff_module.compare_jobs
+
+    def counting_compare(old_job, new_job):
+        compared.append(old_job.id)
+        return original(old_job, new_job)
+
+    stream = DiffStream(previous, current)
+    diff_module.compare_jobs = counting_compare
+    try:
+        assert stream.total_changes == full.total_changes
+        assert compared == []
+        first = list(islice(stream.iter_changes("modified"), 1))
+    finally:
+        diff_module.compare_jobs = original
+    assert first == full.modified[:1]
+    assert compared == ["10"]
+
+    # Renderers accept either form
+    renderer = EmailRenderer()
+    assert renderer.render_text(stream, max_jobs=3) == renderer.render_text(full, max_jobs=3)
+    assert renderer.render_subject(stream) == renderer.render_subject(full)
+
+    try:
+        stream.count("renamed")
+        assert False, "Should reject unknown change types"
+    except ValueError:
+        pass
+
+    print("  ✓ Diff stream OK")
+
+
+def test_diff_cache():
+    """Test diffs between stored snapshots are cached by content digest."""
+    print("Testing diff cache...")
+
+    import os
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.alerts.email import EmailRenderer
+    from sjs_jobwatch.core.diff import diff_snapshots
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.diffcache import DiffCache
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    temp_dir = Path(tempfile.mkdtemp())
+
+    try:
+        store = SnapshotStore(temp_dir)
+        now = datetime.now().replace(microsecond=0)
+
+        def snapshot(minutes, jobs):
+            return Snapshot(
+                timestamp=now + timedelta(minutes=minutes),
+                jobs=jobs,
+                total_count=len(jobs),
+                source_url="https://example.test/",
+            )
+
+        previous = snapshot(0, [Job(id=str(i), title=f"Job {i}", employer="A") for i in range(5)])
+        current = snapshot(
+            1,
+            [Job(id=str(i), title=f"Job {i}", employer="A", pay_min=60_000.0) for i in range(2, 8)],
+        )
+        for age, snap in ((20, previous), (10, current)):
+            path = store.save(snap)
+            os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+
+        headers = store.load_headers(n=2)
+        assert [h.content_digest for h in headers] == [
+            current.content_digest,
+            previous.content_digest,
+        ]
+
+        expected = diff_snapshots(previous, current)
+        cached = store.diff(headers[1], headers[0])
+        assert cached.count("added") == 3 and cached.count("removed") == 2
+        assert list(cached.iter_changes()) == list(expected.iter_changes())
+        assert len(store.diff_cache) == 1
+
+        # The second lookup doesn't need the snapshot files at all
+        for path in store.list_snapshots():
+            path.unlink()
+        again = store.diff(headers[1], headers[0])
+        assert list(again.iter_changes("modified")) == expected.modified
+        renderer = EmailRenderer()
+        assert renderer.render_text(again) == renderer.render_text(expected)
+
+        # A board flipping back and forth repeats digest pairs: a hit must
+        # still carry the headers of the snapshots that were asked for
+        flip_dir = temp_dir / "flip"
+        flip_store = SnapshotStore(flip_dir)
+        for minutes, jobs in enumerate((previous.jobs, current.jobs) * 2):
+            flip_store.save(snapshot(minutes, jobs))
+        flips = flip_store.load_headers(n=4)[::-1]
+        for log in (False, True):
+            for before, after in zip(flips, flips[1:]):
+                diff = flip_store.diff(before, after, log=log)
+                assert diff.previous_snapshot == before and diff.current_snapshot == after
+
+        # Least recently used entries go first once the cache is over size
+        cache = DiffCache(temp_dir / "small", max_bytes=1, max_age_days=0)
+        cache.put(again)
+        assert len(cache) == 0
+        cache = DiffCache(temp_dir / "aged", max_age_days=1)
+        path = cache.put(again)
+        os.utime(path, (0, 0))
+        assert cache.evict() == 1 and len(cache) == 0
+
+        # Diffs computed under other field specs miss
+        from sjs_jobwatch.core.diffcodec import EncodedDiff
+        from sjs_jobwatch.core.fields import tracked_specs_digest
+
+        digests = (headers[1].content_digest, headers[0].content_digest)
+        assert again.field_specs == tracked_specs_digest()
+        cache.put(again)
+        assert cache.get(*digests) is not None
+        assert cache.get(*digests, field_specs="0" * 16) is None
+        cache.put(EncodedDiff({**again.data, "field_specs": "0" * 16}))
+        assert cache.get(*digests, field_specs="0" * 16).field_specs == "0" * 16
+        assert cache.get(*digests).field_specs == tracked_specs_digest()
+
+        # Unreadable entries are dropped
+        path = cache.put(again)
+        path.write_text("{", encoding="utf-8")
+        assert cache.get(headers[1].content_digest, headers[0].content_digest) is None
+        assert not path.exists()
+
+        print("  ✓ Diff cache OK")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_diff_composition():
+    """Test composing interval diffs into the net diff over a window."""
+    print("Testing diff composition...")
+
+    import json
+    import os
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.core import config
+    from sjs_jobwatch.core.diff import diff_snapshots
+    from sjs_jobwatch.core.diffcodec import EncodedDiff, compose_diffs
+    from sjs_jobwatch.core.fields import tracked_field_specs
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    now = datetime.now().replace(microsecond=0)
+
+    def job(i, title=None, **fields):
+        return Job(id=str(i), title=title or f"Job {i}", employer="Agency", **fields)
+
+    def snapshot(minutes, jobs):
+        return Snapshot(
+            timestamp=now + timedelta(minutes=minutes),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    def summary(diff):
+        return sorted(
+            (
+                change.change_type,
+                change.job_id,
+                [(fc.field, fc.old_value, fc.new_value) for fc in change.changes],
+            )
+            for change in diff.iter_changes()
+        )
+
+    snapshots = [
+        snapshot(0, [job(i) for i in range(5)]),
+        # 5 added, 1 retitled, 4 retitled
+        snapshot(1, [job(0), job(1, "Lead"), job(2), job(3), job(4, "Temp"), job(5)]),
+        # 5 removed again, 1 retitled again, 2 removed, 4 back to its old title
+        snapshot(2, [job(0), job(1, "Head"), job(3), job(4)]),
+        # 2 re-added unchanged, 3 gets pay, 6 added
+        snapshot(3, [job(0), job(1, "Head"), job(2), job(3, pay_min=70_000.0), job(4), job(6)]),
+    ]
+    intervals = [
+        EncodedDiff.from_diff(diff_snapshots(previous, current))
+        for previous, current in zip(snapshots, snapshots[1:])
+    ]
+
+    net = compose_diffs(intervals)
+    direct = diff_snapshots(snapshots[0], snapshots[-1])
+    assert summary(net) == summary(direct)
+    assert summary(net) == [
+        ("added", "6", []),
+        ("modified", "1", [("title", "Job 1", "Head")]),
+        ("modified", "3", [("pay_min", None, "70000.0")]),
+    ]
+    assert net.previous_snapshot.content_digest == snapshots[0].content_digest
+    assert net.current_snapshot.content_digest == snapshots[-1].content_digest
+
+    try:
+        compose_diffs([intervals[0], intervals[2]])
+        assert False, "Should reject diffs that don't chain"
+    except ValueError:
+        pass
+
+    # Logged interval diffs let the store compose a window without the snapshots
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir)
+        for age, snap in enumerate(reversed(snapshots)):
+            path = store.save(snap)
+            os.utime(path, (path.stat().st_atime - age * 10, path.stat().st_mtime - age * 10))
+        headers = store.load_headers(n=4)
+        for previous, current in zip(headers[1:], headers):
+            store.diff(previous, current, log=True)
+        assert len(store.diff_log) == 3 and len(store.diff_cache) == 0
+
+        for path in store.list_snapshots():
+            path.unlink()
+        net = store.net_diff(headers)
+        assert summary(net) == summary(direct)
+        assert net.previous_snapshot == headers[-1] and net.current_snapshot == headers[0]
+
+        # Sub-threshold steps can add up past the threshold, so those windows
+        # are diffed directly
+        original = config.FIELD_SPECS_FILE
+        try:
+            config.FIELD_SPECS_FILE = temp_dir / "fields.json"
+            config.FIELD_SPECS_FILE.write_text(json.dumps({"pay_min": {"threshold": 500}}))
+            tracked_field_specs.cache_clear()
+            raises = [
+                snapshot(10 + step, [job(7, pay_min=50_000.0 + 300 * step)]) for step in range(3)
+            ]
+            store = SnapshotStore(temp_dir / "raises")
+            for age, snap in enumerate(reversed(raises)):
+                path = store.save(snap)
+                os.utime(path, (path.stat().st_atime - age * 10, path.stat().st_mtime - age * 10))
+            headers = store.load_headers(n=3)
+            oldest_first = headers[::-1]
+            steps = [
+                store.diff(previous, current, log=True)
+                for previous, current in zip(oldest_first, oldest_first[1:])
+            ]
+            assert not any(step.has_changes for step in steps)
+            assert not compose_diffs(steps).has_changes
+            assert summary(store.net_diff(headers)) == [
+                ("modified", "7", [("pay_min", "50000.0", "50600.0")])
+            ]
+        finally:
+            config.FIELD_SPECS_FILE = original
+            tracked_field_specs.cache_clear()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Diff composition OK")
+
+
+def test_repost_detection():
+    """Test pairing removed jobs with reposts under a new ID."""
+    print("Testing repost detection...")
+
+    from datetime import timedelta
+
+    from sjs_jobwatch.alerts.email import EmailRenderer
+    from sjs_jobwatch.core import config
+    from sjs_jobwatch.core.columnar import ColumnarSnapshot, diff_columnar
+    from sjs_jobwatch.core.diff import DiffStream, diff_snapshots
+    from sjs_jobwatch.core.diffcodec import EncodedDiff, compose_diffs
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.core.reposts import find_reposts
+
+    now = datetime.now().replace(microsecond=0)
+
+    def job(i, title, employer, area, summary, **fields):
+        return Job(id=str(i), title=title, employer=employer, area=area, summary=summary, **fields)
+
+    def snapshot(minutes, jobs):
+        return Snapshot(
+            timestamp=now + timedelta(minutes=minutes),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    picker = job(
+        1, "Fruit Picker", "Orchard Co", "Hastings",
+        "Seasonal apple picking in the Hawke's Bay, early starts and weekend work",
+    )
+    repost = job(
+        7, "Fruit Picker", "Orchard Co", "Hastings",
+        "Seasonal apple picking in the Hawke's Bay, early starts and weekend work",
+        pay_min=50_000.0,
+    )
+    driver = job(2, "Truck Driver", "Freight Ltd", "Auckland", "Class 2 licence required")
+    cleaner = job(8, "Office Cleaner", "Sparkle", "Wellington", "Evening cleaning of offices")
+
+    assert find_reposts([picker, driver], [cleaner, repost]) == [(picker, repost)]
+    assert find_reposts([driver], [cleaner]) == []
+    assert find_reposts([], [repost]) == []
+
+    previous = snapshot(0, [picker, driver])
+    current = snapshot(1, [driver, cleaner, repost])
+    diff = diff_snapshots(previous, current)
+    assert [change.job_id for change in diff.added] == ["8"]
+    assert diff.removed == []
+    assert len(diff.reposted) == 1 and diff.total_changes == 2
+    change = diff.reposted[0]
+    assert change.change_type == "reposted"
+    assert (change.job_id, change.repost_of) == ("7", "1")
+    assert [(fc.field, fc.new_value) for fc in change.changes] == [("pay_min", "50000.0")]
+
+    # The lazy stream, the parallel diff and the encoding all agree
+    stream = DiffStream(previous, current)
+    assert [stream.count(kind) for kind in ("added", "removed", "reposted")] == [1, 0, 1]
+    assert list(stream.iter_changes()) == list(diff.iter_changes())
+    parallel = diff_snapshots(previous, current, workers=2)
+    assert list(parallel.iter_changes()) == list(diff.iter_changes())
+    columnar = diff_columnar(
+        ColumnarSnapshot.from_snapshot(previous), ColumnarSnapshot.from_snapshot(current)
+    )
+    assert list(columnar.iter_changes()) == list(diff.iter_changes())
+    encoded = EncodedDiff.from_diff(diff)
+    assert encoded.count("reposted") == 1
+    assert list(encoded.iter_changes()) == list(diff.iter_changes())
+
+    # A job removed in one interval and reposted in the next is a repost overall
+    middle = snapshot(1, [driver])
+    later = snapshot(2, [driver, repost])
+    net = compose_diffs(
+        [
+            EncodedDiff.from_diff(diff_snapshots(previous, middle)),
+            EncodedDiff.from_diff(diff_snapshots(middle, later)),
+        ]
+    )
+    assert [(c.change_type, c.job_id, c.repost_of) for c in net.iter_changes()] == [
+        ("reposted", "7", "1")
+    ]
+
+    text = EmailRenderer().render_text(diff)
+    assert "REPOSTED JOBS (1)" in text and "was 1" in text
+    assert "Reposted Jobs" in EmailRenderer().render_html(diff)
+
+    detect_reposts = config.DETECT_REPOSTS
+    config.DETECT_REPOSTS = False
+    try:
+        diff = diff_snapshots(previous, current)
+        assert (len(diff.added), len(diff.removed), len(diff.reposted)) == (2, 1, 0)
+    finally:
+        config.DETECT_REPOSTS = detect_reposts
+
+    print("  ✓ Repost detection OK")
+
+
+def test_field_specs():
+    """Test per-deployment tracked field specs and their comparators."""
+    print("Testing field specs...")
+
+    import json
+    import pickle
+    import shutil
+    import tempfile
+
+    from sjs_jobwatch.core import config
+    from sjs_jobwatch.core.diff import compare_jobs, diff_snapshots, diff_snapshots_parallel
+    from sjs_jobwatch.core.fields import (
+        DEFAULT_TRACKED_FIELDS,
+        FieldSpec,
+        load_field_specs,
+        tracked_field_specs,
+    )
+    from sjs_jobwatch.core.models import TRACKED_FIELDS, Job, Snapshot, tracked_fields
+
+    assert TRACKED_FIELDS == list(DEFAULT_TRACKED_FIELDS)
+
+    text = FieldSpec("description")
+    assert not text.changed("Role ", "Role") and not text.changed("  ", None)
+    assert text.changed("Role", "Roles")
+    loose = FieldSpec("description", ignore_whitespace=True, ignore_case=True)
+    assert not loose.changed("Great  role\n", "great role")
+    pay = FieldSpec("pay_min", "number", threshold=500)
+    assert not pay.changed(50_000.0, 50_499.0)
+    assert pay.changed(50_000.0, 50_500.0) and pay.changed(None, 50_000.0)
+    for bad in ({"kind": "money"}, {"kind": "date", "threshold": 5}, {"ignore_case": True}):
+        try:
+            FieldSpec("pay_max", **{"kind": "number", **bad})
+            assert False, f"Should reject {bad}"
+        except ValueError:
+            pass
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "fields.json"
+        assert [spec.name for spec in load_field_specs(path)] == TRACKED_FIELDS
+
+        path.write_text(
+            json.dumps(
+                {
+                    "pay_min": {"threshold": 500},
+                    "title": {"ignore_case": True},
+                    "summary": None,
+                    "url": {},
+                }
+            )
+        )
+        specs = load_field_specs(path)
+        names = [spec.name for spec in specs]
+        assert "summary" not in names and names[-1] == "url"
+        assert specs[names.index("pay_min")].threshold == 500
+
+        path.write_text(json.dumps({"title": {"ignore_typos": True}}))
+        try:
+            load_field_specs(path)
+            assert False, "Should reject unknown options"
+        except ValueError:
+            pass
+
+        path.write_text(json.dumps(dict.fromkeys(DEFAULT_TRACKED_FIELDS)))
+        try:
+            load_field_specs(path)
+            assert False, "Should reject tracking no fields"
+        except ValueError:
+            pass
+
+    # Specs are sent to diff workers by their options
+    copied = pickle.loads(pickle.dumps(FieldSpec("pay_min", "number", threshold=500)))
+    assert repr(copied) == "FieldSpec('pay_min', kind='number', threshold=500)"
+    assert not copied.changed(50_000.0, 50_499.0)
+
+    # Noise is dropped before any FieldChange is built
+    old = Job(id="1", title="Analyst", employer="Agency", pay_min=50_000)
+    new = old.model_copy(update={"title": "ANALYST", "pay_min": 50_200.0})
+    assert {fc.field for fc in compare_jobs(old, new)} == {"title", "pay_min"}
+    original = config.FIELD_SPECS_FILE
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        # The deployment's file is read on first use, not at import
+        config.FIELD_SPECS_FILE = temp_dir / "fields.json"
+        config.FIELD_SPECS_FILE.write_text(
+            json.dumps({"pay_min": {"threshold": 500}, "title": {"ignore_case": True}})
+        )
+        tracked_field_specs.cache_clear()
+        assert compare_jobs(old, new) == []
+        changes = compare_jobs(old, new.model_copy(update={"pay_min": 51_000.0}))
+        assert [(fc.field, fc.old_value, fc.new_value) for fc in changes] == [
+            ("pay_min", "50000.0", "51000.0")
+        ]
+
+        # A single tracked field still gives tuples of values
+        config.FIELD_SPECS_FILE.write_text(
+            json.dumps({name: None for name in DEFAULT_TRACKED_FIELDS if name != "pay_max"})
+        )
+        tracked_field_specs.cache_clear()
+        assert tracked_fields() == ["pay_max"]
+        assert old.tracked_values() == (None,)
+        raised = old.model_copy(update={"title": "Lead", "pay_max": 60_000.0})
+        assert [fc.field for fc in compare_jobs(old, raised)] == ["pay_max"]
+        previous, current = (
+            Snapshot(timestamp=datetime(2024, 1, day), jobs=[job], total_count=1, source_url="")
+            for day, job in ((1, old), (2, raised))
+        )
+        for result in (
+            diff_snapshots(previous, current),
+            diff_snapshots_parallel(previous, current, workers=2),
+        ):
+            assert [c.changes[0].field for c in result.modified] == ["pay_max"]
+
+        # A broken file fails the diff with a clear error
+        config.FIELD_SPECS_FILE.write_text("{")
+        tracked_field_specs.cache_clear()
+        try:
+            compare_jobs(old, raised)
+            assert False, "Should reject a malformed field specs file"
+        except ValueError:
+            pass
+    finally:
+        config.FIELD_SPECS_FILE = original
+        tracked_field_specs.cache_clear()
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Field specs OK")
+
+
+def test_document_fields():
+    """Test descriptions are compared by normalized text and shown as snippets."""
+    print("Testing document fields...")
+
+    from sjs_jobwatch.core.diff import compare_jobs, diff_snapshots
+    from sjs_jobwatch.core.diffcodec import EncodedDiff
+    from sjs_jobwatch.core.fields import SNIPPET_MAX_CHARS, normalize_document
+    from sjs_jobwatch.core.models import Job, Snapshot
+
+    assert normalize_document("<p>Fish &amp; chips</p>\n<p>daily</p>") == "Fish & chips daily"
+    assert normalize_document(None) == ""
+
+    paragraph = "<p>Join our <b>friendly</b> team &amp; help run the Wellington office.</p>"
+    old = Job(id="1", title="Administrator", employer="Agency", description=paragraph * 20)
+    rerendered = old.model_copy(
+        update={"description": paragraph.replace("<p>", "<div>\n  ").replace("</p>", "</div>") * 20}
+    )
+    assert compare_jobs(old, rerendered) == []
+
+    edited_text = paragraph * 10 + paragraph.replace("friendly", "small") + paragraph * 9
+    edited = old.model_copy(update={"description": edited_text})
+    (change,) = compare_jobs(old, edited)
+    assert change.field == "description"
+    assert "friendly" in change.old_value and "small" in change.new_value
+    assert "<" not in change.old_value
+    assert len(change.old_value) <= SNIPPET_MAX_CHARS + 2
+    assert len(change.new_value) <= SNIPPET_MAX_CHARS + 2
+    assert change.summary.startswith("1 words replaced by 1")
+
+    # Summaries survive the diff encoding
+    def snapshot(jobs):
+        return Snapshot(timestamp=datetime.now(), jobs=jobs, total_count=len(jobs), source_url="t")
+
+    diff = diff_snapshots(snapshot([old]), snapshot([edited]))
+    encoded = EncodedDiff.from_diff(diff)
+    assert list(encoded.iter_changes()) == list(diff.iter_changes())
+
+    # Version 2 entries have no summaries and still decode
+    legacy = {**encoded.data, "version": 2}
+    legacy["modified"] = [
+        [before, after, [change[:3] for change in changes]]
+        for before, after, changes in legacy["modified"]
+    ]
+    (legacy_change,) = EncodedDiff(legacy).iter_changes("modified")
+    assert legacy_change.changes[0].summary is None
+
+    print("  ✓ Document fields OK")
+
+
+def test_snapshot_manifest():
+    """Test the snapshot manifest answers listings without opening snapshots."""
+    print("Testing snapshot manifest...")
+
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.manifest import MANIFEST_FILENAME
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    now = datetime(2024, 6, 1, 12, 0, 0)
+
+    def snapshot(days, count):
+        jobs = [Job(id=str(i), title=f"Job {i}", employer="Agency") for i in range(count)]
+        return Snapshot(
+            timestamp=now - timedelta(days=days),
+            jobs=jobs,
+            total_count=count,
+            scrape_duration_seconds=1.5,
+            source_url="https://example.test/",
+        )
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir)
+        for days in (2, 0, 1):
+            store.save(snapshot(days, count=3 - days))
+        assert store.count() == 3
+
+        entries = store.manifest.entries()
+        assert [entry.timestamp for entry in entries] == [now - timedelta(days=d) for d in range(3)]
+        assert [entry.job_count for entry in entries] == [3, 2, 1]
+        for entry in entries:
+            assert entry.size_bytes == (temp_dir / entry.filename).stat().st_size
+
+        # Listings come from the manifest alone, even if a snapshot file is unreadable
+        (temp_dir / entries[1].filename).write_text("not json", encoding="utf-8")
+        headers = store.load_headers(n=2)
+        assert [h.total_count for h in headers] == [3, 2]
+        assert headers[0].content_digest == snapshot(0, 3).content_digest
+        assert store.list_snapshots()[0] == temp_dir / entries[0].filename
+
+        # Another store on the same directory sees appended records
+        other = SnapshotStore(temp_dir)
+        other.save(snapshot(-1, 4))
+        assert store.count() == 4 and store.load_headers()[0].total_count == 4
+
+        # Pruning records removals and compacts the manifest
+        assert store.prune_old_snapshots(days=0, max_count=2) == 2
+        assert store.count() == 2
+        lines = (temp_dir / MANIFEST_FILENAME).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+
+        # A missing manifest is rebuilt from the files; unreadable files are skipped
+        (temp_dir / MANIFEST_FILENAME).unlink()
+        (temp_dir / entries[1].filename).write_text("not json", encoding="utf-8")
+        rebuilt = SnapshotStore(temp_dir)
+        assert rebuilt.count() == 2
+        assert [h.total_count for h in rebuilt.load_headers(n=5)] == [4, 3]
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Snapshot manifest OK")
+
+
+def test_delta_storage():
+    """Test snapshots stored as deltas between keyframes."""
+    print("Testing delta storage...")
+
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.manifest import MANIFEST_FILENAME
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    start = datetime(2024, 6, 1, 12, 0, 0)
+
+    def snapshot(hour, jobs):
+        return Snapshot(
+            timestamp=start + timedelta(hours=hour),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    jobs = [Job(id=str(i), title=f"Job {i}", employer="Agency", pay_min=50000.0) for i in range(20)]
+    saved = []
+    for hour in range(7):
+        jobs = [j for j in jobs if j.id != str(hour)]
+        jobs.append(Job(id=f"new{hour}", title="New", employer="B"))
+        jobs[3] = jobs[3].model_copy(update={"pay_min": 50000.0 + hour, "region": None})
+        if hour == 4:
+            jobs.reverse()
+        saved.append(snapshot(hour, jobs))
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir, keyframe_interval=3)
+        paths = [store.save(snap) for snap in saved]
+        kinds = ["delta" if ".delta." in path.name else "full" for path in paths]
+        assert kinds == ["full", "delta", "delta", "full", "delta", "delta", "full"]
+        assert paths[1].stat().st_size < paths[0].stat().st_size / 3
+
+        # Every snapshot rebuilds exactly, singly or in a batch
+        for snap in saved:
+            loaded = store.load(snap.timestamp)
+            assert loaded.jobs == snap.jobs and loaded.content_digest == snap.content_digest
+        latest = store.load_latest(n=7)
+        assert [s.jobs for s in latest] == [s.jobs for s in reversed(saved)]
+        assert [len(s) for s in store.load_latest_columnar(n=3)] == [20, 20, 20]
+        assert store.diff(saved[1].header(), saved[2].header()).count("added") == 1
+
+        # A rebuilt manifest still knows which files are deltas
+        (temp_dir / MANIFEST_FILENAME).unlink()
+        store = SnapshotStore(temp_dir, keyframe_interval=3)
+        assert [entry.base is None for entry in reversed(store.manifest.entries())] == [
+            True, False, False, True, False, False, True
+        ]
+
+        # Pruning a keyframe rewrites the deltas based on it
+        assert store.prune_old_snapshots(days=0, max_count=6) == 1
+        assert store.list_snapshots()[-1].name == "snapshot_2024-06-01_13-00-00.json"
+        assert store.load(saved[2].timestamp).jobs == saved[2].jobs
+
+        # A delta whose base is already gone is dropped with it
+        paths[3].unlink()
+        assert store.prune_old_snapshots(days=0, max_count=5) == 3
+        assert [path.name for path in store.list_snapshots()] == [
+            "snapshot_2024-06-01_18-00-00.json", "snapshot_2024-06-01_14-00-00.json"
+        ]
+        assert store.load(saved[6].timestamp).jobs == saved[6].jobs
+
+        try:
+            SnapshotStore(temp_dir, keyframe_interval=0)
+            assert False, "Should reject a keyframe interval below 1"
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Delta storage OK")
+
+
+def test_sqlite_store():
+    """Test the SQLite snapshot store."""
+    print("Testing SQLite store...")
+
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.core import config
+    from sjs_jobwatch.core.diff import diff_snapshots
+    from sjs_jobwatch.core.models import Job, Snapshot, parse_datetime
+    from sjs_jobwatch.storage.snapshots import SnapshotStore, get_snapshot_store
+    from sjs_jobwatch.storage.sqlite_store import SQLiteSnapshotStore
+
+    start = datetime(2024, 6, 1, 12, 0, 0)
+
+    def snapshot(hour, jobs):
+        return Snapshot(
+            timestamp=start + timedelta(hours=hour),
+            jobs=jobs,
+            total_count=len(jobs),
+            source_url="https://example.test/",
+        )
+
+    wellington = Job(id="1", title="Analyst", employer="A", region="Wellington")
+    closing = Job(
+        id="2",
+        title="Advisor",
+        employer="B",
+        region="Wellington",
+        end_date=start + timedelta(hours=1),
+    )
+    auckland = Job(id="3", title="Developer", employer="C", region="Auckland", category="ICT")
+    promoted = wellington.model_copy(update={"title": "Senior Analyst"})
+    saved = [
+        snapshot(0, [wellington, closing, auckland]),
+        snapshot(1, [auckland, wellington, closing]),
+        snapshot(2, [promoted, closing]),
+    ]
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SQLiteSnapshotStore(temp_dir)
+        for snap in saved:
+            store.save(snap)
+        store.save(saved[2])  # saving again replaces it
+        assert store.count() == 3
+        versions = store._conn.execute("SELECT COUNT(*) FROM job_versions").fetchone()[0]
+        assert versions == 4
+
+        # The SnapshotStore API works unchanged
+        for snap in saved:
+            assert store.load(snap.timestamp).jobs == snap.jobs
+        assert store.load(start - timedelta(days=1)) is None
+        latest = store.load_latest(n=3)
+        assert [s.content_digest for s in latest] == [s.content_digest for s in reversed(saved)]
+        assert latest[1].jobs[0] is latest[2].jobs[2]  # one object per job version
+        assert store.load_headers(n=1)[0] == saved[2].header()
+        assert store.latest_digest() == saved[2].content_digest
+        assert len(store.load_latest_columnar(n=2)[1]) == 3
+        headers = store.load_headers(n=3)
+        diff = store.diff(headers[1], headers[0])
+        assert list(diff.iter_changes()) == list(
+            diff_snapshots(saved[1], saved[2]).iter_changes()
+        )
+
+        # Indexed queries, without loading snapshots
+        assert [j.id for j in store.find_jobs(start, region="Wellington")] == ["1", "2"]
+        assert [j.id for j in store.find_jobs(start + timedelta(hours=1, minutes=30))] == ["3", "1"]
+        assert [j.id for j in store.find_jobs(category="ICT")] == []
+        assert store.find_jobs(start - timedelta(hours=1)) == []
+
+        # Closing dates compare as instants, whatever their UTC offset
+        from datetime import timezone
+
+        offset_store = SQLiteSnapshotStore(temp_dir / "offsets")
+        closed = Job(
+            id="4",
+            title="Planner",
+            employer="D",
+            end_date=(start + timedelta(minutes=15)).astimezone(timezone(timedelta(hours=12))),
+        )
+        offset_store.save(snapshot(0, [wellington, closed]))
+        later = (start + timedelta(minutes=30)).astimezone(timezone(timedelta(hours=5)))
+        assert [j.id for j in offset_store.find_jobs(later)] == ["1"]
+        assert [j.id for j in offset_store.find_jobs(start + timedelta(minutes=10))] == ["1", "4"]
+        # pydantic writes UTC as "Z", which fromisoformat() only accepts from Python 3.11
+        utc = (start + timedelta(hours=3)).replace(tzinfo=timezone.utc)
+        renamed = closed.model_copy(update={"title": "Senior Planner"})
+        offset_store.save(snapshot(3, [renamed]).model_copy(update={"timestamp": utc}))
+        assert [t for t, _ in offset_store.job_history("4")] == [start, utc]
+        assert parse_datetime("2024-06-01T15:00:00Z") == utc
+        offset_store.close()
+        history = store.job_history("1")
+        assert [(t, j.title) for t, j in history] == [
+            (start, "Analyst"),
+            (start + timedelta(hours=2), "Senior Analyst"),
+        ]
+
+        # Pruning drops job versions no snapshot lists any more
+        assert store.prune_old_snapshots(days=0, max_count=1) == 2
+        assert store.count() == 1
+        versions = store._conn.execute("SELECT COUNT(*) FROM job_versions").fetchone()[0]
+        assert versions == 2
+        store.close()
+
+        original = config.SNAPSHOT_BACKEND
+        try:
+            config.SNAPSHOT_BACKEND = "sqlite"
+            reopened = get_snapshot_store(temp_dir)
+            assert isinstance(reopened, SQLiteSnapshotStore) and reopened.count() == 1
+            reopened.close()
+            config.SNAPSHOT_BACKEND = "files"
+            assert type(get_snapshot_store(temp_dir)) is SnapshotStore
+            config.SNAPSHOT_BACKEND = "mongodb"
+            try:
+                get_snapshot_store(temp_dir)
+                assert False, "Should reject an unknown backend"
+            except ValueError:
+                pass
+        finally:
+            config.SNAPSHOT_BACKEND = original
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ SQLite store OK")
+
+
+def test_snapshot_compression():
+    """Test compressed snapshot files."""
+    print("Testing snapshot compression...")
+
+    import gzip
+    import json
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage import compression
+    from sjs_jobwatch.storage.manifest import MANIFEST_FILENAME
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+
+    start = datetime(2024, 6, 1, 12, 0, 0)
+    jobs = [
+        Job(id=str(i), title=f"Job {i}", employer="Agency", description="Lead the team. " * 50)
+        for i in range(50)
+    ]
+    saved = [
+        Snapshot(
+            timestamp=start + timedelta(hours=hour),
+            jobs=jobs[hour:],
+            total_count=len(jobs) - hour,
+            source_url="https://example.test/",
+        )
+        for hour in range(4)
+    ]
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        plain = SnapshotStore(temp_dir, keyframe_interval=2)
+        plain_path = plain.save(saved[0])
+
+        store = SnapshotStore(temp_dir, keyframe_interval=2, compression="gzip")
+        paths = [store.save(snap) for snap in saved[1:]]
+        assert all(path.name.endswith(".json.gz") for path in paths)
+        assert ".delta" in paths[0].name and ".delta" not in paths[1].name
+        with gzip.open(paths[1], "rt", encoding="utf-8") as f:
+            assert len(json.load(f)["jobs"]) == 48
+        assert paths[1].stat().st_size < plain_path.stat().st_size / 10
+
+        # Old plain files and new compressed ones load alike
+        for snap in saved:
+            assert store.load(snap.timestamp).jobs == snap.jobs
+        assert [len(s.jobs) for s in store.load_latest(n=4)] == [47, 48, 49, 50]
+
+        # Saving again with another codec replaces the file
+        store.save(saved[0])
+        assert not plain_path.exists() and store.count() == 4
+
+        (temp_dir / MANIFEST_FILENAME).unlink()
+        assert SnapshotStore(temp_dir).load_headers(n=4)[0] == saved[3].header()
+        assert store.prune_old_snapshots(days=0, max_count=1) == 3
+        assert store.load(saved[3].timestamp).jobs == saved[3].jobs
+
+        try:
+            SnapshotStore(temp_dir, compression="lzma")
+            assert False, "Should reject an unknown codec"
+        except ValueError:
+            pass
+        if compression.zstandard is None:
+            try:
+                SnapshotStore(temp_dir, compression="zstd")
+                assert False, "Should reject zstd without zstandard installed"
+            except ValueError:
+                pass
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Snapshot compression OK")
+
+
+def test_snapshot_headers():
+    """Test reading snapshot metadata without the jobs."""
+    print("Testing snapshot headers...")
+
+    import json
+    import shutil
+    import tempfile
+    from datetime import timedelta
+
+    from sjs_jobwatch.core.models import Job, Snapshot
+    from sjs_jobwatch.storage.manifest import MANIFEST_FILENAME
+    from sjs_jobwatch.storage.snapshots import SnapshotStore
+    from sjs_jobwatch.storage.sqlite_store import SQLiteSnapshotStore
+
+    start = datetime(2024, 6, 1, 12, 0, 0)
+    jobs = [
+        Job(id=str(i), title=f"Job {i}", employer="Agency", description="Lead the team. " * 50)
+        for i in range(300)
+    ]
+    saved = [
+        Snapshot(
+            timestamp=start + timedelta(hours=hour),
+            jobs=jobs[hour:],
+            total_count=len(jobs) - hour,
+            scrape_duration_seconds=2.5,
+            source_url="https://example.test/",
+        )
+        for hour in range(3)
+    ]
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        store = SnapshotStore(temp_dir, keyframe_interval=2)
+        paths = [store.save(snap) for snap in saved]
+
+        # Keyframes lead with their metadata
+        with open(paths[0], encoding="utf-8") as f:
+            keys = list(json.load(f))
+        assert keys[0] == "timestamp" and keys[-2:] == ["job_count", "jobs"]
+
+        for snap in saved:
+            assert store.load_header(snap.timestamp) == snap.header()
+        assert store.load_header(start - timedelta(days=1)) is None
+        assert [h.total_count for h in store.iter_headers()] == [298, 299, 300]
+
+        # Only the start of the file is read
+        text = paths[2].read_text(encoding="utf-8")
+        assert len(text) > 200_000
+        paths[2].write_text(text[: len(text) // 2], encoding="utf-8")
+        assert store.load_header(saved[2].timestamp) == saved[2].header()
+        assert store.load(saved[2].timestamp) is None
+
+        # Deltas too: their metadata comes before the job changes
+        text = paths[1].read_text(encoding="utf-8")
+        paths[1].write_text(text[: text.index('"removed"')], encoding="utf-8")
+        (temp_dir / MANIFEST_FILENAME).unlink()
+        reopened = SnapshotStore(temp_dir, keyframe_interval=2)
+        assert reopened.load_header(saved[1].timestamp) == saved[1].header()
+        assert reopened.manifest.get(paths[1].name).header() == saved[1].header()
+
+        # Files from before metadata came first still work, and get indexed
+        legacy = {"jobs": [job.model_dump(mode="json") for job in jobs[:5]]}
+        legacy.update(timestamp="2024-05-01T00:00:00", total_count=5, source_url="old")
+        (temp_dir / "snapshot_2024-05-01_00-00-00.json").write_text(json.dumps(legacy))
+        header = store.load_header(datetime(2024, 5, 1))
+        assert header.total_count == 5 and header.content_digest
+        (temp_dir / MANIFEST_FILENAME).unlink()
+        assert SnapshotStore(temp_dir).load_headers(n=4)[3] == header
+
+        database = SQLiteSnapshotStore(temp_dir / "db")
+        for snap in saved:
+            database.save(snap)
+        assert database.load_header(saved[1].timestamp) == saved[1].header()
+        assert database.load_header(start - timedelta(days=1)) is None
+        assert [h.total_count for h in database.iter_headers()] == [298, 299, 300]
+        database.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("  ✓ Snapshot headers OK")
+
+
 def run_all_tests():
     """Run all tests."""
     print("=" * 60)
@@ -404,6 +2219,32 @@ def run_all_tests():
         test_cli_structure,
         test_data_structures,
         test_edge_cases,
+        test_paginated_scrape,
+        test_token_bucket,
+        test_next_data_extraction,
+        test_conditional_scrape,
+        test_conditional_scrape_partial_failure,
+        test_snapshot_digest,
+        test_streaming_parse,
+        test_detail_fetcher,
+        test_job_builder,
+        test_fixture_replay,
+        test_result_path_resolver,
+        test_interning,
+        test_columnar_snapshot,
+        test_job_fingerprint,
+        test_parallel_diff,
+        test_diff_stream,
+        test_diff_cache,
+        test_diff_composition,
+        test_repost_detection,
+        test_field_specs,
+        test_document_fields,
+        test_snapshot_manifest,
+        test_delta_storage,
+        test_sqlite_store,
+        test_snapshot_compression,
+        test_snapshot_headers,
     ]
 
     passed = 0